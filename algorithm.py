@@ -1,6 +1,8 @@
+import inspect
 from enum import Enum
-from maze_generation import dfs, prim
-from path_finding import astar, dijkstra
+from helpers import run_to_completion
+from maze_generation import dfs, prim, kruskal, wilson, eller
+from path_finding import astar, dijkstra, dial, bidirectional_astar, bidirectional_dijkstra, contracted_astar, jump_point_search
 
 
 class AlgorithmType(Enum):
@@ -12,19 +14,96 @@ class AlgorithmType(Enum):
     PATH_FINDING = 2
 
 
-class MazeGenerationAlgorithm(Enum):
+class Algorithm:
+    """An algorithm that can be animated or run to completion.
+
+    Every algorithm is a generator that yields its state every ``every``
+    steps and returns its result. Both variants call the same generator,
+    the fast one simply never yields, so they always give identical
+    results.
+
+    Attributes
+    ----------
+    function : callable
+        The generator function implementing the algorithm.
+    instrumented : bool
+        Whether the algorithm takes a ``stats`` argument, see
+        ``instrumentation.Stats``.
+
+    Methods
+    -------
+    animate(*args, every: int = 1)
+        Get a generator that yields the state of the algorithm.
+    run(*args)
+        Run the algorithm to completion without yielding.
+    """
+
+    def __init__(self, function) -> None:
+        """Initialize an algorithm.
+
+        Parameters
+        ----------
+        function : callable
+            The generator function implementing the algorithm.
+        """
+        self.function = function
+
+    @property
+    def instrumented(self) -> bool:
+        """Whether the algorithm takes a ``stats`` argument."""
+        return 'stats' in inspect.signature(self.function).parameters
+
+    def __call__(self, *args, **kwargs):
+        """Get a generator that yields the state after every step."""
+        return self.animate(*args, **kwargs)
+
+    def animate(self, *args, every: int = 1, **kwargs):
+        """Get a generator that yields the state of the algorithm.
+
+        Parameters
+        ----------
+        every : int, optional
+            Yield the state every this many steps.
+
+        Returns
+        -------
+        generator
+            The algorithm.
+        """
+        return self.function(*args, every=every, **kwargs)
+
+    def run(self, *args, **kwargs) -> object:
+        """Run the algorithm to completion without yielding.
+
+        Returns
+        -------
+        object
+            The result of the algorithm.
+        """
+        return run_to_completion(self.function(*args, every=0, **kwargs))
+
+
+class MazeGenerationAlgorithm(Algorithm, Enum):
     """Maze generation algorithms.
 
     This enum contains the different maze generation algorithms.
     """
-    DFS = dfs
-    PRIM = prim
+    DFS = (dfs,)
+    PRIM = (prim,)
+    KRUSKAL = (kruskal,)
+    WILSON = (wilson,)
+    ELLER = (eller,)
 
 
-class PathFindingAlgorithm(Enum):
+class PathFindingAlgorithm(Algorithm, Enum):
     """Path finding algorithms.
 
     This enum contains the different path finding algorithms.
     """
-    ASTAR = astar
-    DIJKSTRA = dijkstra
+    ASTAR = (astar,)
+    DIJKSTRA = (dijkstra,)
+    DIAL = (dial,)
+    BIDIRECTIONAL_ASTAR = (bidirectional_astar,)
+    BIDIRECTIONAL_DIJKSTRA = (bidirectional_dijkstra,)
+    CONTRACTED_ASTAR = (contracted_astar,)
+    JUMP_POINT_SEARCH = (jump_point_search,)
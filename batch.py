@@ -0,0 +1,245 @@
+import hashlib
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from cell import Cell
+from grid import Grid
+from helpers import run_to_completion
+from maze_file import save_maze, load_maze
+from path_finding import astar
+from search import SearchContext
+
+
+# The state of a worker process, set once by ``_start_worker``.
+_maze = None
+_context = None
+_solver = None
+
+
+def _start_worker(filename: str, solver) -> None:
+    """Load the maze of a worker process.
+
+    Parameters
+    ----------
+    filename : str
+        The maze file to load. Every worker reads it from the same pages
+        of the page cache and unpacks the walls once: a byte per cell is
+        small next to the search context, and the solvers read unpacked
+        walls about a third faster than ``PackedWalls``.
+    solver : Callable
+        The path finding algorithm of the batch.
+    """
+    global _maze, _context, _solver
+
+    _maze = load_maze(filename, copy=True)
+    _context = SearchContext(_maze.width * _maze.height)
+    _solver = solver
+
+
+def _solve(queries: list[tuple[int, int]], lengths: bool) -> list:
+    """Solve queries on the maze of the current process.
+
+    Parameters
+    ----------
+    queries : list[tuple[int, int]]
+        The indices of the start and end cells of every query.
+    lengths : bool
+        Return the length of the paths instead of the paths.
+
+    Returns
+    -------
+    list
+        The indices of the cells of every path, or the number of cells
+        of every path if ``lengths`` is set.
+    """
+    width = _maze.width
+    results = []
+
+    for start, end in queries:
+        start_cell = Cell(start % width, start // width)
+        end_cell = Cell(end % width, end // width)
+
+        path = run_to_completion(_solver(_maze, start_cell, end_cell, _context, every=0))
+
+        if lengths:
+            results.append(len(path))
+        else:
+            results.append(tuple(cell.y * width + cell.x for cell in path))
+
+    return results
+
+
+def solve_batch(
+    maze: Grid,
+    queries: list[tuple[Cell, Cell]],
+    solver=astar,
+    workers: int = None,
+    lengths: bool = False,
+    chunksize: int = None,
+) -> list:
+    """Solve many path queries on the same maze across processes.
+
+    The maze is saved once to a temporary packed maze file which every
+    worker loads when it starts, so nothing but the queries and the
+    results is pickled. The queries are sent in chunks and the results
+    come back in the order of the queries.
+
+    Parameters
+    ----------
+    maze : Grid
+        The maze to find the paths in.
+    queries : list[tuple[Cell, Cell]]
+        The start and end cells of every query.
+    solver : Callable, optional
+        The path finding algorithm, for example ``astar`` or ``dijkstra``.
+        It must be a module level function so it can be pickled.
+    workers : int, optional
+        The number of processes, by default the number of CPUs. With one
+        worker the queries are solved in the current process.
+    lengths : bool, optional
+        Return the length of the paths instead of the paths.
+    chunksize : int, optional
+        The number of queries sent to a worker at once, by default enough
+        for about four chunks per worker.
+
+    Returns
+    -------
+    list
+        The path of every query as a list of cells, or the number of
+        cells of every path if ``lengths`` is set. A query without a
+        path gets an empty path, or a length of 0.
+    """
+    global _maze, _context, _solver
+
+    width = maze.width
+    indices = [(start.y * width + start.x, end.y * width + end.x) for start, end in queries]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(indices) // (workers * 4))
+
+    chunks = [indices[i:i + chunksize] for i in range(0, len(indices), chunksize)]
+
+    if workers == 1:
+        _maze, _context, _solver = maze, SearchContext(width * maze.height), solver
+        try:
+            results = [_solve(chunk, lengths) for chunk in chunks]
+        finally:
+            _maze, _context, _solver = None, None, None
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'maze.bin')
+            save_maze(maze, filename)
+
+            with ProcessPoolExecutor(workers, initializer=_start_worker, initargs=(filename, solver)) as executor:
+                results = list(executor.map(_solve, chunks, [lengths] * len(chunks)))
+
+    flat = [result for chunk in results for result in chunk]
+
+    if lengths:
+        return flat
+
+    return [[maze.cell(index) for index in path] for path in flat]
+
+
+def derive_seed(seed: int, index: int) -> int:
+    """Derive the seed of one maze of a batch.
+
+    The seed only depends on the seed of the batch and the position of
+    the maze in it, so a batch gives the same mazes whatever the number
+    of workers and the order they run in.
+
+    Parameters
+    ----------
+    seed : int
+        The seed of the batch.
+    index : int
+        The position of the maze in the batch.
+
+    Returns
+    -------
+    int
+        The seed of the maze, a 63-bit integer.
+    """
+    digest = hashlib.sha256(f'{seed}:{index}'.encode()).digest()
+    return int.from_bytes(digest[:8], 'little') >> 1
+
+
+def _generate(generator, width: int, height: int, seed: int, filename: str) -> float:
+    """Generate a maze and save it.
+
+    Parameters
+    ----------
+    generator : Callable
+        The maze generation algorithm.
+    width : int
+        The width of the maze.
+    height : int
+        The height of the maze.
+    seed : int
+        The seed of the maze.
+    filename : str
+        The file to save the maze to.
+
+    Returns
+    -------
+    float
+        The time spent generating the maze, in seconds.
+    """
+    started = time.perf_counter()
+    maze = run_to_completion(generator(width, height, every=0, seed=seed))
+    elapsed = time.perf_counter() - started
+
+    save_maze(maze, filename, seed)
+
+    return elapsed
+
+
+def generate_batch(generator, width: int, height: int, count: int, seed: int, directory: str, workers: int = None) -> list[str]:
+    """Generate many mazes across processes and save them.
+
+    Maze ``i`` is generated with ``derive_seed(seed, i)``, which is also
+    stored in the header of its file, and saved as ``maze-<i>.bin``.
+
+    Parameters
+    ----------
+    generator : Callable
+        The maze generation algorithm, for example ``dfs``. It must be a
+        module level function so it can be pickled.
+    width : int
+        The width of the mazes.
+    height : int
+        The height of the mazes.
+    count : int
+        The number of mazes.
+    seed : int
+        The seed of the batch.
+    directory : str
+        The directory to save the mazes to.
+    workers : int, optional
+        The number of processes, by default the number of CPUs. With one
+        worker the mazes are generated in the current process.
+
+    Returns
+    -------
+    list[str]
+        The files of the mazes, in order.
+    """
+    os.makedirs(directory, exist_ok=True)
+
+    filenames = [os.path.join(directory, f'maze-{index:05}.bin') for index in range(count)]
+    seeds = [derive_seed(seed, index) for index in range(count)]
+    arguments = ([generator] * count, [width] * count, [height] * count, seeds, filenames)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers == 1:
+        list(map(_generate, *arguments))
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            list(executor.map(_generate, *arguments, chunksize=max(1, count // (workers * 4))))
+
+    return filenames
@@ -0,0 +1,61 @@
+"""Batch Benchmark.
+
+Measures how ``solve_batch`` scales with the number of worker
+processes on a fixed set of random queries.
+
+Run it from the root of the repository:
+```
+python -m benchmarks.batch 200 200 400
+```
+"""
+
+import os
+import random
+import sys
+import time
+from batch import solve_batch
+from cell import Cell
+from helpers import run_to_completion
+from maze_generation import dfs
+
+
+def main() -> None:
+    """Main function.
+
+    Generates a maze and prints the queries solved per second for one
+    worker up to the number of CPUs.
+    """
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    height = int(sys.argv[2]) if len(sys.argv) > 2 else width
+    count = int(sys.argv[3]) if len(sys.argv) > 3 else 400
+
+    random.seed(0)
+    maze = run_to_completion(dfs(width, height, every=0))
+
+    def random_cell() -> Cell:
+        return Cell(random.randrange(width), random.randrange(height))
+
+    queries = [(random_cell(), random_cell()) for _ in range(count)]
+
+    cpus = os.cpu_count() or 1
+    workers = sorted({1, 2, 4, cpus} if cpus > 1 else {1, 2})
+    expected = None
+
+    print(f'{width}x{height} maze, {count} queries, {cpus} CPUs')
+
+    for worker_count in workers:
+        t0 = time.perf_counter()
+        lengths = solve_batch(maze, queries, workers=worker_count, lengths=True)
+        elapsed = time.perf_counter() - t0
+
+        expected = expected or lengths
+        assert lengths == expected
+
+        if worker_count == 1:
+            baseline = elapsed
+
+        print(f'{worker_count:3} workers: {count / elapsed:8.1f} queries/s ({baseline / elapsed:4.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
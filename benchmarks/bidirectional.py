@@ -0,0 +1,65 @@
+"""Bidirectional Search Benchmark.
+
+Compares the cells expanded by A* and Dijkstra's algorithm with those of
+their bidirectional variants, corner to corner on perfect mazes from
+every generator and several seeds. The costs of the paths are checked
+to be the same.
+
+Run it from the root of the repository:
+```
+python -m benchmarks.bidirectional 150 150 3
+```
+"""
+
+import sys
+from algorithm import MazeGenerationAlgorithm
+from cell import Cell
+from path_finding import astar, dijkstra, bidirectional_astar, bidirectional_dijkstra
+from helpers import run_to_completion
+from search import SearchContext
+
+
+PAIRS = ((astar, bidirectional_astar), (dijkstra, bidirectional_dijkstra))
+
+
+def main() -> None:
+    """Main function.
+
+    Solves every maze with both pairs of solvers and prints the
+    expansions of each, and the ratio of the totals per pair.
+    """
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 150
+    height = int(sys.argv[2]) if len(sys.argv) > 2 else width
+    seeds = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+
+    start, end = Cell(0, 0), Cell(width - 1, height - 1)
+    context = SearchContext(width * height)
+    totals = {solver: 0 for pair in PAIRS for solver in pair}
+
+    print(f'{width}x{height} mazes, corner to corner, {seeds} seeds')
+
+    for generator in MazeGenerationAlgorithm:
+        for seed in range(seeds):
+            maze = generator.run(width, height, seed=seed)
+            line = f'{generator.name.lower():8} seed {seed}'
+
+            for pair in PAIRS:
+                costs = []
+
+                for solver in pair:
+                    path = run_to_completion(solver(maze, start, end, context, every=0))
+                    costs.append(sum(maze.costs[cell.y * width + cell.x] for cell in path[1:]))
+                    totals[solver] += context.expansions
+
+                    line += f' {solver.__name__} {context.expansions:6}'
+
+                assert costs[0] == costs[1], f'{pair[1].__name__} found a path of cost {costs[1]}, not {costs[0]}'
+
+            print(line)
+
+    for solver, bidirectional in PAIRS:
+        print(f'{bidirectional.__name__}: {totals[bidirectional] / totals[solver]:.2f}x the expansions of {solver.__name__}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Dial Benchmark.
+
+Compares Dijkstra's algorithm with a binary heap against Dial's
+algorithm with a bucket queue on a maze with weighted cells. Some walls
+are knocked down so the maze has loops and the costs matter.
+
+Run it from the root of the repository:
+```
+python -m benchmarks.dial 200 200 50 9
+```
+"""
+
+import random
+import sys
+import time
+from cell import Cell
+from helpers import run_to_completion
+from maze_generation import dfs
+from path_finding import dijkstra, dial
+from search import SearchContext
+
+
+def main() -> None:
+    """Main function.
+
+    Generates a weighted maze, answers the same queries with both
+    algorithms and prints the time needed per query.
+    """
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    height = int(sys.argv[2]) if len(sys.argv) > 2 else width
+    queries = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+    max_cost = int(sys.argv[4]) if len(sys.argv) > 4 else 9
+
+    rng = random.Random(0)
+    maze = run_to_completion(dfs(width, height, every=0, seed=0))
+
+    for index in range(width * height):
+        maze.set_cost(index, rng.randint(1, max_cost))
+
+        if rng.random() < 0.2:
+            maze.carve(index, rng.choice(maze.neighbours(index)))
+
+    def random_cell() -> Cell:
+        return Cell(rng.randrange(width), rng.randrange(height))
+
+    pairs = [(random_cell(), random_cell()) for _ in range(queries)]
+
+    def cost(path: list[Cell]) -> int:
+        return sum(maze.costs[maze.index(cell.x, cell.y)] for cell in path[1:])
+
+    print(f'{width}x{height} maze, {queries} queries, costs from 1 to {max_cost}')
+
+    expected = None
+
+    for solver in (dijkstra, dial):
+        context = SearchContext(width * height)
+
+        t0 = time.perf_counter()
+        paths = [run_to_completion(solver(maze, start, end, context, every=0)) for start, end in pairs]
+        elapsed = time.perf_counter() - t0
+
+        costs = [cost(path) for path in paths]
+        expected = expected or costs
+        assert costs == expected
+
+        if solver is dijkstra:
+            baseline = elapsed
+
+        print(f'{solver.__name__ + ":":10} {elapsed / queries * 1e3:8.3f} ms/query ({baseline / elapsed:4.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
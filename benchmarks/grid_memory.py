@@ -0,0 +1,80 @@
+"""Grid Memory Benchmark.
+
+Compares the memory used by a maze stored as a ``list[list[Cell]]``
+with the memory used by a compact ``Grid``. The list is measured with
+the cells the maze had before ``Grid``, which kept their walls in a
+dictionary and had no ``__slots__``, and with today's ``Cell``.
+
+Run it from the root of the repository:
+```
+python -m benchmarks.grid_memory 500 500
+```
+"""
+
+import sys
+import tracemalloc
+from cell import Cell
+from grid import Grid
+
+
+class DictCell:
+    """A cell as it was before ``Grid``, with an instance dictionary."""
+
+    def __init__(self, x: int, y: int) -> None:
+        """Initialize a cell with all of its walls."""
+        self.x = x
+        self.y = y
+
+        self.g = self.h = self.f = 0
+        self.parent = None
+
+        self.walls = {'n': True, 's': True, 'e': True, 'w': True}
+
+
+def measure(build) -> int:
+    """Measure the memory allocated by a function.
+
+    Parameters
+    ----------
+    build : callable
+        The function building the maze.
+
+    Returns
+    -------
+    int
+        The number of bytes still allocated once the function returns.
+    """
+    tracemalloc.start()
+    maze = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # The maze is kept until it is measured.
+    del maze
+
+    return size
+
+
+def main() -> None:
+    """Main function.
+
+    Builds both representations of a maze and prints the memory used
+    per cell.
+    """
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    height = int(sys.argv[2]) if len(sys.argv) > 2 else width
+    cells = width * height
+
+    dict_bytes = measure(lambda: [[DictCell(x, y) for x in range(width)] for y in range(height)])
+    cell_bytes = measure(lambda: [[Cell(x, y) for x in range(width)] for y in range(height)])
+    grid_bytes = measure(lambda: Grid(width, height))
+
+    print(f'{width}x{height} maze ({cells} cells)')
+    print(f'list[list[DictCell]]: {dict_bytes / cells:8.1f} bytes/cell')
+    print(f'list[list[Cell]]:     {cell_bytes / cells:8.1f} bytes/cell')
+    print(f'Grid:                 {grid_bytes / cells:8.1f} bytes/cell')
+    print(f'reduction:            {dict_bytes / grid_bytes:8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
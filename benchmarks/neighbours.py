@@ -0,0 +1,86 @@
+"""Neighbours Benchmark.
+
+Compares the time needed to find the open neighbours of every cell of a
+maze with ``get_neighbours`` and ``are_connected`` against the time
+needed with the adjacency table of ``Grid``.
+
+Run it from the root of the repository:
+```
+python -m benchmarks.neighbours 300 300
+```
+"""
+
+import random
+import sys
+import time
+from helpers import get_neighbours, are_connected, run_to_completion
+from maze_generation import dfs
+
+
+def measure(scan) -> float:
+    """Measure the best time of a function over a few runs.
+
+    Parameters
+    ----------
+    scan : callable
+        The function visiting the neighbours of every cell.
+
+    Returns
+    -------
+    float
+        The best time in seconds.
+    """
+    times = []
+
+    for _ in range(3):
+        t0 = time.perf_counter()
+        scan()
+        times.append(time.perf_counter() - t0)
+
+    return min(times)
+
+
+def main() -> None:
+    """Main function.
+
+    Generates a maze and prints the time needed per cell by both ways of
+    finding the open neighbours.
+    """
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    height = int(sys.argv[2]) if len(sys.argv) > 2 else width
+    cells = width * height
+
+    random.seed(0)
+    maze = run_to_completion(dfs(width, height, every=0))
+
+    def scan_cells() -> int:
+        total = 0
+        for row in maze:
+            for cell in row:
+                for neighbour in get_neighbours(maze, cell):
+                    if are_connected(cell, neighbour):
+                        total += 1
+        return total
+
+    def scan_table() -> int:
+        walls = maze.walls
+        passages = maze.passages
+        total = 0
+        for index in range(cells):
+            for offset in passages[walls[index]]:
+                total += 1
+        return total
+
+    assert scan_cells() == scan_table()
+
+    cell_time = measure(scan_cells)
+    table_time = measure(scan_table)
+
+    print(f'{width}x{height} maze ({cells} cells)')
+    print(f'get_neighbours:  {cell_time / cells * 1e9:8.1f} ns/cell')
+    print(f'Grid.passages:   {table_time / cells * 1e9:8.1f} ns/cell')
+    print(f'speedup:         {cell_time / table_time:8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
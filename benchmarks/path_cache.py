@@ -0,0 +1,64 @@
+"""Path Cache Benchmark.
+
+Compares the time needed to answer many path queries on the same maze
+with ``astar`` against the time needed with a ``PathCache``. The queries
+come from a few start cells, like a handful of units sent to many
+targets.
+
+Run it from the root of the repository:
+```
+python -m benchmarks.path_cache 200 200 1000 10
+```
+"""
+
+import random
+import sys
+import time
+from cell import Cell
+from helpers import run_to_completion
+from maze_generation import dfs
+from path_cache import PathCache
+from path_finding import astar
+from search import SearchContext
+
+
+def main() -> None:
+    """Main function.
+
+    Generates a maze, answers the same queries both ways and prints the
+    time needed per query.
+    """
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    height = int(sys.argv[2]) if len(sys.argv) > 2 else width
+    queries = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+    starts = int(sys.argv[4]) if len(sys.argv) > 4 else 10
+
+    random.seed(0)
+    maze = run_to_completion(dfs(width, height, every=0))
+
+    def random_cell() -> Cell:
+        return Cell(random.randrange(width), random.randrange(height))
+
+    sources = [random_cell() for _ in range(starts)]
+    pairs = [(random.choice(sources), random_cell()) for _ in range(queries)]
+
+    context = SearchContext(width * height)
+    t0 = time.perf_counter()
+    expected = [run_to_completion(astar(maze, start, end, context, every=0)) for start, end in pairs]
+    astar_time = time.perf_counter() - t0
+
+    cache = PathCache(maze)
+    t0 = time.perf_counter()
+    paths = [cache.path(start, end) for start, end in pairs]
+    cache_time = time.perf_counter() - t0
+
+    assert [len(path) for path in paths] == [len(path) for path in expected]
+
+    print(f'{width}x{height} maze, {queries} queries from {starts} start cells')
+    print(f'astar:      {astar_time / queries * 1e3:8.3f} ms/query')
+    print(f'PathCache:  {cache_time / queries * 1e3:8.3f} ms/query ({cache.hits} hits, {cache.misses} misses)')
+    print(f'speedup:    {astar_time / cache_time:8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Startup Benchmark.
+
+Measures how long it takes a fresh interpreter to import the core
+modules (the algorithms, the grid and the helpers), which must never
+pull in pygame, and compares it with importing the visualizer.
+
+Run it from the root of the repository:
+```
+python -m benchmarks.startup 20
+```
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+
+
+CORE = ['cell', 'grid', 'search', 'helpers', 'maze_generation', 'path_finding', 'algorithm']
+
+# Imports the modules given as arguments and prints the time it took and
+# whether pygame got imported along the way.
+PROBE = '''
+import sys, time, json
+started = time.perf_counter()
+for name in sys.argv[1:]:
+    __import__(name)
+print(json.dumps([time.perf_counter() - started, 'pygame' in sys.modules]))
+'''
+
+
+def measure(modules: list[str], repeat: int) -> tuple[float, bool]:
+    """Measure the time needed to import modules in a fresh interpreter.
+
+    Parameters
+    ----------
+    modules : list[str]
+        The modules to import.
+    repeat : int
+        The number of interpreters to start.
+
+    Returns
+    -------
+    tuple[float, bool]
+        The median import time in seconds and whether pygame was
+        imported.
+    """
+    times = []
+    pygame = False
+
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', PROBE, *modules], capture_output=True, text=True, check=True).stdout
+        elapsed, imported = json.loads(output.splitlines()[-1])
+        times.append(elapsed)
+        pygame = pygame or imported
+
+    return statistics.median(times), pygame
+
+
+def main() -> None:
+    """Main function.
+
+    Prints the median import time of the core and of the visualizer, and
+    fails if the core imports pygame.
+    """
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    core_time, core_pygame = measure(CORE, repeat)
+    main_time, _ = measure(['main'], repeat)
+
+    print(f'{repeat} runs, median import time')
+    print(f'core:  {core_time * 1e3:8.2f} ms')
+    print(f'main:  {main_time * 1e3:8.2f} ms')
+
+    assert not core_pygame, 'the core modules import pygame'
+
+
+if __name__ == '__main__':
+    main()
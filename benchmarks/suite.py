@@ -0,0 +1,277 @@
+"""Benchmark Suite.
+
+Times every maze generation and path finding algorithm on grids from the
+size of the window up to 2000x2000, with fixed seeds, and the time
+``main.draw_maze`` takes to draw a frame under the SDL dummy video
+driver. That the mazes are perfect and the paths the cheapest is
+checked by the tests in ``tests``, which also time the algorithms with
+pytest-benchmark on the smaller grids.
+
+The results are saved as JSON, and two result files can be compared to
+catch slowdowns. The comparison fails if any timing got slower by more
+than the threshold, or is missing from the new results, so a baseline
+run with ``--sizes`` is compared with runs of the same sizes.
+
+Run it from the root of the repository:
+```
+python -m benchmarks.suite run --sizes 25x15,100x100 --out baseline.json
+python -m benchmarks.suite run --sizes 25x15,100x100 --out current.json
+python -m benchmarks.suite compare baseline.json current.json --threshold 0.2
+```
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from algorithm import MazeGenerationAlgorithm, PathFindingAlgorithm
+from cell import Cell
+from grid import Grid
+from search import SearchContext
+
+
+SIZES = [(25, 15), (100, 100), (500, 500), (2000, 2000)]
+
+SEED = 0
+
+# The share of the cells of the solved maze with an extra wall carved, so
+# it has loops and the solvers do not all expand the same cells.
+LOOPS = 0.1
+
+# The number of random queries solved besides the corner to corner one.
+QUERIES = 4
+
+# Above this many pixels draw_maze is not timed, the surface would not
+# fit in memory.
+MAX_DRAW_PIXELS = 16_000_000
+
+# Above this many cells every timing is taken once instead of --repeat
+# times.
+MAX_REPEATED_CELLS = 250_000
+
+
+def best_time(function, repeat: int) -> tuple[float, object]:
+    """Time a function.
+
+    Parameters
+    ----------
+    function : Callable
+        The function to time, called without arguments.
+    repeat : int
+        The number of calls.
+
+    Returns
+    -------
+    tuple[float, object]
+        The fastest time in seconds and the value of the last call.
+    """
+    best = float('inf')
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+        value = function()
+        best = min(best, time.perf_counter() - started)
+
+    return best, value
+
+
+def solver_maze(width: int, height: int) -> tuple[Grid, list[tuple[Cell, Cell]]]:
+    """Generate the maze the solvers are timed on, and their queries.
+
+    Parameters
+    ----------
+    width : int
+        The width of the maze.
+    height : int
+        The height of the maze.
+
+    Returns
+    -------
+    tuple[Grid, list[tuple[Cell, Cell]]]
+        A maze with loops and the start and end cells of the corner to
+        corner query and of ``QUERIES`` random ones.
+    """
+    cells = width * height
+    rng = random.Random(SEED)
+    maze = MazeGenerationAlgorithm.DFS.run(width, height, seed=SEED)
+
+    for index in range(cells):
+        if rng.random() < LOOPS:
+            maze.carve(index, rng.choice(maze.neighbours(index)))
+
+    queries = [(0, cells - 1)] + [(rng.randrange(cells), rng.randrange(cells)) for _ in range(QUERIES)]
+
+    return maze, [(maze.cell(start), maze.cell(end)) for start, end in queries]
+
+
+def run(args: argparse.Namespace) -> int:
+    """Run the benchmarks and save the results.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The command line arguments.
+
+    Returns
+    -------
+    int
+        The exit status.
+    """
+    sizes = [tuple(map(int, size.split('x'))) for size in args.sizes.split(',')] if args.sizes else SIZES
+    timings = {}
+
+    def record(name: str, seconds: float) -> None:
+        timings[name] = seconds
+        print(f'{name:45} {seconds * 1e3:12.3f} ms', flush=True)
+
+    for width, height in sizes:
+        size = f'{width}x{height}'
+        cells = width * height
+        repeat = args.repeat if cells <= MAX_REPEATED_CELLS else 1
+
+        for generator in MazeGenerationAlgorithm:
+            seconds, maze = best_time(lambda: generator.run(width, height, seed=SEED), repeat)
+            record(f'generate/{generator.name.lower()}/{size}', seconds)
+
+        # The solvers share a maze with loops, and the same queries.
+        maze, cell_queries = solver_maze(width, height)
+
+        for solver in PathFindingAlgorithm:
+            context = SearchContext(cells)
+            seconds, _ = best_time(lambda: [solver.run(maze, start, end, context) for start, end in cell_queries], repeat)
+            record(f'solve/{solver.name.lower()}/{size}', seconds)
+
+        if args.draw:
+            seconds = draw_time(maze, repeat)
+            if seconds is not None:
+                record(f'draw/{size}', seconds)
+
+    results = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': SEED,
+        'repeat': args.repeat,
+        'timings': timings,
+    }
+
+    with open(args.out, 'w') as file:
+        json.dump(results, file, indent=2)
+        file.write('\n')
+
+    return 0
+
+
+def draw_time(maze: Grid, repeat: int) -> float:
+    """Time drawing a maze with ``main.draw_maze`` on an off-screen surface.
+
+    Parameters
+    ----------
+    maze : Grid
+        The maze.
+    repeat : int
+        The number of frames to draw.
+
+    Returns
+    -------
+    float
+        The fastest frame time in seconds, or None if the maze is too
+        large to draw.
+    """
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+    import pygame
+    import main
+
+    width, height = maze.width * main.SIZE, maze.height * main.SIZE
+
+    if width * height > MAX_DRAW_PIXELS:
+        return None
+
+    surface = pygame.Surface((width, height))
+    seconds, _ = best_time(lambda: main.draw_maze(maze, surface=surface), repeat)
+
+    return seconds
+
+
+def compare(args: argparse.Namespace) -> int:
+    """Compare two result files.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The command line arguments.
+
+    Returns
+    -------
+    int
+        The exit status, 1 if a timing got slower by more than the
+        threshold or is missing from the current results.
+    """
+    with open(args.baseline) as file:
+        baseline = json.load(file)['timings']
+    with open(args.current) as file:
+        current = json.load(file)
+
+    slower = []
+    missing = [name for name in baseline if name not in current['timings']]
+
+    for name, seconds in current['timings'].items():
+        if name not in baseline:
+            print(f'{name:45} {"new":>10}')
+            continue
+
+        ratio = seconds / baseline[name] if baseline[name] else 1.0
+        flag = ''
+
+        if ratio > 1 + args.threshold:
+            slower.append(name)
+            flag = '  SLOWER'
+
+        print(f'{name:45} {ratio:9.2f}x{flag}')
+
+    # A benchmark that was dropped or failed to run would otherwise pass.
+    for name in missing:
+        print(f'{name:45} {"missing":>10}')
+
+    if slower:
+        print(f'{len(slower)} timings slower than the baseline by more than {args.threshold:.0%}')
+    if missing:
+        print(f'{len(missing)} timings of the baseline missing from the current results')
+
+    return 1 if slower or missing else 0
+
+
+def main() -> None:
+    """Main function.
+
+    Parses the command line and runs the requested command.
+    """
+    parser = argparse.ArgumentParser(description='Benchmark every algorithm and compare the results with a baseline.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='run the benchmarks and save the results')
+    run_parser.add_argument('--sizes', help='comma-separated WIDTHxHEIGHT sizes, by default 25x15 up to 2000x2000')
+    run_parser.add_argument('--repeat', type=int, default=3, help='runs per timing, the fastest is kept')
+    run_parser.add_argument('--no-draw', dest='draw', action='store_false', help='do not time draw_maze')
+    run_parser.add_argument('--out', default='benchmark.json', help='file to save the results to')
+
+    compare_parser = commands.add_parser('compare', help='compare results with a baseline')
+    compare_parser.add_argument('baseline', help='the results to compare against')
+    compare_parser.add_argument('current', help='the new results')
+    compare_parser.add_argument('--threshold', type=float, default=0.2, help='the slowdown allowed, 0.2 for 20%%')
+
+    args = parser.parse_args()
+
+    match args.command:
+        case 'run':
+            sys.exit(run(args))
+        case 'compare':
+            sys.exit(compare(args))
+
+
+if __name__ == '__main__':
+    main()
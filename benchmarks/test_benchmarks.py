@@ -0,0 +1,68 @@
+"""Pytest Benchmarks.
+
+Times every generator and solver, and ``main.draw_maze``, with
+pytest-benchmark on the grids of ``benchmarks.suite`` small enough to be
+timed several times. They are not part of the tests, so they only run
+when asked for.
+
+Run them from the root of the repository:
+```
+python -m pytest benchmarks --benchmark-autosave
+python -m pytest benchmarks --benchmark-compare --benchmark-compare-fail=min:20%
+```
+"""
+
+import os
+import pytest
+from algorithm import MazeGenerationAlgorithm, PathFindingAlgorithm
+from benchmarks.suite import SIZES, SEED, MAX_REPEATED_CELLS, MAX_DRAW_PIXELS, solver_maze
+from search import SearchContext
+
+
+pytest.importorskip('pytest_benchmark')
+
+# The larger grids are timed by benchmarks.suite, once per run.
+BENCHMARK_SIZES = [size for size in SIZES if size[0] * size[1] <= MAX_REPEATED_CELLS]
+
+ROUNDS = 3
+
+
+def size_id(size: tuple[int, int]) -> str:
+    """Name a grid size like the suite does."""
+    return f'{size[0]}x{size[1]}'
+
+
+@pytest.mark.parametrize('generator', MazeGenerationAlgorithm, ids=lambda generator: generator.name.lower())
+@pytest.mark.parametrize('size', BENCHMARK_SIZES, ids=size_id)
+def test_generate(benchmark, generator, size):
+    benchmark.pedantic(generator.run, args=size, kwargs={'seed': SEED}, rounds=ROUNDS)
+
+
+@pytest.mark.parametrize('solver', PathFindingAlgorithm, ids=lambda solver: solver.name.lower())
+@pytest.mark.parametrize('size', BENCHMARK_SIZES, ids=size_id)
+def test_solve(benchmark, solver, size):
+    maze, queries = solver_maze(*size)
+    context = SearchContext(maze.width * maze.height)
+
+    def solve():
+        return [solver.run(maze, start, end, context) for start, end in queries]
+
+    benchmark.pedantic(solve, rounds=ROUNDS)
+
+
+@pytest.mark.parametrize('size', BENCHMARK_SIZES, ids=size_id)
+def test_draw(benchmark, size):
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+    pygame = pytest.importorskip('pygame')
+    import main
+
+    maze, _ = solver_maze(*size)
+    width, height = maze.width * main.SIZE, maze.height * main.SIZE
+
+    if width * height > MAX_DRAW_PIXELS:
+        pytest.skip('the surface would not fit in memory')
+
+    surface = pygame.Surface((width, height))
+    benchmark.pedantic(main.draw_maze, args=(maze,), kwargs={'surface': surface}, rounds=ROUNDS)
@@ -0,0 +1,183 @@
+"""Viewport Benchmark.
+
+Measures the frame time of the viewport renderer on a large maze under
+the SDL dummy video driver: zoomed out on the overview, close up with
+the chunks in view already drawn, and panning over chunks that were
+never drawn. The last scenarios draw the open and closed cells of a
+search that closed half of the maze and moves its open row down by one
+every frame, zoomed out and close up. A frame must take less than
+16.7 ms to keep 60 FPS.
+
+Run it from the root of the repository:
+```
+python -m benchmarks.viewport 1000 1000 100
+```
+"""
+
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import pygame
+from algorithm import MazeGenerationAlgorithm
+from cell import Cell
+from grid import CellView
+from viewport import Viewport
+
+
+VIEW = (1280, 800)
+
+
+def frame_times(view: Viewport, surface: pygame.Surface, overlays: dict, frames: int, dx: float, dy: float) -> list[float]:
+    """Time frames drawn while panning.
+
+    Parameters
+    ----------
+    view : Viewport
+        The viewport.
+    surface : pygame.Surface
+        The surface to draw on.
+    overlays : dict
+        The overlays to draw.
+    frames : int
+        The number of frames.
+    dx : float
+        The distance to pan by between two frames, in pixels.
+    dy : float
+        The distance to pan by between two frames, in pixels.
+
+    Returns
+    -------
+    list[float]
+        The time of every frame in seconds.
+    """
+    times = []
+
+    for _ in range(frames):
+        view.pan(dx, dy)
+
+        started = time.perf_counter()
+        view.draw(surface, overlays, set())
+        times.append(time.perf_counter() - started)
+
+    return times
+
+
+def search_times(view: Viewport, surface: pygame.Surface, overlays: dict, frames: int, dx: float, dy: float) -> list[float]:
+    """Time frames drawn while panning and a search goes on.
+
+    Every frame the row of open cells is closed and the row below it
+    opened, and the cells are passed to the viewport as changed.
+
+    Parameters
+    ----------
+    view : Viewport
+        The viewport.
+    surface : pygame.Surface
+        The surface to draw on.
+    overlays : dict
+        The overlays to draw, with the open and closed cells as views of
+        sets of indices.
+    frames : int
+        The number of frames.
+    dx : float
+        The distance to pan by between two frames, in pixels.
+    dy : float
+        The distance to pan by between two frames, in pixels.
+
+    Returns
+    -------
+    list[float]
+        The time of every frame in seconds.
+    """
+    maze = view.maze
+    open_cells = overlays['open_cells'].indices
+    closed_cells = overlays['closed_cells'].indices
+    times = []
+
+    for _ in range(frames):
+        view.pan(dx, dy)
+
+        row = min(open_cells) // maze.width + 1
+        opened = set(range(row * maze.width, min((row + 1) * maze.width, maze.width * maze.height)))
+        changed = {maze.cell(index) for index in open_cells | opened}
+        closed_cells |= open_cells
+        open_cells.clear()
+        open_cells |= opened
+
+        started = time.perf_counter()
+        view.draw(surface, overlays, changed)
+        times.append(time.perf_counter() - started)
+
+    return times
+
+
+def report(name: str, times: list[float]) -> None:
+    """Print the median and the slowest frame time.
+
+    Parameters
+    ----------
+    name : str
+        The name of the scenario.
+    times : list[float]
+        The frame times in seconds.
+    """
+    print(f'{name:10} median {statistics.median(times) * 1e3:7.2f} ms, max {max(times) * 1e3:7.2f} ms')
+
+
+def main() -> None:
+    """Main function.
+
+    Generates a maze and prints the frame times of every scenario.
+    """
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    height = int(sys.argv[2]) if len(sys.argv) > 2 else width
+    frames = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+
+    pygame.display.init()
+    surface = pygame.display.set_mode(VIEW)
+
+    maze = MazeGenerationAlgorithm.DFS.run(width, height, seed=0)
+    path = {Cell(x, x * height // width) for x in range(width)}
+    overlays = {'start_cell': Cell(0, 0), 'end_cell': Cell(width - 1, height - 1), 'path': path}
+
+    print(f'{width}x{height} maze, {VIEW[0]}x{VIEW[1]} view, {frames} frames')
+
+    view = Viewport(maze, *VIEW)
+    report('overview', frame_times(view, surface, overlays, frames, 3, 2))
+
+    # The first frame close up draws the chunks in view, the next ones
+    # only blit them.
+    view.zoom(4, 0, 0)
+    frame_times(view, surface, overlays, 1, 0, 0)
+    report('cached', frame_times(view, surface, overlays, frames, 0, 0))
+
+    # Every frame pans by a fraction of a chunk, so new chunks come into
+    # view every few frames.
+    report('panning', frame_times(view, surface, overlays, frames, -40, -25))
+
+    # The overlays of a search, as the solvers and the worker yield them:
+    # views of sets of indices, here the top half of the maze closed and
+    # the row below it open.
+    cells = width * height
+    half = cells // 2 // width * width
+    search = dict(overlays)
+    search['closed_cells'] = CellView(maze, set(range(half)))
+    search['open_cells'] = CellView(maze, set(range(half, min(half + width, cells))))
+
+    # The first frame marks the cells of every overlay, the next ones
+    # only the cells that changed.
+    view.fit()
+    frame_times(view, surface, search, 1, 0, 0)
+    report('search out', search_times(view, surface, search, frames, 0, 0))
+
+    view.zoom(4, 0, 0)
+    report('search in', search_times(view, surface, search, frames, -40, -25))
+
+
+if __name__ == '__main__':
+    main()
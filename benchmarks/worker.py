@@ -0,0 +1,78 @@
+"""Worker Benchmark.
+
+Runs a search on an ``AlgorithmWorker`` while a loop standing in for
+the render loop drains its updates 60 times per second, and compares
+its speed with running the same search without a thread. The loop must
+keep its frames close to 16.7 ms however many steps the worker runs.
+The GIL switch interval is ``SWITCH_INTERVAL``, like in ``main``.
+
+Run it from the root of the repository:
+```
+python -m benchmarks.worker 1000 1000
+```
+"""
+
+import random
+import statistics
+import sys
+import time
+from algorithm import MazeGenerationAlgorithm, PathFindingAlgorithm
+from search import SearchContext
+from worker import AlgorithmWorker, SWITCH_INTERVAL
+
+
+FRAME = 1 / 60
+
+
+def main() -> None:
+    """Main function.
+
+    Generates a maze with loops and prints the steps per second of the
+    search with and without the worker and the frame times of the loop.
+    """
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    height = int(sys.argv[2]) if len(sys.argv) > 2 else width
+
+    rng = random.Random(0)
+    maze = MazeGenerationAlgorithm.DFS.run(width, height, seed=0)
+
+    for index in range(width * height):
+        if rng.random() < 0.1:
+            maze.carve(index, rng.choice(maze.neighbours(index)))
+
+    solver = PathFindingAlgorithm.DIJKSTRA
+    start, end = maze.cell(0), maze.cell(width * height - 1)
+    context = SearchContext(width * height)
+
+    started = time.perf_counter()
+    steps = sum(1 for _ in solver.animate(maze, start, end, context))
+    direct = time.perf_counter() - started
+
+    sys.setswitchinterval(SWITCH_INTERVAL)
+    worker = AlgorithmWorker(solver.animate(maze, start, end, context))
+    frames = []
+    polls = []
+    finished = False
+
+    started = time.perf_counter()
+    worker.start()
+
+    while not finished:
+        frame = time.perf_counter()
+        _, _, finished, _ = worker.poll()
+        polls.append(time.perf_counter() - frame)
+
+        time.sleep(max(FRAME - (time.perf_counter() - frame), 0))
+        frames.append(time.perf_counter() - frame)
+
+    threaded = time.perf_counter() - started
+
+    print(f'{width}x{height} maze, {solver.name.lower()}, {steps} steps')
+    print(f'direct:   {steps / direct:12.0f} steps/s')
+    print(f'worker:   {steps / threaded:12.0f} steps/s ({direct / threaded:4.2f}x)')
+    print(f'frames:   median {statistics.median(frames) * 1e3:6.2f} ms, max {max(frames) * 1e3:6.2f} ms')
+    print(f'poll:     median {statistics.median(polls) * 1e3:6.2f} ms, max {max(polls) * 1e3:6.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
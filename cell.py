@@ -1,8 +1,8 @@
 class Cell:
     """A cell in the maze.
     
-    This class represents a cell in the maze. It has a position, a
-    g, h and f value, a parent and a list of walls.
+    This class represents a cell in the maze. It has a position and a
+    list of walls.
 
     Attributes
     ----------
@@ -10,14 +10,6 @@ class Cell:
         The x coordinate of the cell.
     y : int
         The y coordinate of the cell.
-    g : int
-        Cost of the path from the start cell.
-    h : int
-        Estimated cost of the cheapest path from the cell to the goal.
-    f : int
-        The sum of the g and h values.
-    parent : Cell
-        The parent cell of the current cell.
     walls : dict
         A dictionary of the walls of the cell.
     
@@ -27,6 +19,12 @@ class Cell:
         Carve a wall in the cell.
     """
 
+    __slots__ = ('x', 'y', 'walls')
+
+    # The cost of entering a cell. Only the cells of a ``Grid`` can have
+    # another one.
+    cost = 1
+
     def __init__(self, x, y) -> None:
         """Initialize a cell.
         
@@ -40,9 +38,6 @@ class Cell:
         self.x = x
         self.y = y
 
-        self.g = self.h = self.f = 0
-        self.parent = None
-
         self.walls = {'n': True, 's': True, 'e': True, 'w': True}
     
     def carve(self, wall: str) -> None:
@@ -0,0 +1,11 @@
+BLACK = 0x0A0908
+WHITE = 0xF1FFE7
+RED = 0xC1292E
+GREEN = 0x63A46C
+BLUE = 0x0E6BA8
+YELLOW = 0xF1D302
+CYAN = 0x5CC8FF
+PINK = 0xEAC4D5
+GREY = 0x596475
+ORANGE = 0xF18F01
+BROWN = 0x8C5A3C
@@ -0,0 +1,170 @@
+from weakref import WeakKeyDictionary
+from grid import Grid
+
+
+OPEN_WALLS = [4 - bin(mask).count('1') for mask in range(16)]
+
+
+class ContractedGraph:
+    """A maze with its corridors contracted into weighted edges.
+
+    Perfect mazes are mostly long corridors of cells with exactly two
+    open walls. This class keeps only the other cells, the junctions and
+    dead ends, as nodes, and replaces every corridor between two of them
+    by a single edge weighted by its cost, the sum of the costs of
+    entering its cells. A search over this graph expands one node per
+    corridor instead of one cell per step.
+
+    Attributes
+    ----------
+    maze : Grid
+        The maze the graph was built from.
+    version : int
+        The version of the maze the graph was built from.
+    edges : dict[int, list[tuple[int, int, int]]]
+        The edges of every node, as ``(node, cost, last)`` tuples where
+        ``last`` is the cell of the corridor next to the other node. The
+        cost of an edge leaving a node does not count the node itself, so
+        the two directions of a corridor can cost differently.
+
+    Methods
+    -------
+    of(maze: Grid)
+        Get the graph of a maze, building it only when the maze changed.
+    is_node(index: int)
+        Check if a cell is a junction or a dead end.
+    walk(previous: int, current: int, stop: set[int] = set())
+        Follow a corridor.
+    corridors(index: int, stop: set[int] = set())
+        Follow every corridor leaving a cell.
+    cost(cells: list[int])
+        Get the cost of entering a list of cells.
+    """
+
+    _graphs = WeakKeyDictionary()
+
+    def __init__(self, maze: Grid) -> None:
+        """Build the graph of a maze.
+
+        Parameters
+        ----------
+        maze : Grid
+            The maze to contract.
+        """
+        self.maze = maze
+        self.version = maze.version
+        self.edges = {}
+
+        for index, mask in enumerate(maze.walls):
+            if OPEN_WALLS[mask] == 2:
+                continue
+
+            edges = []
+
+            for cells in self.corridors(index):
+                node = cells[-1]
+                if node != index:
+                    edges.append((node, self.cost(cells), cells[-2] if len(cells) > 1 else index))
+
+            self.edges[index] = edges
+
+    @classmethod
+    def of(cls, maze: Grid) -> 'ContractedGraph':
+        """Get the graph of a maze, building it only when the maze changed.
+
+        Parameters
+        ----------
+        maze : Grid
+            The maze to get the graph of.
+
+        Returns
+        -------
+        ContractedGraph
+            The graph of the current version of the maze.
+        """
+        graph = cls._graphs.get(maze)
+
+        if graph is None or graph.version != maze.version:
+            graph = cls._graphs[maze] = cls(maze)
+
+        return graph
+
+    def is_node(self, index: int) -> bool:
+        """Check if a cell is a junction or a dead end.
+
+        Parameters
+        ----------
+        index : int
+            The index of the cell.
+
+        Returns
+        -------
+        bool
+            True if the cell does not have exactly two open walls.
+        """
+        return OPEN_WALLS[self.maze.walls[index]] != 2
+
+    def walk(self, previous: int, current: int, stop: set[int] = set()) -> list[int]:
+        """Follow a corridor.
+
+        Parameters
+        ----------
+        previous : int
+            The cell the corridor is entered from.
+        current : int
+            The first cell of the corridor.
+        stop : set[int], optional
+            Cells to stop at even if they are in the middle of a corridor.
+
+        Returns
+        -------
+        list[int]
+            The cells of the corridor, from ``current`` to the node or stop
+            cell it ends at.
+        """
+        walls = self.maze.walls
+        passages = self.maze.passages
+        cells = [current]
+
+        while OPEN_WALLS[walls[current]] == 2 and current not in stop:
+            for delta in passages[walls[current]]:
+                if current + delta != previous:
+                    previous, current = current, current + delta
+                    break
+
+            cells.append(current)
+
+        return cells
+
+    def corridors(self, index: int, stop: set[int] = set()) -> list[list[int]]:
+        """Follow every corridor leaving a cell.
+
+        Parameters
+        ----------
+        index : int
+            The cell to leave from.
+        stop : set[int], optional
+            Cells to stop at even if they are in the middle of a corridor.
+
+        Returns
+        -------
+        list[list[int]]
+            The cells of every corridor, see ``walk``.
+        """
+        return [self.walk(index, index + delta, stop | {index}) for delta in self.maze.passages[self.maze.walls[index]]]
+
+    def cost(self, cells: list[int]) -> int:
+        """Get the cost of entering a list of cells.
+
+        Parameters
+        ----------
+        cells : list[int]
+            The cells, for example a corridor returned by ``walk``.
+
+        Returns
+        -------
+        int
+            The sum of the costs of the cells.
+        """
+        costs = self.maze.costs
+        return sum(costs[index] for index in cells)
@@ -0,0 +1,184 @@
+import numpy as np
+from array import array
+from grid import Grid, NORTH, SOUTH, EAST, WEST
+
+
+UNREACHABLE = -1
+
+# The frontier size from which a step is done with array operations.
+WIDE_FRONTIER = 128
+
+
+def _sweep(maze: Grid, frontier: list[int], fields: int) -> np.ndarray:
+    """Run breadth-first searches one frontier at a time.
+
+    A wide frontier is expanded with array operations on the wall masks,
+    which cost a handful of NumPy calls per step however many cells it
+    holds. A narrow one, such as the frontier walking down a corridor of
+    a perfect maze, is expanded cell by cell through ``Grid.passages``,
+    since the overhead of the NumPy calls would dominate. Both write to
+    the same buffer, so switching between them is free.
+
+    Parameters
+    ----------
+    maze : Grid
+        The maze to search.
+    frontier : list[int]
+        The sources, as indices into ``fields`` stacked distance fields.
+    fields : int
+        The number of distance fields.
+
+    Returns
+    -------
+    np.ndarray
+        The stacked distance fields, flattened.
+    """
+    width = maze.width
+    cells = width * maze.height
+    passages = maze.passages
+
+    masks = bytes(maze.walls)
+    walls = np.frombuffer(masks, dtype=np.uint8)
+
+    field = array('i', [UNREACHABLE]) * (fields * cells)
+    distances = np.frombuffer(field, dtype=np.int32)
+
+    for index in frontier:
+        field[index] = 0
+    distance = 0
+
+    # The border walls always stand, so a step through an open wall stays
+    # in the same field.
+    moves = ((NORTH, -width), (SOUTH, width), (EAST, 1), (WEST, -1))
+
+    while len(frontier):
+        distance += 1
+
+        if len(frontier) < WIDE_FRONTIER:
+            if isinstance(frontier, np.ndarray):
+                frontier = frontier.tolist()
+
+            reached = []
+
+            for index in frontier:
+                for offset in passages[masks[index % cells]]:
+                    neighbour = index + offset
+                    if field[neighbour] == UNREACHABLE:
+                        field[neighbour] = distance
+                        reached.append(neighbour)
+
+            frontier = reached
+        else:
+            frontier = np.asarray(frontier, dtype=np.int64)
+            frontier_masks = walls[frontier % cells]
+
+            reached = np.concatenate([frontier[(frontier_masks & bit) == 0] + offset for bit, offset in moves])
+            reached = reached[distances[reached] == UNREACHABLE]
+
+            # A cell reached from two frontier cells is kept once: every
+            # entry writes its own position, and only the last write of a
+            # cell survives. This avoids sorting like np.unique would.
+            order = np.arange(2, reached.size + 2, dtype=np.int32)
+            distances[reached] = -order
+            reached = reached[distances[reached] == -order]
+
+            distances[reached] = distance
+            frontier = reached
+
+    return distances
+
+
+def distance_field(maze: Grid, sources: list[int]) -> np.ndarray:
+    """Compute the distance from the nearest source to every cell of a maze.
+
+    This is a breadth-first search run one frontier at a time, with array
+    operations straight on the wall masks when the frontier is wide. It
+    counts steps and ignores ``Grid.costs``, use ``PathCache.tree`` for
+    the cheapest paths of a weighted maze.
+
+    Parameters
+    ----------
+    maze : Grid
+        The maze to compute the distances in.
+    sources : list[int]
+        The indices of the source cells.
+
+    Returns
+    -------
+    np.ndarray
+        A ``(height, width)`` array with the number of steps from the
+        nearest source to every cell, ``UNREACHABLE`` for the cells no
+        source can reach.
+    """
+    return _sweep(maze, sorted(set(sources)), 1).reshape(maze.height, maze.width)
+
+
+def distance_fields(maze: Grid, sources: list[int]) -> np.ndarray:
+    """Compute the distance from every source to every cell of a maze.
+
+    The searches of all the sources run together, their frontiers being
+    indices into stacked fields, so the cost of a step is shared by all
+    of them.
+
+    Parameters
+    ----------
+    maze : Grid
+        The maze to compute the distances in.
+    sources : list[int]
+        The indices of the source cells.
+
+    Returns
+    -------
+    np.ndarray
+        A ``(len(sources), height, width)`` array with the number of steps
+        from every source to every cell, ``UNREACHABLE`` for the cells a
+        source cannot reach.
+    """
+    cells = maze.width * maze.height
+    frontier = [i * cells + source for i, source in enumerate(sources)]
+
+    return _sweep(maze, frontier, len(sources)).reshape(len(sources), maze.height, maze.width)
+
+
+def farthest(field: np.ndarray) -> tuple[int, int]:
+    """Find the farthest cell of a distance field.
+
+    Parameters
+    ----------
+    field : np.ndarray
+        The distance field, as returned by ``distance_field``.
+
+    Returns
+    -------
+    tuple[int, int]
+        The index of the farthest reachable cell and its distance.
+    """
+    index = int(np.argmax(field))
+    return index, int(field.flat[index])
+
+
+def diameter(maze: Grid, source: int = 0) -> tuple[int, int, int]:
+    """Find the longest shortest path of a maze by a double sweep.
+
+    The farthest cell from any cell is one end of a longest path of a
+    tree, and the farthest cell from it is the other end, so two distance
+    fields are enough. This is exact for perfect mazes. In mazes with
+    loops it gives a lower bound, which is usually tight.
+
+    Parameters
+    ----------
+    maze : Grid
+        The maze to measure.
+    source : int, optional
+        The index of the cell to start the first sweep from. Only the
+        part of the maze connected to it is measured.
+
+    Returns
+    -------
+    tuple[int, int, int]
+        The length of the path in steps and the indices of its two ends.
+    """
+    a, _ = farthest(distance_field(maze, [source]))
+    b, length = farthest(distance_field(maze, [a]))
+
+    return length, a, b
@@ -0,0 +1,490 @@
+from collections.abc import MutableMapping
+from cell import Cell
+
+
+NORTH = 1
+SOUTH = 2
+EAST = 4
+WEST = 8
+
+ALL_WALLS = NORTH | SOUTH | EAST | WEST
+
+WALL_BITS = {'n': NORTH, 's': SOUTH, 'e': EAST, 'w': WEST}
+
+
+class Grid:
+    """A compact maze grid.
+
+    This class stores a maze as a flat array indexed by
+    ``y * width + x`` instead of a list of lists of cells. The walls of
+    every cell are a 4-bit mask in a single byte, so a cell costs one
+    byte instead of a full object, and the search state lives in a
+    ``SearchContext``. Indexing the grid like a ``list[list[Cell]]``
+    returns lightweight cell views, so the helpers and the renderer work
+    on it unchanged.
+
+    Attributes
+    ----------
+    width : int
+        The width of the maze.
+    height : int
+        The height of the maze.
+    walls : bytearray
+        The wall mask of every cell. The walls on the border of the grid
+        always stand, so following an open wall never leaves the grid. Any
+        mutable sequence of masks works, so a loaded maze can keep them in
+        its file.
+    costs : bytearray
+        The cost of entering every cell, from 1 to 255. Moving from a cell
+        to a neighbour costs the cost of the neighbour, so a path costs
+        the sum of the costs of its cells but the first. They are edited
+        with ``set_cost``, which keeps their lowest and highest cost.
+    version : int
+        A counter that goes up whenever a wall is added or carved, or the
+        cost of a cell changes.
+    passages : tuple[tuple[int, ...], ...]
+        For every wall mask, the offsets from a cell to the neighbours it
+        is connected to. ``passages[walls[index]]`` is the adjacency of a
+        cell, so it is always up to date with the walls.
+
+    Methods
+    -------
+    index(x: int, y: int)
+        Get the index of a cell.
+    cell(index: int)
+        Get a view of the cell at an index.
+    neighbours(index: int)
+        Get the indices of the neighbours of a cell.
+    carve(index: int, neighbour: int)
+        Carve the wall between two neighbouring cells.
+    add_wall(index: int, neighbour: int)
+        Add the wall between two neighbouring cells.
+    set_cost(index: int, cost: int)
+        Set the cost of entering a cell.
+    min_cost()
+        Get the lowest cost of entering a cell.
+    max_cost()
+        Get the highest cost of entering a cell.
+    """
+
+    def __init__(self, width: int, height: int, walls=None, costs=None) -> None:
+        """Initialize a grid, by default with every wall standing.
+
+        Parameters
+        ----------
+        width : int
+            The width of the maze.
+        height : int
+            The height of the maze.
+        walls : MutableSequence[int], optional
+            The wall mask of every cell, for example a
+            ``maze_file.PackedWalls`` over a memory-mapped file. It is
+            used as is, without copying it.
+        costs : MutableSequence[int], optional
+            The cost of entering every cell, by default 1 everywhere. It is
+            used as is, without copying it.
+        """
+        self.width = width
+        self.height = height
+
+        self.walls = bytearray([ALL_WALLS]) * (width * height) if walls is None else walls
+        self.costs = bytearray([1]) * (width * height) if costs is None else costs
+        self.version = 0
+
+        # The lowest and highest costs, kept by set_cost so the searches do
+        # not scan every cell. A bound is exact unless the cell holding it
+        # was overwritten, in which case the new one is searched for from
+        # it the next time it is asked for. The costs given are only
+        # scanned then too, so a loaded maze still opens instantly.
+        self._min_cost, self._max_cost = (1, 1) if costs is None else (1, 255)
+        self._min_exact = self._max_exact = costs is None
+
+        offsets = ((NORTH, -width), (SOUTH, width), (EAST, 1), (WEST, -1))
+        self.passages = tuple(tuple(offset for bit, offset in offsets if not mask & bit) for mask in range(ALL_WALLS + 1))
+
+    def index(self, x: int, y: int) -> int:
+        """Get the index of a cell.
+
+        Parameters
+        ----------
+        x : int
+            The x coordinate of the cell.
+        y : int
+            The y coordinate of the cell.
+
+        Returns
+        -------
+        int
+            The index of the cell in the flat arrays.
+        """
+        return y * self.width + x
+
+    def cell(self, index: int) -> 'GridCell':
+        """Get a view of the cell at an index.
+
+        Parameters
+        ----------
+        index : int
+            The index of the cell.
+
+        Returns
+        -------
+        GridCell
+            A view of the cell.
+        """
+        y, x = divmod(index, self.width)
+        return GridCell(self, x, y)
+
+    def neighbours(self, index: int) -> list[int]:
+        """Get the indices of the neighbours of a cell.
+
+        The neighbours are in the same order as ``helpers.get_neighbours``.
+
+        Parameters
+        ----------
+        index : int
+            The index of the cell.
+
+        Returns
+        -------
+        list[int]
+            The indices of the cells next to the cell, whether they are
+            connected or not.
+        """
+        y, x = divmod(index, self.width)
+        neighbours = []
+
+        if x > 0:
+            neighbours.append(index - 1)
+        if x < self.width - 1:
+            neighbours.append(index + 1)
+        if y > 0:
+            neighbours.append(index - self.width)
+        if y < self.height - 1:
+            neighbours.append(index + self.width)
+
+        return neighbours
+
+    def carve(self, index: int, neighbour: int) -> None:
+        """Carve the wall between two neighbouring cells.
+
+        Parameters
+        ----------
+        index : int
+            The index of the cell to carve a wall from.
+        neighbour : int
+            The index of the cell to carve a wall to.
+        """
+        bit, neighbour_bit = self._wall_bits(index, neighbour)
+
+        if self.walls[index] & bit:
+            self.walls[index] &= ~bit
+            self.walls[neighbour] &= ~neighbour_bit
+            self.version += 1
+
+    def add_wall(self, index: int, neighbour: int) -> None:
+        """Add the wall between two neighbouring cells.
+
+        Parameters
+        ----------
+        index : int
+            The index of the cell to add a wall from.
+        neighbour : int
+            The index of the cell to add a wall to.
+        """
+        bit, neighbour_bit = self._wall_bits(index, neighbour)
+
+        if not self.walls[index] & bit:
+            self.walls[index] |= bit
+            self.walls[neighbour] |= neighbour_bit
+            self.version += 1
+
+    def set_cost(self, index: int, cost: int) -> None:
+        """Set the cost of entering a cell.
+
+        Parameters
+        ----------
+        index : int
+            The index of the cell.
+        cost : int
+            The cost of entering the cell, from 1 to 255.
+        """
+        if not 1 <= cost <= 255:
+            raise ValueError('cell costs must be between 1 and 255')
+
+        old = self.costs[index]
+
+        if old != cost:
+            self.costs[index] = cost
+            self.version += 1
+
+            if cost <= self._min_cost:
+                self._min_cost, self._min_exact = cost, True
+            elif old == self._min_cost:
+                self._min_exact = False
+
+            if cost >= self._max_cost:
+                self._max_cost, self._max_exact = cost, True
+            elif old == self._max_cost:
+                self._max_exact = False
+
+    def min_cost(self) -> int:
+        """Get the lowest cost of entering a cell.
+
+        The Manhattan distance times this cost never overestimates the
+        cost of a path, so it is the heuristic of the weighted searches.
+
+        Returns
+        -------
+        int
+            The lowest cost of the cells of the grid.
+        """
+        if not self._min_exact:
+            self._min_cost = self._first_cost(range(self._min_cost, 256))
+            self._min_exact = True
+
+        return self._min_cost
+
+    def max_cost(self) -> int:
+        """Get the highest cost of entering a cell.
+
+        Returns
+        -------
+        int
+            The highest cost of the cells of the grid.
+        """
+        if not self._max_exact:
+            self._max_cost = self._first_cost(range(self._max_cost, 0, -1))
+            self._max_exact = True
+
+        return self._max_cost
+
+    def _first_cost(self, candidates: range) -> int:
+        """Get the first of some costs that a cell of the grid has."""
+        costs = self.costs if isinstance(self.costs, (bytes, bytearray)) else bytes(self.costs)
+
+        # A byte is searched for with memchr, which only reads every cell
+        # for the costs no cell has.
+        return next((cost for cost in candidates if cost in costs), 1)
+
+    def _wall_bits(self, index: int, neighbour: int) -> tuple[int, int]:
+        """Get the bits of the wall between two neighbouring cells."""
+        offset = neighbour - index
+
+        if offset == self.width:
+            return SOUTH, NORTH
+        elif offset == -self.width:
+            return NORTH, SOUTH
+        elif offset == 1:
+            return EAST, WEST
+        else:
+            return WEST, EAST
+
+    def __len__(self) -> int:
+        """Get the number of rows in the grid."""
+        return self.height
+
+    def __getitem__(self, y: int) -> 'GridRow':
+        """Get a row of the grid.
+
+        Parameters
+        ----------
+        y : int
+            The y coordinate of the row.
+
+        Returns
+        -------
+        GridRow
+            A view of the row.
+        """
+        if not 0 <= y < self.height:
+            raise IndexError('grid row out of range')
+
+        return GridRow(self, y)
+
+    def __iter__(self):
+        """Iterate over the rows of the grid."""
+        for y in range(self.height):
+            yield GridRow(self, y)
+
+
+class GridRow:
+    """A row of a grid.
+
+    This class is a view of a single row of a grid, so that
+    ``grid[y][x]`` returns the cell at ``(x, y)``.
+    """
+
+    __slots__ = ('grid', 'y')
+
+    def __init__(self, grid: Grid, y: int) -> None:
+        """Initialize a row view.
+
+        Parameters
+        ----------
+        grid : Grid
+            The grid the row belongs to.
+        y : int
+            The y coordinate of the row.
+        """
+        self.grid = grid
+        self.y = y
+
+    def __len__(self) -> int:
+        """Get the number of cells in the row."""
+        return self.grid.width
+
+    def __getitem__(self, x: int) -> 'GridCell':
+        """Get a cell of the row.
+
+        Parameters
+        ----------
+        x : int
+            The x coordinate of the cell.
+
+        Returns
+        -------
+        GridCell
+            A view of the cell.
+        """
+        if not 0 <= x < self.grid.width:
+            raise IndexError('grid column out of range')
+
+        return GridCell(self.grid, x, self.y)
+
+    def __iter__(self):
+        """Iterate over the cells of the row."""
+        for x in range(self.grid.width):
+            yield GridCell(self.grid, x, self.y)
+
+
+class GridCell(Cell):
+    """A cell of a grid.
+
+    This class is a view of a cell stored in a grid. It behaves like a
+    ``Cell``, but reads and writes its walls straight from the wall mask
+    of the grid.
+    """
+
+    __slots__ = ('grid', 'index')
+
+    def __init__(self, grid: Grid, x: int, y: int) -> None:
+        """Initialize a cell view.
+
+        Parameters
+        ----------
+        grid : Grid
+            The grid the cell belongs to.
+        x : int
+            The x coordinate of the cell.
+        y : int
+            The y coordinate of the cell.
+        """
+        self.grid = grid
+        self.index = y * grid.width + x
+        self.x = x
+        self.y = y
+
+    @property
+    def walls(self) -> 'Walls':
+        """The walls of the cell."""
+        return Walls(self.grid, self.index)
+
+    @property
+    def cost(self) -> int:
+        """The cost of entering the cell."""
+        return self.grid.costs[self.index]
+
+
+class Walls(MutableMapping):
+    """The walls of a grid cell.
+
+    This class is a view of the wall mask of a cell that behaves like
+    the ``{'n': ..., 's': ..., 'e': ..., 'w': ...}`` dictionary of a
+    ``Cell``.
+    """
+
+    __slots__ = ('grid', 'index')
+
+    def __init__(self, grid: Grid, index: int) -> None:
+        """Initialize a walls view.
+
+        Parameters
+        ----------
+        grid : Grid
+            The grid the cell belongs to.
+        index : int
+            The index of the cell.
+        """
+        self.grid = grid
+        self.index = index
+
+    def __getitem__(self, wall: str) -> bool:
+        """Check if a wall is standing."""
+        return bool(self.grid.walls[self.index] & WALL_BITS[wall])
+
+    def __setitem__(self, wall: str, value: bool) -> None:
+        """Add or carve a wall."""
+        walls = self.grid.walls
+        mask = walls[self.index]
+
+        if value:
+            walls[self.index] = mask | WALL_BITS[wall]
+        else:
+            walls[self.index] = mask & ~WALL_BITS[wall]
+
+        if walls[self.index] != mask:
+            self.grid.version += 1
+
+    def __delitem__(self, wall: str) -> None:
+        """Walls cannot be removed from the mapping."""
+        raise TypeError('walls cannot be deleted, carve them instead')
+
+    def __iter__(self):
+        """Iterate over the wall names."""
+        return iter(WALL_BITS)
+
+    def __len__(self) -> int:
+        """Get the number of walls of a cell."""
+        return len(WALL_BITS)
+
+
+class CellView:
+    """A collection of cells backed by a collection of indices.
+
+    The algorithms keep their open, closed and special cells as indices.
+    This class lets them hand those collections to the renderer, which
+    checks ``cell in cells`` and iterates over cells, without converting
+    them.
+    """
+
+    __slots__ = ('grid', 'indices')
+
+    def __init__(self, grid: Grid, indices) -> None:
+        """Initialize a view.
+
+        Parameters
+        ----------
+        grid : Grid
+            The grid the cells belong to.
+        indices : Collection[int]
+            The indices of the cells.
+        """
+        self.grid = grid
+        self.indices = indices
+
+    def __contains__(self, cell: object) -> bool:
+        """Check if a cell is in the view."""
+        if not isinstance(cell, Cell):
+            return False
+
+        return 0 <= cell.x < self.grid.width and cell.y * self.grid.width + cell.x in self.indices
+
+    def __iter__(self):
+        """Iterate over the cells of the view."""
+        for index in self.indices:
+            yield self.grid.cell(index)
+
+    def __len__(self) -> int:
+        """Get the number of cells in the view."""
+        return len(self.indices)
@@ -0,0 +1,325 @@
+"""Headless Script.
+
+This file runs the algorithms without opening a window. It is meant for
+benchmarks and batch jobs on machines without a display.
+
+Run a benchmark and print the results as JSON, with the counters and
+phase timings of the algorithms that support them:
+```
+python headless.py bench --generator dfs --solver astar --width 200 --height 200 --seed 0 --repeat 5 --stats
+```
+
+Generate a corpus of mazes across worker processes, the same for a given
+seed whatever the number of workers:
+```
+python headless.py generate --generator kruskal --width 500 --height 500 --count 100 --seed 0 --workers 4 --out corpus
+```
+
+Stream a maze too large for memory to a packed-row file, one row at a time:
+```
+python headless.py stream --width 100000 --height 100000 --seed 0 --out maze.bin
+```
+
+Render the frames of a run as PNG images (requires NumPy):
+```
+python headless.py render --width 200 --height 200 --size 4 --every 500 --out frames
+```
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from cell import Cell
+from instrumentation import Stats
+from algorithm import MazeGenerationAlgorithm, PathFindingAlgorithm
+from search import SearchContext
+from maze_generation import eller_rows
+from maze_file import write_rows
+from batch import generate_batch
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+GENERATORS = [algorithm.name.lower() for algorithm in MazeGenerationAlgorithm]
+SOLVERS = [algorithm.name.lower() for algorithm in PathFindingAlgorithm]
+
+
+def peak_memory() -> int:
+    """Get the peak resident memory of the process.
+
+    Returns
+    -------
+    int
+        The peak resident memory in kilobytes, or None if the platform
+        cannot report it.
+    """
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # macOS reports bytes, every other platform reports kilobytes.
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def bench(args: argparse.Namespace) -> dict:
+    """Benchmark a maze generation and a path finding algorithm.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The command line arguments.
+
+    Returns
+    -------
+    dict
+        The results of the benchmark.
+    """
+    generator = MazeGenerationAlgorithm[args.generator.upper()]
+    solver = PathFindingAlgorithm[args.solver.upper()]
+
+    cells = args.width * args.height
+    context = SearchContext(cells)
+
+    start_cell = Cell(0, 0)
+    end_cell = Cell(args.width - 1, args.height - 1)
+
+    # The statistics add up over the runs. They are only collected with
+    # --stats, since they slow the algorithms down a little.
+    generator_options = {}
+    solver_options = {}
+
+    if args.stats and generator.instrumented:
+        generator_options['stats'] = Stats()
+    if args.stats and solver.instrumented:
+        solver_options['stats'] = Stats()
+
+    runs = []
+    started = time.perf_counter()
+
+    for _ in range(args.repeat):
+        t0 = time.perf_counter()
+        maze = generator.run(args.width, args.height, seed=args.seed, **generator_options)
+        t1 = time.perf_counter()
+        path = solver.run(maze, start_cell, end_cell, context, **solver_options)
+        t2 = time.perf_counter()
+
+        runs.append({
+            'generation_time': t1 - t0,
+            'solve_time': t2 - t1,
+            'cells_per_sec': cells / (t1 - t0),
+            'expansions': context.expansions,
+            'expansions_per_sec': context.expansions / (t2 - t1),
+            'path_length': len(path),
+        })
+
+    wall_time = time.perf_counter() - started
+
+    results = {
+        'generator': args.generator,
+        'solver': args.solver,
+        'width': args.width,
+        'height': args.height,
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'wall_time': wall_time,
+        'cells_per_sec': max(run['cells_per_sec'] for run in runs),
+        'expansions_per_sec': max(run['expansions_per_sec'] for run in runs),
+        'peak_memory_kb': peak_memory(),
+        'runs': runs,
+    }
+
+    if 'stats' in generator_options:
+        results['generator_stats'] = generator_options['stats'].as_dict()
+    if 'stats' in solver_options:
+        results['solver_stats'] = solver_options['stats'].as_dict()
+
+    return results
+
+
+def generate(args: argparse.Namespace) -> dict:
+    """Generate a corpus of mazes across worker processes.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The command line arguments.
+
+    Returns
+    -------
+    dict
+        The results of the generation.
+    """
+    generator = MazeGenerationAlgorithm[args.generator.upper()]
+
+    started = time.perf_counter()
+    filenames = generate_batch(generator.function, args.width, args.height, args.count, args.seed, args.out, args.workers)
+    wall_time = time.perf_counter() - started
+
+    return {
+        'generator': args.generator,
+        'width': args.width,
+        'height': args.height,
+        'count': args.count,
+        'seed': args.seed,
+        'workers': args.workers,
+        'wall_time': wall_time,
+        'mazes_per_sec': args.count / wall_time,
+        'files': filenames,
+    }
+
+
+def stream(args: argparse.Namespace) -> dict:
+    """Generate a maze row by row and stream it to a packed-row file.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The command line arguments.
+
+    Returns
+    -------
+    dict
+        The results of the generation.
+    """
+    started = time.perf_counter()
+    size = write_rows(args.out, args.width, args.height, eller_rows(args.width, args.height, args.seed), args.seed)
+    wall_time = time.perf_counter() - started
+
+    return {
+        'width': args.width,
+        'height': args.height,
+        'seed': args.seed,
+        'out': args.out,
+        'bytes': size,
+        'wall_time': wall_time,
+        'cells_per_sec': args.width * args.height / wall_time,
+        'peak_memory_kb': peak_memory(),
+    }
+
+
+def render(args: argparse.Namespace) -> dict:
+    """Render the frames of a maze generation and a path finding algorithm.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The command line arguments.
+
+    Returns
+    -------
+    dict
+        The frames that were written.
+    """
+    import pixel_renderer
+
+    generator = MazeGenerationAlgorithm[args.generator.upper()]
+    solver = PathFindingAlgorithm[args.solver.upper()]
+
+    start_cell = Cell(0, 0)
+    end_cell = Cell(args.width - 1, args.height - 1)
+
+    os.makedirs(args.out, exist_ok=True)
+    frames = []
+
+    def save(maze, **overlays) -> None:
+        filename = os.path.join(args.out, f'frame-{len(frames):05}.png')
+        pixel_renderer.save_png(pixel_renderer.render(maze, pixel_renderer.cell_states(maze, **overlays), args.size), filename)
+        frames.append(filename)
+
+    if args.every:
+        algorithm = generator.animate(args.width, args.height, every=args.every, seed=args.seed)
+        while True:
+            try:
+                maze, special_cells, _ = next(algorithm)
+                save(maze, special_cells=special_cells)
+            except StopIteration as e:
+                maze = e.value
+                break
+    else:
+        maze = generator.run(args.width, args.height, seed=args.seed)
+
+    save(maze)
+
+    if args.every:
+        algorithm = solver.animate(maze, start_cell, end_cell, every=args.every)
+        while True:
+            try:
+                _, open_cells, closed_cells, _ = next(algorithm)
+                save(maze, start_cell=start_cell, end_cell=end_cell, open_cells=open_cells, closed_cells=closed_cells)
+            except StopIteration as e:
+                path = e.value
+                break
+    else:
+        path = solver.run(maze, start_cell, end_cell)
+
+    save(maze, start_cell=start_cell, end_cell=end_cell, path=path)
+
+    return {'frames': frames}
+
+
+def main() -> None:
+    """Main function.
+
+    Parses the command line and runs the requested command.
+    """
+    parser = argparse.ArgumentParser(description='Run the algorithms without a display.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    bench_parser = commands.add_parser('bench', help='benchmark a generator and a solver')
+    bench_parser.add_argument('--generator', choices=GENERATORS, default='dfs')
+    bench_parser.add_argument('--solver', choices=SOLVERS, default='astar')
+    bench_parser.add_argument('--width', type=int, default=25)
+    bench_parser.add_argument('--height', type=int, default=15)
+    bench_parser.add_argument('--seed', type=int, default=0)
+    bench_parser.add_argument('--repeat', type=int, default=1)
+    bench_parser.add_argument('--stats', action='store_true', help='count the operations and time the phases of the algorithms that support it')
+
+    generate_parser = commands.add_parser('generate', help='generate a corpus of mazes across worker processes')
+    generate_parser.add_argument('--generator', choices=GENERATORS, default='dfs')
+    generate_parser.add_argument('--width', type=int, default=25)
+    generate_parser.add_argument('--height', type=int, default=15)
+    generate_parser.add_argument('--count', type=int, default=10)
+    generate_parser.add_argument('--seed', type=int, default=0)
+    generate_parser.add_argument('--workers', type=int, default=None, help='number of processes, by default the number of CPUs')
+    generate_parser.add_argument('--out', default='corpus', help='directory to write the mazes to')
+
+    stream_parser = commands.add_parser('stream', help='stream a maze to a packed-row file, one row at a time')
+    stream_parser.add_argument('--width', type=int, default=25)
+    stream_parser.add_argument('--height', type=int, default=15)
+    stream_parser.add_argument('--seed', type=int, default=0)
+    stream_parser.add_argument('--out', default='maze.bin', help='file to write the maze to')
+
+    render_parser = commands.add_parser('render', help='render the frames of a run as PNG images')
+    render_parser.add_argument('--generator', choices=GENERATORS, default='dfs')
+    render_parser.add_argument('--solver', choices=SOLVERS, default='astar')
+    render_parser.add_argument('--width', type=int, default=25)
+    render_parser.add_argument('--height', type=int, default=15)
+    render_parser.add_argument('--seed', type=int, default=0)
+    render_parser.add_argument('--size', type=int, default=4, help='size of a cell in pixels')
+    render_parser.add_argument('--every', type=int, default=0, help='steps between frames, 0 for the results only')
+    render_parser.add_argument('--out', default='frames', help='directory to write the frames to')
+
+    args = parser.parse_args()
+
+    match args.command:
+        case 'bench':
+            results = bench(args)
+        case 'generate':
+            results = generate(args)
+        case 'stream':
+            results = stream(args)
+        case 'render':
+            results = render(args)
+
+    json.dump(results, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == '__main__':
+    main()
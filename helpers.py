@@ -1,4 +1,5 @@
 from cell import Cell
+from search import SearchContext
 
 
 def carve_wall(cell: Cell, neighbour: Cell) -> None:
@@ -101,11 +102,15 @@ def get_neighbours(maze: list[list[Cell]], cell: Cell) -> list[Cell]:
     return neighbours
 
 
-def reconstruct_path(current_cell: Cell) -> list[Cell]:
+def reconstruct_path(maze: list[list[Cell]], context: SearchContext, current_cell: Cell) -> list[Cell]:
     """Reconstruct the path from the current cell to the start cell.
     
     Parameters
     ----------
+    maze : list[list[Cell]]
+        The maze the path was found in.
+    context : SearchContext
+        The context of the search that found the path.
     current_cell : Cell
         The current cell to reconstruct the path from.
     
@@ -114,13 +119,9 @@ def reconstruct_path(current_cell: Cell) -> list[Cell]:
     list[Cell]
         The path from the current cell to the start cell.
     """
-    path = []
+    width = len(maze[0])
 
-    while current_cell:
-        path.append(current_cell)
-        current_cell = current_cell.parent
-    
-    return path[::-1]
+    return [maze[index // width][index % width] for index in context.path(current_cell.y * width + current_cell.x)]
 
 
 def heuristic(a: Cell, b: Cell) -> int:
@@ -139,3 +140,23 @@ def heuristic(a: Cell, b: Cell) -> int:
         The heuristic between the two cells.
     """
     return abs(a.x - b.x) + abs(a.y - b.y)
+
+
+def run_to_completion(algorithm) -> object:
+    """Run an algorithm until it finishes.
+    
+    Parameters
+    ----------
+    algorithm : generator
+        The algorithm to run.
+    
+    Returns
+    -------
+    object
+        The value returned by the algorithm.
+    """
+    while True:
+        try:
+            next(algorithm)
+        except StopIteration as e:
+            return e.value
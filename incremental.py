@@ -0,0 +1,209 @@
+from heapq import heappush, heappop
+from cell import Cell
+from grid import Grid
+
+
+INF = float('inf')
+
+
+class LifelongPlanner:
+    """Keep the shortest path between two cells up to date as walls change.
+
+    This is Lifelong Planning A* (LPA*). Every cell has a g score, the
+    cost of its best path found so far, and an rhs score, the cost
+    through its best neighbour. A cell whose two scores differ is
+    inconsistent and waits in the queue. When a wall changes, only the
+    two cells on both sides of it are updated, and when the cost of a
+    cell changes, only that cell. Repairing the path only expands the
+    cells whose cost actually changed, instead of searching the whole
+    maze again.
+
+    Attributes
+    ----------
+    maze : Grid
+        The maze the path is found in.
+    start : int
+        The index of the start cell.
+    end : int
+        The index of the end cell.
+    expansions : int
+        The number of cells expanded since the planner was created.
+
+    Methods
+    -------
+    update_edge(index: int, neighbour: int)
+        Tell the planner that the wall between two cells changed.
+    update_cost(index: int)
+        Tell the planner that the cost of a cell changed.
+    path()
+        Get the shortest path from the start cell to the end cell.
+    """
+
+    def __init__(self, maze: Grid, start_cell: Cell, end_cell: Cell) -> None:
+        """Initialize a planner.
+
+        The first path is only searched for when it is asked for.
+
+        Parameters
+        ----------
+        maze : Grid
+            The maze to find the path in.
+        start_cell : Cell
+            The cell to start the path from.
+        end_cell : Cell
+            The cell to end the path at.
+        """
+        self.maze = maze
+        self.start = maze.index(start_cell.x, start_cell.y)
+        self.end = maze.index(end_cell.x, end_cell.y)
+        self.expansions = 0
+
+        self._reset()
+
+    def _reset(self) -> None:
+        """Forget the search and start it again from scratch."""
+        size = self.maze.width * self.maze.height
+
+        # The heuristic is scaled by the lowest cost at the time of the
+        # reset, it stays admissible as long as no cell gets cheaper.
+        self.scale = self.maze.min_cost()
+
+        self.g = [INF] * size
+        self.rhs = [INF] * size
+        self.rhs[self.start] = 0
+
+        # The queue holds (key, cell) entries. The key of a queued cell is
+        # also in ``keys``, so entries with another key are stale.
+        self.queue = []
+        self.keys = {}
+        self._push(self.start)
+
+        self.version = self.maze.version
+
+    def _h(self, index: int) -> int:
+        """Manhattan distance from a cell to the end cell times the lowest cost."""
+        width = self.maze.width
+        return (abs(index % width - self.end % width) + abs(index // width - self.end // width)) * self.scale
+
+    def _key(self, index: int) -> tuple[float, float]:
+        """Get the priority of a cell."""
+        g = min(self.g[index], self.rhs[index])
+        return (g + self._h(index), g)
+
+    def _push(self, index: int) -> None:
+        """Queue a cell, replacing its previous entry if it had one."""
+        key = self._key(index)
+        self.keys[index] = key
+        heappush(self.queue, (key, index))
+
+    def _top(self) -> tuple:
+        """Drop the stale entries and get the key of the first cell."""
+        while self.queue:
+            key, index = self.queue[0]
+            if self.keys.get(index) == key:
+                return key
+            heappop(self.queue)
+
+        return (INF, INF)
+
+    def _update(self, index: int) -> None:
+        """Recompute the rhs score of a cell and queue it if inconsistent."""
+        if index != self.start:
+            g = self.g
+            self.rhs[index] = min((g[index + offset] for offset in self.maze.passages[self.maze.walls[index]]), default=INF) + self.maze.costs[index]
+
+        self.keys.pop(index, None)
+
+        if self.g[index] != self.rhs[index]:
+            self._push(index)
+
+    def update_edge(self, index: int, neighbour: int) -> None:
+        """Tell the planner that the wall between two cells changed.
+
+        Parameters
+        ----------
+        index : int
+            The index of a cell next to the wall.
+        neighbour : int
+            The index of the cell on the other side of the wall.
+        """
+        self._update(index)
+        self._update(neighbour)
+        self.version = self.maze.version
+
+    def update_cost(self, index: int) -> None:
+        """Tell the planner that the cost of a cell changed.
+
+        Only the moves into the cell change cost. A cell cheaper than
+        every cell so far could make the heuristic overestimate, so the
+        search then starts again from scratch on the next ``path``.
+
+        Parameters
+        ----------
+        index : int
+            The index of the cell.
+        """
+        if self.maze.costs[index] < self.scale:
+            return
+
+        self._update(index)
+        self.version = self.maze.version
+
+    def _compute(self) -> None:
+        """Expand inconsistent cells until the path to the end cell is known."""
+        g = self.g
+        rhs = self.rhs
+        walls = self.maze.walls
+        passages = self.maze.passages
+        end = self.end
+
+        while self._top() < self._key(end) or rhs[end] != g[end]:
+            _, current = heappop(self.queue)
+            del self.keys[current]
+            self.expansions += 1
+
+            if g[current] > rhs[current]:
+                g[current] = rhs[current]
+            else:
+                g[current] = INF
+                self._update(current)
+
+            for offset in passages[walls[current]]:
+                self._update(current + offset)
+
+    def path(self) -> list[Cell]:
+        """Get the shortest path from the start cell to the end cell.
+
+        Only the cells made inconsistent by the walls and costs changed
+        since the previous call are expanded. If the maze changed without
+        ``update_edge`` or ``update_cost`` being called, the search starts
+        again from scratch.
+
+        Returns
+        -------
+        list[Cell]
+            The path from the start cell to the end cell, or an empty
+            path if there is none.
+        """
+        if self.maze.version != self.version:
+            self._reset()
+
+        self._compute()
+
+        if self.g[self.end] == INF:
+            return []
+
+        g = self.g
+        walls = self.maze.walls
+        passages = self.maze.passages
+
+        # Walk back from the end cell through the neighbours with the
+        # lowest g score, which are on a shortest path.
+        current = self.end
+        path = [current]
+
+        while current != self.start:
+            current = min((current + offset for offset in passages[walls[current]]), key=g.__getitem__)
+            path.append(current)
+
+        return [self.maze.cell(index) for index in reversed(path)]
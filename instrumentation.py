@@ -0,0 +1,192 @@
+from collections import Counter
+from heapq import heappush, heappop
+from time import perf_counter
+
+
+class Stats:
+    """Counters and phase timings of algorithm runs.
+
+    The algorithms that take a ``stats`` argument only touch it when one
+    is given. They then swap the functions of their hot loop, such as
+    ``heappush`` or ``Grid.passages``, for counting versions returned by
+    this class, so the loop itself has no extra checks and a run without
+    stats is as fast as before. Passing the same stats to several runs
+    adds them up.
+
+    The phases are timed with ``perf_counter`` between marks. When an
+    algorithm is animated, the time spent by the caller between two of
+    its steps is counted in the phase it was in.
+
+    Attributes
+    ----------
+    counters : Counter
+        The number of times every operation was done, for example
+        ``expansions``, ``pushes``, ``pops``, ``neighbour_checks`` or
+        ``carves``.
+    peaks : dict[str, int]
+        The largest size reached by every collection, for example
+        ``frontier``.
+    timings : dict[str, float]
+        The time spent in every phase, in seconds.
+
+    Methods
+    -------
+    start()
+        Start timing the first phase of a run.
+    lap(phase: str)
+        End a phase.
+    count(name: str, amount: int = 1)
+        Add to a counter.
+    peak(name: str, size: int)
+        Record the size of a collection.
+    heap()
+        Get counting versions of ``heappush`` and ``heappop``.
+    appender(items: list, name: str = 'frontier')
+        Get a counting version of ``items.append``.
+    passages(passages: tuple)
+        Get a counting version of ``Grid.passages``.
+    as_dict()
+        Get the statistics as a dictionary that can be dumped as JSON.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self.counters = Counter()
+        self.peaks = {}
+        self.timings = {}
+        self._mark = perf_counter()
+
+    def start(self) -> None:
+        """Start timing the first phase of a run."""
+        self._mark = perf_counter()
+
+    def lap(self, phase: str) -> None:
+        """End a phase.
+
+        Parameters
+        ----------
+        phase : str
+            The name of the phase, the time since the previous mark is
+            added to it.
+        """
+        now = perf_counter()
+        self.timings[phase] = self.timings.get(phase, 0.0) + now - self._mark
+        self._mark = now
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Add to a counter.
+
+        Parameters
+        ----------
+        name : str
+            The name of the counter.
+        amount : int, optional
+            The amount to add.
+        """
+        self.counters[name] += amount
+
+    def peak(self, name: str, size: int) -> None:
+        """Record the size of a collection.
+
+        Parameters
+        ----------
+        name : str
+            The name of the collection.
+        size : int
+            Its current size, kept if it is the largest so far.
+        """
+        if size > self.peaks.get(name, 0):
+            self.peaks[name] = size
+
+    def heap(self):
+        """Get counting versions of ``heappush`` and ``heappop``.
+
+        The size of the heap, stale entries included, is recorded as the
+        ``frontier`` peak.
+
+        Returns
+        -------
+        tuple[Callable, Callable]
+            The push and pop functions.
+        """
+        counters = self.counters
+        peaks = self.peaks
+
+        def push(heap: list, item) -> None:
+            heappush(heap, item)
+            counters['pushes'] += 1
+
+            if len(heap) > peaks.get('frontier', 0):
+                peaks['frontier'] = len(heap)
+
+        def pop(heap: list):
+            counters['pops'] += 1
+            return heappop(heap)
+
+        return push, pop
+
+    def appender(self, items: list, name: str = 'frontier'):
+        """Get a counting version of ``items.append``.
+
+        Parameters
+        ----------
+        items : list
+            The list, for example the stack of a depth-first search.
+        name : str, optional
+            The name its largest size is recorded under.
+
+        Returns
+        -------
+        Callable
+            The append function.
+        """
+        peaks = self.peaks
+
+        def append(item) -> None:
+            items.append(item)
+
+            if len(items) > peaks.get(name, 0):
+                peaks[name] = len(items)
+
+        return append
+
+    def passages(self, passages: tuple) -> '_CountedPassages':
+        """Get a counting version of ``Grid.passages``.
+
+        Parameters
+        ----------
+        passages : tuple
+            The passages of a grid.
+
+        Returns
+        -------
+        _CountedPassages
+            A table indexed like the passages, which counts every
+            neighbour it returns as a ``neighbour_checks``.
+        """
+        return _CountedPassages(passages, self.counters)
+
+    def as_dict(self) -> dict:
+        """Get the statistics as a dictionary that can be dumped as JSON.
+
+        Returns
+        -------
+        dict
+            The counters, the peaks and the timings.
+        """
+        return {'counters': dict(self.counters), 'peaks': dict(self.peaks), 'timings': dict(self.timings)}
+
+
+class _CountedPassages:
+    """The passages of a grid, counting the neighbours they return."""
+
+    __slots__ = ('passages', 'counters')
+
+    def __init__(self, passages: tuple, counters: Counter) -> None:
+        self.passages = passages
+        self.counters = counters
+
+    def __getitem__(self, mask: int) -> tuple[int, ...]:
+        offsets = self.passages[mask]
+        self.counters['neighbour_checks'] += len(offsets)
+        return offsets
@@ -5,26 +5,37 @@ can change the maze generation algorithm, the pathfinding algorithm,
 and the size of the maze.
 """
 
+import cProfile
+import os
+import pstats
+import sys
+import time
 import pygame
 from cell import Cell
+from colours import BLACK, WHITE, RED, GREEN, BLUE, YELLOW, CYAN, PINK, GREY, ORANGE, BROWN
+from grid import Grid
 from algorithm import AlgorithmType, MazeGenerationAlgorithm, PathFindingAlgorithm
 from helpers import add_wall, carve_wall
+from maze_file import save_maze, load_maze
+from path_cache import PathCache
+from incremental import LifelongPlanner
+from instrumentation import Stats
+from scheduler import StepScheduler, BUDGET, INSTANT
+from search import SearchContext
+from worker import AlgorithmWorker, SWITCH_INTERVAL
 
 
-pygame.init()
-
 MAZE_GENERATION_ALGORITHM = MazeGenerationAlgorithm.DFS
 PATH_FINDING_ALGORITHM = PathFindingAlgorithm.ASTAR
 
-BLACK = 0x0A0908
-WHITE = 0xF1FFE7
-RED = 0xC1292E
-GREEN = 0x63A46C
-BLUE = 0x0E6BA8
-YELLOW = 0xF1D302
-CYAN = 0x5CC8FF
-PINK = 0xEAC4D5
-GREY = 0x596475
+# Set to False to skip the animations and only show the results.
+ANIMATE = True
+
+# 'cells' draws the maze cell by cell, 'pixels' renders whole frames with
+# NumPy, which is much faster for large mazes but requires NumPy.
+# 'viewport' shows the maze through a camera that can pan and zoom, in a
+# window of at most MAX_WIDTH by MAX_HEIGHT, for mazes too large to fit.
+RENDERER = 'cells'
 
 COLS = 25
 ROWS = 15
@@ -33,66 +44,455 @@ SIZE = 20
 
 WIDTH, HEIGHT = (COLS * SIZE, ROWS * SIZE)
 
-window = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption('Pathfinding Visualizer')
+MAX_WIDTH, MAX_HEIGHT = (1280, 800)
+
+CAPTION = 'Pathfinding Visualizer'
+
+# The file the maze is saved to with S and loaded from with L.
+MAZE_FILE = 'maze.bin'
+
+# The highest cost that can be painted, with the 9 key.
+MAX_BRUSH = 9
+
+# The file the profile captured between two presses of F9 is saved to.
+PROFILE_FILE = 'profile.prof'
+
+HUD_FONT_SIZE = 18
+
+# The share of the view the arrow keys move the camera by.
+PAN_STEP = 0.25
+
+
+def cell_colour(
+    cell: Cell,
+    start_cell: Cell = None,
+    end_cell: Cell = None,
+    path: set[Cell] = set(),
+    special_cells: set[Cell] = set(),
+    open_cells: set[Cell] = set(),
+    closed_cells: set[Cell] = set(),
+) -> int:
+    """Get the colour of a cell.
+
+    Parameters
+    ----------
+    cell : Cell
+        The cell to get the colour of.
+    start_cell : Cell, optional
+        The start cell.
+    end_cell : Cell, optional
+        The end cell.
+    path : set[Cell], optional
+        The cells on the path.
+    special_cells : set[Cell], optional
+        The special cells.
+    open_cells : set[Cell], optional
+        The open cells.
+    closed_cells : set[Cell], optional
+        The closed cells.
+
+    Returns
+    -------
+    int
+        The colour of the cell.
+    """
+    if cell == start_cell:
+        return RED
+    elif cell == end_cell:
+        return GREEN
+    elif cell in special_cells:
+        return PINK
+    elif cell in path:
+        return YELLOW
+    elif cell in open_cells:
+        return CYAN
+    elif cell in closed_cells:
+        return BLUE
+    elif all(cell.walls.values()):
+        return GREY
+    elif cell.cost > 1:
+        return terrain_colour(cell.cost)
+    else:
+        return WHITE
+
+
+def blend(colour: int, other: int, t: float) -> int:
+    """Blend two colours.
+
+    Parameters
+    ----------
+    colour : int
+        The colour at 0.
+    other : int
+        The colour at 1.
+    t : float
+        The position between the two colours.
+
+    Returns
+    -------
+    int
+        The blended colour.
+    """
+    channels = (
+        round(((colour >> shift) & 0xFF) * (1 - t) + ((other >> shift) & 0xFF) * t)
+        for shift in (16, 8, 0)
+    )
+
+    return sum(channel << shift for channel, shift in zip(channels, (16, 8, 0)))
+
+
+def terrain_colour(cost: int) -> int:
+    """Get the colour of a weighted cell.
+
+    Parameters
+    ----------
+    cost : int
+        The cost of entering the cell, more than 1.
+
+    Returns
+    -------
+    int
+        A colour between white and brown, brown for ``MAX_BRUSH`` and
+        above.
+    """
+    return blend(WHITE, BROWN, min(cost - 1, MAX_BRUSH - 1) / (MAX_BRUSH - 1))
+
+
+def heat_colour(distance: int, maximum: int) -> int:
+    """Get the colour of a cell of a heatmap.
+
+    Parameters
+    ----------
+    distance : int
+        The distance of the cell, negative if it cannot be reached.
+    maximum : int
+        The largest distance of the heatmap.
+
+    Returns
+    -------
+    int
+        A colour between white for the closest cells and orange for the
+        farthest ones, or grey for the cells that cannot be reached.
+    """
+    if distance < 0:
+        return GREY
+
+    return blend(WHITE, ORANGE, distance / max(maximum, 1))
+
+
+def draw_cell(surface: pygame.Surface, cell: Cell, colour: int) -> pygame.Rect:
+    """Draw a cell and its walls.
+
+    Parameters
+    ----------
+    surface : pygame.Surface
+        The surface to draw on.
+    cell : Cell
+        The cell to draw.
+    colour : int
+        The colour to fill the cell with.
+
+    Returns
+    -------
+    pygame.Rect
+        The area covered by the cell and its walls.
+    """
+    x = cell.x * SIZE
+    y = cell.y * SIZE
+
+    pygame.draw.rect(surface, colour, (x, y, SIZE, SIZE))
+
+    walls = cell.walls
+    if walls['n']:
+        pygame.draw.line(surface, BLACK, (x, y), (x + SIZE, y))
+    if walls['s']:
+        pygame.draw.line(surface, BLACK, (x, y + SIZE), (x + SIZE, y + SIZE))
+    if walls['e']:
+        pygame.draw.line(surface, BLACK, (x + SIZE, y), (x + SIZE, y + SIZE))
+    if walls['w']:
+        pygame.draw.line(surface, BLACK, (x, y), (x, y + SIZE))
+
+    return pygame.Rect(x, y, SIZE + 1, SIZE + 1)
 
 
 def draw_maze(
-    maze: list[list[Cell]],
+    maze: Grid,
     start_cell: Cell = None,
     end_cell: Cell = None,
     path: list[Cell] = [],
-    special_cells: Cell = set(),
+    special_cells: set[Cell] = set(),
     open_cells: set[Cell] = set(),
     closed_cells: set[Cell] = set(),
+    heatmap=None,
+    surface: pygame.Surface = None,
 ) -> None:
     """Draw the maze.
     
     Parameters
     ----------
-    maze : list[list[Cell]]
+    maze : Grid
         The maze to draw.
+    start_cell : Cell, optional
+        The start cell to draw.
+    end_cell : Cell, optional
+        The end cell to draw.
     path : list[Cell], optional
         The path to draw.
-    current_cell : Cell, optional
-        The current cell to draw.
+    special_cells : set[Cell], optional
+        The special cells to draw.
     open_cells : set[Cell], optional
         The open cells to draw.
     closed_cells : set[Cell], optional
         The closed cells to draw.
-    start_cell : Cell, optional
-        The start cell to draw.
-    end_cell : Cell, optional
-        The end cell to draw.
+    heatmap : np.ndarray, optional
+        A ``(height, width)`` distance field, as returned by
+        ``distance_field.distance_field``. The cells without any other
+        colour are coloured by their distance.
+    surface : pygame.Surface, optional
+        The surface to draw on, by default the surface of the display,
+        which must have been set with ``pygame.display.set_mode``.
     """
+    if surface is None:
+        surface = pygame.display.get_surface()
+
+    path = set(path)
+    maximum = int(heatmap.max()) if heatmap is not None else 0
+
     for row in maze:
         for cell in row:
-            if all(cell.walls.values()):
-                pygame.draw.rect(window, GREY, (cell.x * SIZE, cell.y * SIZE, SIZE, SIZE))
-            else:
-                pygame.draw.rect(window, WHITE, (cell.x * SIZE, cell.y * SIZE, SIZE, SIZE))
-            
-            if cell == start_cell:
-                pygame.draw.rect(window, RED, (cell.x * SIZE, cell.y * SIZE, SIZE, SIZE))
-            elif cell == end_cell:
-                pygame.draw.rect(window, GREEN, (cell.x * SIZE, cell.y * SIZE, SIZE, SIZE))
-            elif cell in special_cells:
-                pygame.draw.rect(window, PINK, (cell.x * SIZE, cell.y * SIZE, SIZE, SIZE))
-            elif cell in path:
-                pygame.draw.rect(window, YELLOW, (cell.x * SIZE, cell.y * SIZE, SIZE, SIZE))
-            elif cell in open_cells:
-                pygame.draw.rect(window, CYAN, (cell.x * SIZE, cell.y * SIZE, SIZE, SIZE))
-            elif cell in closed_cells:
-                pygame.draw.rect(window, BLUE, (cell.x * SIZE, cell.y * SIZE, SIZE, SIZE))
-            
-            if cell.walls['n']:
-                pygame.draw.line(window, BLACK, (cell.x * SIZE, cell.y * SIZE), (cell.x * SIZE + SIZE, cell.y * SIZE))
-            if cell.walls['s']:
-                pygame.draw.line(window, BLACK, (cell.x * SIZE, cell.y * SIZE + SIZE), (cell.x * SIZE + SIZE, cell.y * SIZE + SIZE))
-            if cell.walls['e']:
-                pygame.draw.line(window, BLACK, (cell.x * SIZE + SIZE, cell.y * SIZE), (cell.x * SIZE + SIZE, cell.y * SIZE + SIZE))
-            if cell.walls['w']:
-                pygame.draw.line(window, BLACK, (cell.x * SIZE, cell.y * SIZE), (cell.x * SIZE, cell.y * SIZE + SIZE))
+            colour = cell_colour(cell, start_cell, end_cell, path, special_cells, open_cells, closed_cells)
+
+            if heatmap is not None and colour == WHITE:
+                colour = heat_colour(heatmap[cell.y][cell.x], maximum)
+
+            draw_cell(surface, cell, colour)
+
+
+def draw_changes(
+    maze: Grid,
+    background: pygame.Surface,
+    cells: set[Cell],
+    overlays: dict,
+    surface: pygame.Surface = None,
+) -> list[pygame.Rect]:
+    """Redraw only the cells that changed.
+
+    Cells without an overlay are copied from the cached background of
+    the maze instead of being drawn again.
+
+    Parameters
+    ----------
+    maze : Grid
+        The maze the cells belong to.
+    background : pygame.Surface
+        The cached drawing of the maze without any overlays.
+    cells : set[Cell]
+        The cells to redraw.
+    overlays : dict
+        The start, end, path, special, open and closed cells, as keyword
+        arguments of ``cell_colour``.
+    surface : pygame.Surface, optional
+        The surface to draw on, by default the surface of the display,
+        which must have been set with ``pygame.display.set_mode``.
+
+    Returns
+    -------
+    list[pygame.Rect]
+        The areas that were redrawn.
+    """
+    if surface is None:
+        surface = pygame.display.get_surface()
+
+    rects = []
+
+    for cell in cells:
+        cell = maze[cell.y][cell.x]
+        colour = cell_colour(cell, **overlays)
+
+        if colour in (WHITE, GREY):
+            area = pygame.Rect(cell.x * SIZE, cell.y * SIZE, SIZE, SIZE)
+            surface.blit(background, area, area)
+            rects.append(area)
+        else:
+            rects.append(draw_cell(surface, cell, colour))
+
+    return rects
+
+
+def overlay_cells(overlays: dict) -> set[Cell]:
+    """Get every cell covered by an overlay.
+
+    Parameters
+    ----------
+    overlays : dict
+        The overlays, as keyword arguments of ``cell_colour``.
+
+    Returns
+    -------
+    set[Cell]
+        The cells to draw on top of the background.
+    """
+    cells = set()
+
+    for value in overlays.values():
+        if isinstance(value, Cell):
+            cells.add(value)
+        else:
+            cells.update(value)
+
+    return cells
+
+
+def cells_in(maze: Grid, area: pygame.Rect) -> set[Cell]:
+    """Get the cells covered by an area of the window.
+
+    Parameters
+    ----------
+    maze : Grid
+        The maze drawn in the window.
+    area : pygame.Rect
+        The area.
+
+    Returns
+    -------
+    set[Cell]
+        The cells of the maze that overlap the area.
+    """
+    columns = range(max(area.left // SIZE, 0), min((area.right - 1) // SIZE + 1, maze.width))
+    rows = range(max(area.top // SIZE, 0), min((area.bottom - 1) // SIZE + 1, maze.height))
+
+    return {maze[y][x] for y in rows for x in columns}
+
+
+def draw_hud(surface: pygame.Surface, font: pygame.font.Font, lines: list[str]) -> pygame.Rect:
+    """Draw lines of text in the top left corner.
+
+    Parameters
+    ----------
+    surface : pygame.Surface
+        The surface to draw on.
+    font : pygame.font.Font
+        The font of the text.
+    lines : list[str]
+        The lines to draw.
+
+    Returns
+    -------
+    pygame.Rect
+        The area covered by the text and its box.
+    """
+    colour = pygame.Color(f'#{WHITE:06x}')
+    texts = [font.render(line, True, colour) for line in lines]
+    height = font.get_linesize()
+
+    area = pygame.Rect(0, 0, max(text.get_width() for text in texts) + 8, height * len(texts) + 8)
+    pygame.draw.rect(surface, BLACK, area)
+
+    for i, text in enumerate(texts):
+        surface.blit(text, (4, 4 + i * height))
+
+    return area
+
+
+def mouse_position(view) -> tuple[int, int]:
+    """Get the position of the mouse on the maze.
+
+    Parameters
+    ----------
+    view : Viewport
+        The viewport the maze is shown through, or None if the window
+        shows the whole maze at ``SIZE`` pixels per cell.
+
+    Returns
+    -------
+    tuple[int, int]
+        The position in pixels, as if the whole maze was drawn at
+        ``SIZE`` pixels per cell, or None if the mouse is not over the
+        maze.
+    """
+    (x, y) = pygame.mouse.get_pos()
+
+    if view is not None:
+        x, y = view.cell_at(x, y)
+        x, y = int(x * SIZE), int(y * SIZE)
+
+    if 0 <= x < WIDTH and 0 <= y < HEIGHT:
+        return x, y
+
+    return None
+
+
+def stats_options(stats: Stats) -> dict:
+    """Get the keyword arguments passing statistics to an algorithm.
+
+    Parameters
+    ----------
+    stats : Stats
+        The statistics, or None if the algorithm does not take any.
+
+    Returns
+    -------
+    dict
+        The keyword arguments.
+    """
+    return {} if stats is None else {'stats': stats}
+
+
+def start_worker(algorithm, scheduler: StepScheduler, profiler: cProfile.Profile = None) -> AlgorithmWorker:
+    """Start running an algorithm on a worker thread.
+
+    Parameters
+    ----------
+    algorithm : generator
+        The algorithm.
+    scheduler : StepScheduler
+        The scheduler setting how many steps the worker may run per frame.
+    profiler : cProfile.Profile, optional
+        The profiler of the worker thread, while a capture is running.
+
+    Returns
+    -------
+    AlgorithmWorker
+        The started worker.
+    """
+    worker = AlgorithmWorker(algorithm)
+    worker.allow(scheduler.allowance, scheduler.budget)
+    worker.profile(profiler)
+    worker.start()
+
+    return worker
+
+
+def finish_worker(worker: AlgorithmWorker) -> tuple[tuple, set, bool, object]:
+    """Let a worker run freely and drain it until its algorithm finishes.
+
+    Parameters
+    ----------
+    worker : AlgorithmWorker
+        The worker.
+
+    Returns
+    -------
+    tuple[tuple, set, bool, object]
+        The last state of the algorithm, the cells changed by all of its
+        updates, True and the value the algorithm returned, like
+        ``AlgorithmWorker.poll``.
+    """
+    worker.allow(None)
+    worker.resume()
+
+    state = None
+    cells = set()
+
+    while True:
+        update, changed, finished, result = worker.poll()
+        state = update or state
+        cells |= changed
+
+        if finished:
+            return state, cells, finished, result
+
+        worker.join(worker.interval)
 
 
 def main() -> None:
@@ -102,16 +502,101 @@ def main() -> None:
     the program. It is responsible for the main loop of the program.
     It starts the pygame window and generates the maze. It then runs the
     pathfinding algorithm and draws the path.
+
+    Only the cells that changed since the previous frame are redrawn.
+    The maze without any overlays is cached in a background surface,
+    which is updated whenever a wall changes.
+
+    Pygame is only initialized here, so the drawing functions and the
+    settings of this module can be imported without opening a window.
+
+    The animated algorithms run on an ``AlgorithmWorker`` thread, so the
+    window stays responsive however long their steps take. Every frame
+    drains the cells the worker changed and lets it run the steps per
+    frame of the scheduler, or for its time budget in budget mode. In
+    instant mode the algorithms are run without a worker, like when
+    ``ANIMATE`` is False, and the running one is let run freely and
+    drained until it finishes. Space pauses and resumes the worker and
+    Escape cancels it. The GIL switch interval is lowered to
+    ``SWITCH_INTERVAL``, so the worker does not hold up the frames.
+
+    With the viewport renderer, the mouse wheel zooms around the cursor,
+    the arrow keys and dragging with the middle button pan, and Home
+    zooms out to the whole maze. The heatmap is only drawn by the cells
+    renderer.
+
+    F3 shows a HUD with the frame rate, the steps per second and the
+    statistics of the last algorithm run. F9 starts a cProfile capture
+    of the main thread and of the worker and stops it again, printing
+    the slowest functions and saving the profile to ``PROFILE_FILE``.
     """
+    if RENDERER == 'pixels':
+        import pixel_renderer
+
+    pygame.init()
+    sys.setswitchinterval(SWITCH_INTERVAL)
+
+    if RENDERER == 'viewport':
+        from viewport import Viewport
+        window = pygame.display.set_mode((min(WIDTH, MAX_WIDTH), min(HEIGHT, MAX_HEIGHT)))
+    else:
+        window = pygame.display.set_mode((WIDTH, HEIGHT))
+
     algorithm = None
     algorithm_type = None
 
-    maze = [[Cell(x, y) for x in range(COLS)] for y in range(ROWS)]
+    maze = Grid(COLS, ROWS)
+    context = SearchContext(COLS * ROWS)
+    cache = PathCache(maze, PATH_FINDING_ALGORITHM.function)
     path = []
 
+    # Repairs the displayed path when a wall is edited, None when no path
+    # is displayed.
+    planner = None
+
     start_cell = Cell(0, 0)
     end_cell = Cell(COLS - 1, ROWS - 1)
 
+    background = pygame.Surface((WIDTH, HEIGHT)) if RENDERER == 'cells' else None
+    background_maze = None
+    overlays = {'start_cell': start_cell, 'end_cell': end_cell, 'path': set()}
+
+    # Cells whose walls changed and cells whose overlay changed.
+    edited = set()
+    changed = set()
+    repaint = True
+
+    # The distances from the start cell, drawn under the overlays, and
+    # the maze and version they were computed for.
+    show_heatmap = False
+    heatmap = None
+    heatmap_key = None
+
+    # The cost painted on the cells with shift and the left button.
+    brush = MAX_BRUSH
+
+    # The HUD, its area in the previous frame and the statistics of the
+    # last algorithm run. The steps per second are measured over half a
+    # second.
+    show_hud = False
+    hud_area = None
+    font = None
+    stats = None
+    rate = 0.0
+    rate_steps = 0
+    rate_started = time.perf_counter()
+
+    profiler = None
+    worker_profiler = None
+
+    # The camera of the viewport renderer. The relative motion of the mouse
+    # is reset so the first drag does not jump.
+    view = Viewport(maze, *window.get_size(), terrain=terrain_colour) if RENDERER == 'viewport' else None
+    pygame.mouse.get_rel()
+
+    scheduler = StepScheduler()
+    pygame.display.set_caption(f'{CAPTION} ({scheduler}, cost {brush})')
+
     clock = pygame.time.Clock()
     running = True
 
@@ -122,37 +607,163 @@ def main() -> None:
             match event.type:
                 case pygame.QUIT:
                     running = False
+                case pygame.MOUSEWHEEL if view:
+                    view.zoom(event.y, *pygame.mouse.get_pos())
                 case pygame.KEYDOWN:
+                    # Why the last key did nothing, shown in the caption
+                    # until the next one.
+                    notice = ''
+
                     match event.key:
-                        case pygame.K_m:
-                            algorithm = MAZE_GENERATION_ALGORITHM(COLS, ROWS)
+                        case pygame.K_m if ANIMATE and scheduler.mode != INSTANT:
+                            # The previous worker is waited for, it may still
+                            # be using the search context.
+                            if algorithm:
+                                algorithm.cancel()
+                                algorithm.join()
+                            stats = Stats() if MAZE_GENERATION_ALGORITHM.instrumented else None
+                            algorithm = start_worker(MAZE_GENERATION_ALGORITHM.animate(COLS, ROWS, **stats_options(stats)), scheduler, worker_profiler)
                             algorithm_type = AlgorithmType.MAZE_GENERATION
-                        case pygame.K_p:
-                            algorithm = PATH_FINDING_ALGORITHM(maze, start_cell, end_cell)
+                            planner = None
+                        case pygame.K_m:
+                            if algorithm:
+                                algorithm.cancel()
+                                algorithm.join()
+                                algorithm = None
+                            stats = Stats() if MAZE_GENERATION_ALGORITHM.instrumented else None
+                            maze = MAZE_GENERATION_ALGORITHM.run(COLS, ROWS, **stats_options(stats))
+                            path = []
+                            planner = None
+                            overlays = {'start_cell': start_cell, 'end_cell': end_cell, 'path': set()}
+                        case pygame.K_p if ANIMATE and scheduler.mode != INSTANT:
+                            # The previous worker is waited for, it may still
+                            # be using the search context.
+                            if algorithm:
+                                algorithm.cancel()
+                                algorithm.join()
+                            stats = Stats() if PATH_FINDING_ALGORITHM.instrumented else None
+                            algorithm = start_worker(PATH_FINDING_ALGORITHM.animate(maze, start_cell, end_cell, context, **stats_options(stats)), scheduler, worker_profiler)
                             algorithm_type = AlgorithmType.PATH_FINDING
+                            planner = None
+                            repaint = True
+                        case pygame.K_p:
+                            if algorithm:
+                                algorithm.cancel()
+                                algorithm.join()
+                                algorithm = None
+                            # The cache drops its paths by itself when a wall
+                            # is edited, through the version of the maze.
+                            if cache.maze is not maze:
+                                cache = PathCache(maze, PATH_FINDING_ALGORITHM.function)
+                            path = cache.path(start_cell, end_cell)
+                            planner = LifelongPlanner(maze, start_cell, end_cell)
+                            overlays = {'start_cell': start_cell, 'end_cell': end_cell, 'path': set(path)}
+                            repaint = True
+                        case pygame.K_PLUS | pygame.K_EQUALS | pygame.K_KP_PLUS:
+                            scheduler.faster()
+                        case pygame.K_MINUS | pygame.K_KP_MINUS:
+                            scheduler.slower()
+                        case pygame.K_b:
+                            scheduler.toggle(BUDGET)
+                        case pygame.K_i:
+                            scheduler.toggle(INSTANT)
+                        case pygame.K_SPACE if algorithm:
+                            algorithm.toggle()
+                        case pygame.K_ESCAPE if algorithm:
+                            algorithm.cancel()
+                            algorithm.join()
+                            algorithm = None
+                            path = []
+                            overlays = {'start_cell': start_cell, 'end_cell': end_cell, 'path': set()}
+                            repaint = True
+                        case pygame.K_h:
+                            import distance_field
+                            show_heatmap = not show_heatmap
+                        case key if pygame.K_1 <= key <= pygame.K_9:
+                            brush = key - pygame.K_0
+                        case pygame.K_LEFT if view:
+                            view.pan(view.width * PAN_STEP, 0)
+                        case pygame.K_RIGHT if view:
+                            view.pan(-view.width * PAN_STEP, 0)
+                        case pygame.K_UP if view:
+                            view.pan(0, view.height * PAN_STEP)
+                        case pygame.K_DOWN if view:
+                            view.pan(0, -view.height * PAN_STEP)
+                        case pygame.K_HOME if view:
+                            view.fit()
+                        case pygame.K_F3:
+                            show_hud = not show_hud
+                        case pygame.K_F9 if profiler is None:
+                            # cProfile only profiles the thread that enables
+                            # it, so the workers get a profiler of their own.
+                            profiler = cProfile.Profile()
+                            worker_profiler = cProfile.Profile()
+                            profiler.enable()
+                            if algorithm:
+                                algorithm.profile(worker_profiler)
+                        case pygame.K_F9:
+                            profiler.disable()
+                            if algorithm:
+                                algorithm.profile(None)
+                            profile = pstats.Stats(profiler)
+                            # An empty profile cannot be added.
+                            if worker_profiler.getstats():
+                                profile.add(worker_profiler)
+                            profile.dump_stats(PROFILE_FILE)
+                            profile.sort_stats('cumulative').print_stats(20)
+                            profiler = None
+                            worker_profiler = None
+                        case pygame.K_s:
+                            save_maze(maze, MAZE_FILE)
+                        case pygame.K_l if os.path.exists(MAZE_FILE):
+                            try:
+                                loaded = load_maze(MAZE_FILE)
+                            except ValueError as e:
+                                loaded = None
+                                notice = f', {MAZE_FILE}: {e}'
+
+                            if loaded and (loaded.width, loaded.height) != (COLS, ROWS):
+                                notice = f', {MAZE_FILE} is {loaded.width}x{loaded.height}, not {COLS}x{ROWS}'
+                            elif loaded:
+                                if algorithm:
+                                    algorithm.cancel()
+                                    algorithm.join()
+                                maze = loaded
+                                algorithm = None
+                                path = []
+                                planner = None
+                                overlays = {'start_cell': start_cell, 'end_cell': end_cell, 'path': set()}
+                    paused = ', paused' if algorithm and algorithm.paused else ''
+                    profiling = ', profiling' if profiler else ''
+                    pygame.display.set_caption(f'{CAPTION} ({scheduler}, cost {brush}{paused}{profiling}{notice})')
         
-        if pygame.mouse.get_pressed()[0]:
-            (x, y) = pygame.mouse.get_pos()
-            i = x // SIZE
-            j = y // SIZE
-            cell = maze[j][i]
-            distances = {
-                'w': x % SIZE,
-                'n': y % SIZE,
-                'e': SIZE - x % SIZE,
-                's': SIZE - y % SIZE,
-            }
-            closest = min(distances, key=distances.get)
-            if closest == 'w' and i > 0:
-                add_wall(cell, maze[j][i - 1])
-            elif closest == 'n' and j > 0:
-                add_wall(cell, maze[j - 1][i])
-            elif closest == 'e' and i < COLS - 1:
-                add_wall(cell, maze[j][i + 1])
-            elif closest == 's' and j < ROWS - 1:
-                add_wall(cell, maze[j + 1][i])
-        elif pygame.mouse.get_pressed()[2]:
-            (x, y) = pygame.mouse.get_pos()
+        buttons = pygame.mouse.get_pressed()
+        position = mouse_position(view) if buttons[0] or buttons[2] else None
+
+        # Dragging with the middle button moves the maze with the mouse.
+        (dx, dy) = pygame.mouse.get_rel()
+        if view and buttons[1]:
+            view.pan(dx, dy)
+
+        if position and pygame.key.get_mods() & pygame.KMOD_SHIFT:
+            (x, y) = position
+            cell = maze[y // SIZE][x // SIZE]
+            version = maze.version
+
+            # Paint the cost of the cell, or clear it with the right button.
+            maze.set_cost(cell.index, brush if buttons[0] else 1)
+
+            if maze.version != version:
+                edited.add(cell)
+
+                # Repair the displayed path around the painted cell.
+                if planner:
+                    planner.update_cost(cell.index)
+                    path = planner.path()
+                    changed.update(overlays['path'] ^ set(path))
+                    overlays['path'] = set(path)
+        elif position:
+            (x, y) = position
             i = x // SIZE
             j = y // SIZE
             cell = maze[j][i]
@@ -163,33 +774,140 @@ def main() -> None:
                 's': SIZE - y % SIZE,
             }
             closest = min(distances, key=distances.get)
+            neighbour = None
             if closest == 'w' and i > 0:
-                carve_wall(cell, maze[j][i - 1])
+                neighbour = maze[j][i - 1]
             elif closest == 'n' and j > 0:
-                carve_wall(cell, maze[j - 1][i])
+                neighbour = maze[j - 1][i]
             elif closest == 'e' and i < COLS - 1:
-                carve_wall(cell, maze[j][i + 1])
+                neighbour = maze[j][i + 1]
             elif closest == 's' and j < ROWS - 1:
-                carve_wall(cell, maze[j + 1][i])
+                neighbour = maze[j + 1][i]
+
+            if neighbour:
+                version = maze.version
+
+                if buttons[0]:
+                    add_wall(cell, neighbour)
+                else:
+                    carve_wall(cell, neighbour)
+                edited.update((cell, neighbour))
+
+                # Repair the displayed path around the edited wall.
+                if planner and maze.version != version:
+                    planner.update_edge(maze.index(cell.x, cell.y), maze.index(neighbour.x, neighbour.y))
+                    path = planner.path()
+                    changed.update(overlays['path'] ^ set(path))
+                    overlays['path'] = set(path)
 
         if algorithm and algorithm_type == AlgorithmType.MAZE_GENERATION:
-            try:
-                maze, special_cells = next(algorithm)
-                draw_maze(maze, special_cells=special_cells)
-            except StopIteration as e:
-                maze = e.value
+            algorithm.allow(scheduler.allowance, scheduler.budget)
+            state, cells, finished, result = finish_worker(algorithm) if scheduler.mode == INSTANT else algorithm.poll()
+            rate_steps += algorithm.steps
+            if state:
+                maze, special_cells, _ = state
+                overlays = {'special_cells': special_cells}
+                edited.update(cells)
+            if finished:
+                maze = result
                 algorithm = None
+                path = []
+                planner = None
+                overlays = {'start_cell': start_cell, 'end_cell': end_cell, 'path': set()}
+                repaint = True
         elif algorithm and algorithm_type == AlgorithmType.PATH_FINDING:
-            try:
-                maze, open_cells, closed_cells = next(algorithm)
-                draw_maze(maze, open_cells=open_cells, closed_cells=closed_cells, start_cell=start_cell, end_cell=end_cell)
-            except StopIteration as e:
-                path = e.value
+            algorithm.allow(scheduler.allowance, scheduler.budget)
+            state, cells, finished, result = finish_worker(algorithm) if scheduler.mode == INSTANT else algorithm.poll()
+            rate_steps += algorithm.steps
+            if state:
+                maze, open_cells, closed_cells, _ = state
+                overlays = {'start_cell': start_cell, 'end_cell': end_cell, 'open_cells': open_cells, 'closed_cells': closed_cells}
+                changed.update(cells)
+            if finished:
+                path = result
                 algorithm = None
+                planner = LifelongPlanner(maze, start_cell, end_cell)
+                overlays = {'start_cell': start_cell, 'end_cell': end_cell, 'path': set(path)}
+                repaint = True
+
+        now = time.perf_counter()
+        if now - rate_started >= 0.5:
+            rate = rate_steps / (now - rate_started)
+            rate_steps = 0
+            rate_started = now
+
+        # The areas of the window to update, None for all of it.
+        rects = None
+
+        if RENDERER == 'viewport':
+            if view.maze is not maze:
+                view.reset(maze)
+
+            view.invalidate(edited)
+            view.draw(window, overlays, changed | edited)
+        elif RENDERER == 'pixels':
+            frame = pixel_renderer.render(maze, pixel_renderer.cell_states(maze, **overlays), SIZE)
+            pygame.surfarray.blit_array(window, frame.swapaxes(0, 1))
         else:
-            draw_maze(maze, start_cell, end_cell, path)
-        
-        pygame.display.update()
+            # The heatmap is part of the background, which is drawn again
+            # whenever the distances change.
+            if show_heatmap and heatmap_key != (maze, maze.version):
+                heatmap = distance_field.distance_field(maze, [maze.index(start_cell.x, start_cell.y)])
+                heatmap_key = (maze, maze.version)
+                background_maze = None
+            elif not show_heatmap and heatmap is not None:
+                heatmap = None
+                heatmap_key = None
+                background_maze = None
+
+            if maze is not background_maze:
+                draw_maze(maze, heatmap=heatmap, surface=background)
+                background_maze = maze
+                edited.clear()
+                repaint = True
+
+            for cell in edited:
+                draw_cell(background, cell, cell_colour(cell))
+
+            if repaint:
+                window.blit(background, (0, 0))
+                draw_changes(maze, background, overlay_cells(overlays), overlays, window)
+            else:
+                rects = draw_changes(maze, background, changed | edited, overlays, window)
+
+                # The cells under the HUD of the previous frame are drawn
+                # again, whether it is still shown or not.
+                if hud_area is not None:
+                    rects.extend(draw_changes(maze, background, cells_in(maze, hud_area), overlays, window))
+
+        hud_area = None
+
+        if show_hud:
+            if font is None:
+                font = pygame.font.Font(None, HUD_FONT_SIZE)
+
+            lines = [f'{clock.get_fps():.0f} FPS, {rate:.0f} steps/s']
+            if stats is not None:
+                # The worker may add statistics while they are listed, so
+                # they are copied first.
+                lines.extend(f'{name}: {value}' for name, value in list(stats.counters.items()))
+                lines.extend(f'peak {name}: {value}' for name, value in list(stats.peaks.items()))
+
+            hud_area = draw_hud(window, font, lines)
+            if rects is not None:
+                rects.append(hud_area)
+
+        if rects is None:
+            pygame.display.update()
+        else:
+            pygame.display.update(rects)
+
+        edited.clear()
+        changed.clear()
+        repaint = False
+
+    if algorithm:
+        algorithm.cancel()
 
 
 if __name__ == '__main__':
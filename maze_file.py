@@ -0,0 +1,456 @@
+import mmap
+import os
+import struct
+from grid import Grid, NORTH, SOUTH, EAST, WEST
+
+
+MAGIC = b'MAZE'
+VERSION = 2
+
+# Magic, version, flags, width, height, seed (-1 if unknown). Version 1
+# files are the same with no flags set.
+HEADER = struct.Struct('<4sHHIIq')
+
+# The flag of a file with the cost of every cell, one byte per cell, after
+# the rows.
+COSTS = 1
+
+# Tables for bytes.translate, to pack and unpack two 4-bit wall masks per
+# byte without a Python loop over the cells.
+HIGH_NIBBLE = bytes((value << 4) & 0xFF for value in range(256))
+LOW_BITS = bytes(value & 0x0F for value in range(256))
+HIGH_BITS = bytes(value >> 4 for value in range(256))
+
+
+def row_size(width: int) -> int:
+    """Get the size of a packed row.
+
+    Parameters
+    ----------
+    width : int
+        The width of the maze.
+
+    Returns
+    -------
+    int
+        The number of bytes of a row, two cells per byte.
+    """
+    return (width + 1) // 2
+
+
+def pack_row(walls: bytes) -> bytes:
+    """Pack the wall masks of a row, two cells per byte.
+
+    The cell with the even x is stored in the low nibble of a byte and
+    the cell with the odd x in the high nibble.
+
+    Parameters
+    ----------
+    walls : bytes
+        The wall masks of the cells of the row.
+
+    Returns
+    -------
+    bytes
+        The packed row.
+    """
+    size = row_size(len(walls))
+    low = int.from_bytes(walls[0::2], 'little')
+    high = int.from_bytes(walls[1::2].translate(HIGH_NIBBLE), 'little')
+
+    return (low | high).to_bytes(size, 'little')
+
+
+def unpack_row(packed: bytes, width: int) -> bytearray:
+    """Unpack the wall masks of a row.
+
+    Parameters
+    ----------
+    packed : bytes
+        The packed row, see ``pack_row``.
+    width : int
+        The width of the maze.
+
+    Returns
+    -------
+    bytearray
+        The wall masks of the cells of the row.
+    """
+    walls = bytearray(width)
+    walls[0::2] = packed.translate(LOW_BITS)
+    walls[1::2] = packed.translate(HIGH_BITS)[:width // 2]
+
+    return walls
+
+
+def write_rows(filename: str, width: int, height: int, rows, seed: int = None, costs=None) -> int:
+    """Write the rows of a maze to a packed-row file.
+
+    The file starts with a header (see ``HEADER``) followed by one packed
+    row after the other, so a row is written as soon as it is generated
+    and the maze never has to be in memory as a whole. The costs of the
+    cells, if any, follow the last row.
+
+    Parameters
+    ----------
+    filename : str
+        The file to write.
+    width : int
+        The width of the maze.
+    height : int
+        The height of the maze.
+    rows : Iterable[bytes]
+        The wall masks of every row, from the top row down, for example
+        ``maze_generation.eller_rows(width, height)``.
+    seed : int, optional
+        The seed the maze was generated with, stored in the header.
+    costs : bytes, optional
+        The cost of entering every cell, see ``Grid.costs``. Without it
+        every cell costs 1.
+
+    Returns
+    -------
+    int
+        The size of the file in bytes.
+    """
+    if costs is not None and len(costs) != width * height:
+        raise ValueError(f'expected {width * height} costs, got {len(costs)}')
+
+    written = 0
+    flags = 0 if costs is None else COSTS
+
+    with open(filename, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, flags, width, height, -1 if seed is None else seed))
+
+        for walls in rows:
+            if len(walls) != width:
+                raise ValueError(f'expected a row of {width} cells, got {len(walls)}')
+
+            file.write(pack_row(walls))
+            written += 1
+
+        if written != height:
+            raise ValueError(f'expected {height} rows, got {written}')
+
+        if costs is not None:
+            file.write(costs)
+
+        return file.tell()
+
+
+def read_header(file) -> tuple[int, int, int, int]:
+    """Read the header of a packed-row file.
+
+    Parameters
+    ----------
+    file : BinaryIO
+        The file, positioned at its start. It is left positioned at the
+        first row.
+
+    Returns
+    -------
+    tuple[int, int, int, int]
+        The width and the height of the maze, the seed it was generated
+        with, or None if it is unknown, and the flags of the file.
+    """
+    data = file.read(HEADER.size)
+
+    if len(data) != HEADER.size:
+        raise ValueError('truncated maze file header')
+
+    magic, version, flags, width, height, seed = HEADER.unpack(data)
+
+    if magic != MAGIC:
+        raise ValueError('not a maze file')
+    if not 1 <= version <= VERSION:
+        raise ValueError(f'unsupported maze file version {version}')
+
+    return width, height, None if seed == -1 else seed, flags if version > 1 else 0
+
+
+def read_rows(filename: str):
+    """Read the rows of a packed-row file one at a time.
+
+    Parameters
+    ----------
+    filename : str
+        The file to read.
+
+    Yields
+    ------
+    bytearray
+        The wall masks of the cells of a row, from the top row down.
+    """
+    with open(filename, 'rb') as file:
+        width, height, _, _ = read_header(file)
+        size = row_size(width)
+
+        for _ in range(height):
+            packed = file.read(size)
+
+            if len(packed) != size:
+                raise ValueError('truncated maze file')
+
+            yield unpack_row(packed, width)
+
+
+class PackedWalls:
+    """The wall masks of a maze, read from a packed-row buffer.
+
+    The masks are unpacked on every access instead of once, so a maze
+    loaded from a memory-mapped file needs no copy of its walls and
+    opens instantly however large it is. Only the pages that are read
+    are loaded from the disk.
+
+    Attributes
+    ----------
+    buffer : mmap.mmap
+        The buffer holding the packed rows.
+    width : int
+        The width of the maze.
+    height : int
+        The height of the maze.
+    offset : int
+        The position of the first row in the buffer.
+    size : int
+        The size of a packed row in bytes.
+    """
+
+    __slots__ = ('buffer', 'width', 'height', 'offset', 'size')
+
+    def __init__(self, buffer, width: int, height: int, offset: int = HEADER.size) -> None:
+        """Initialize the walls.
+
+        Parameters
+        ----------
+        buffer : mmap.mmap
+            The buffer holding the packed rows. It must be writable for
+            the walls to be edited.
+        width : int
+            The width of the maze.
+        height : int
+            The height of the maze.
+        offset : int, optional
+            The position of the first row in the buffer.
+        """
+        self.buffer = buffer
+        self.width = width
+        self.height = height
+        self.offset = offset
+        self.size = row_size(width)
+
+    def __len__(self) -> int:
+        """Get the number of cells."""
+        return self.width * self.height
+
+    def __getitem__(self, index):
+        """Get the wall mask of a cell, or the masks of a slice of cells.
+
+        A slice only unpacks the rows it covers, so reading a row of a
+        large maze does not read the whole file.
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+
+            if step != 1:
+                return bytearray(self[i] for i in range(start, stop, step))
+            if start >= stop:
+                return bytearray()
+
+            first = start // self.width
+            walls = b''.join(self.row(y) for y in range(first, (stop - 1) // self.width + 1))
+            offset = first * self.width
+
+            return bytearray(walls[start - offset:stop - offset])
+
+        if not 0 <= index < self.width * self.height:
+            raise IndexError('cell index out of range')
+
+        y, x = divmod(index, self.width)
+        value = self.buffer[self.offset + y * self.size + (x >> 1)]
+
+        return value >> 4 if x & 1 else value & 0x0F
+
+    def __setitem__(self, index: int, mask: int) -> None:
+        """Set the wall mask of a cell."""
+        if not 0 <= index < self.width * self.height:
+            raise IndexError('cell index out of range')
+
+        y, x = divmod(index, self.width)
+        position = self.offset + y * self.size + (x >> 1)
+        value = self.buffer[position]
+
+        self.buffer[position] = (value & 0x0F) | (mask << 4) if x & 1 else (value & 0xF0) | mask
+
+    def row(self, y: int) -> bytearray:
+        """Get the wall masks of a row.
+
+        Parameters
+        ----------
+        y : int
+            The y coordinate of the row.
+
+        Returns
+        -------
+        bytearray
+            The wall masks of the cells of the row.
+        """
+        if not 0 <= y < self.height:
+            raise IndexError('row index out of range')
+
+        position = self.offset + y * self.size
+        return unpack_row(self.buffer[position:position + self.size], self.width)
+
+    def rows(self):
+        """Iterate over the rows.
+
+        Yields
+        ------
+        bytearray
+            The wall masks of the cells of a row, from the top row down.
+        """
+        for y in range(self.height):
+            yield self.row(y)
+
+    def __iter__(self):
+        """Iterate over the wall masks of the cells."""
+        for walls in self.rows():
+            yield from walls
+
+    def __bytes__(self) -> bytes:
+        """Get the wall masks of the cells, one byte per cell."""
+        return b''.join(self.rows())
+
+
+def check_borders(walls, width: int, height: int) -> None:
+    """Check that the walls around a maze are all standing.
+
+    The solvers rely on them to never step off the maze, so a file with
+    a gap in them would let a path wrap around to the other side.
+
+    Parameters
+    ----------
+    walls : bytearray or PackedWalls
+        The wall masks of the cells.
+    width : int
+        The width of the maze.
+    height : int
+        The height of the maze.
+
+    Raises
+    ------
+    ValueError
+        If a wall on the border of the maze is missing.
+    """
+    if not width or not height:
+        return
+
+    if isinstance(walls, PackedWalls):
+        top, bottom = walls.row(0), walls.row(height - 1)
+    else:
+        top, bottom = walls[:width], walls[(height - 1) * width:height * width]
+
+    # Only the first and the last cell of the other rows are read, so a
+    # memory-mapped maze is not loaded as a whole.
+    left = (walls[y * width] for y in range(height))
+    right = (walls[y * width + width - 1] for y in range(height))
+
+    for masks, bit in ((top, NORTH), (bottom, SOUTH), (left, WEST), (right, EAST)):
+        if not all(mask & bit for mask in masks):
+            raise ValueError('maze file has a gap in its border walls')
+
+
+def save_maze(maze: Grid, filename: str, seed: int = None) -> int:
+    """Save a maze to a packed-row file.
+
+    The file is written next to the destination and then moved over it,
+    so a maze loaded from the same file keeps its mapping intact.
+
+    Parameters
+    ----------
+    maze : Grid
+        The maze to save.
+    filename : str
+        The file to write.
+    seed : int, optional
+        The seed the maze was generated with, stored in the header.
+
+    Returns
+    -------
+    int
+        The size of the file in bytes.
+    """
+    walls = maze.walls
+    width = maze.width
+
+    if isinstance(walls, PackedWalls):
+        rows = walls.rows()
+    else:
+        rows = (walls[y * width:(y + 1) * width] for y in range(maze.height))
+
+    # The costs are only stored when some cell is weighted.
+    costs = bytes(maze.costs) if maze.max_cost() > 1 else None
+
+    temporary = f'{filename}.tmp'
+    size = write_rows(temporary, width, maze.height, rows, seed, costs)
+    os.replace(temporary, filename)
+
+    return size
+
+
+def load_maze(filename: str, copy: bool = False) -> Grid:
+    """Load a maze from a packed-row file.
+
+    By default the file is memory-mapped and the walls of the maze are
+    read from the mapping, see ``PackedWalls``, as are the costs of its
+    cells if the file has them. The mapping is copy-on-write, so walls
+    and costs can be edited without changing the file.
+
+    A file whose border walls are not all standing is rejected, see
+    ``check_borders``.
+
+    Parameters
+    ----------
+    filename : str
+        The file to read.
+    copy : bool, optional
+        Unpack the walls into a bytearray instead. Loading takes longer
+        and uses a byte per cell, but the solvers read the walls faster.
+
+    Returns
+    -------
+    Grid
+        The maze.
+    """
+    with open(filename, 'rb') as file:
+        width, height, _, flags = read_header(file)
+
+        start = HEADER.size + row_size(width) * height
+        end = start + width * height if flags & COSTS else start
+
+        if copy:
+            walls = bytearray(b''.join(read_rows(filename)))
+            costs = None
+
+            check_borders(walls, width, height)
+
+            if flags & COSTS:
+                file.seek(start)
+                costs = bytearray(file.read(end - start))
+
+                if len(costs) != end - start:
+                    raise ValueError('truncated maze file')
+
+            return Grid(width, height, walls, costs)
+
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    if len(buffer) < end:
+        raise ValueError('truncated maze file')
+
+    costs = memoryview(buffer)[start:end] if flags & COSTS else None
+    walls = PackedWalls(buffer, width, height)
+
+    check_borders(walls, width, height)
+
+    return Grid(width, height, walls, costs)
@@ -1,11 +1,64 @@
-from cell import Cell
-from helpers import get_neighbours, carve_wall
-from random import choice, randint
+from array import array
+from grid import Grid, CellView, NORTH, SOUTH, EAST, WEST, ALL_WALLS
+import random
+from instrumentation import Stats
 
 
-def dfs(width: int, height: int) -> list[list[Cell]]:
+def _rng(seed: int = None) -> random.Random:
+    """Get the random number generator of a generator run.
+
+    Parameters
+    ----------
+    seed : int, optional
+        The seed of the run.
+
+    Returns
+    -------
+    random.Random
+        A generator of its own seeded with the seed, or the shared
+        generator of the ``random`` module if there is no seed.
+    """
+    return random if seed is None else random.Random(seed)
+
+
+def _moves(maze: Grid) -> tuple[bytearray, tuple, tuple]:
+    """Get the moves that stay inside a maze.
+
+    The generators write the wall masks directly instead of going through
+    ``Grid.carve``, so they need to know which walls they may remove.
+
+    Parameters
+    ----------
+    maze : Grid
+        The maze to get the moves of.
+
+    Returns
+    -------
+    tuple[bytearray, tuple, tuple]
+        The mask of the walls on the border of the grid for every cell,
+        the directions as ``(offset, bit, opposite_bit)`` tuples and, for
+        every border mask, the directions that stay inside the grid, in
+        the same order as ``Grid.neighbours``.
+    """
+    width, height = maze.width, maze.height
+    borders = bytearray(width * height)
+
+    for x in range(width):
+        borders[x] |= NORTH
+        borders[(height - 1) * width + x] |= SOUTH
+    for y in range(height):
+        borders[y * width] |= WEST
+        borders[y * width + width - 1] |= EAST
+
+    directions = ((-1, WEST, EAST), (1, EAST, WEST), (-width, NORTH, SOUTH), (width, SOUTH, NORTH))
+    moves = tuple(tuple(direction for direction, (_, bit, _) in enumerate(directions) if not mask & bit) for mask in range(16))
+
+    return borders, directions, moves
+
+
+def dfs(width: int, height: int, every: int = 1, seed: int = None, stats: Stats = None) -> Grid:
     """Generate a maze using depth-first search.
-    
+
     1. Choose the initial cell, mark it as visited and push it to the stack.
     2. While the stack is not empty.
         1. Pop a cell from the stack and make it a current cell.
@@ -14,97 +67,536 @@ def dfs(width: int, height: int) -> list[list[Cell]]:
             2. Choose one of the unvisited neighbours.
             3. Remove the wall between the current cell and the chosen cell.
             4. Mark the chosen cell as visited and push it to the stack.
-    
+
     Parameters
     ----------
     width : int
         The width of the maze.
     height : int
         The height of the maze.
-    cell : Cell
-        The current cell.
-    
+    every : int, optional
+        Yield the state every this many steps, or never if it is 0. The
+        cells that changed since the previous yield are yielded with it.
+    seed : int, optional
+        The seed of the maze. The same seed always gives the same maze,
+        without touching the shared generator of the ``random`` module.
+    stats : Stats, optional
+        The statistics to count the carved walls and the largest
+        frontier in and to time the ``setup`` and ``carve`` phases in.
+
     Returns
     -------
-    list[list[Cell]]
+    Grid
         The maze.
     """
-    maze = [[Cell(x, y) for x in range(width)] for y in range(height)]
+    if stats is not None:
+        stats.start()
 
-    visited = set()
+    rng = _rng(seed)
+    maze = Grid(width, height)
+    walls = maze.walls
+    borders, directions, moves = _moves(maze)
+
+    visited = bytearray(width * height)
     stack = []
+    changed = set()
+    steps = 0
+
+    # The cells on the stack, updated as they are pushed and popped so a
+    # yield does not copy the stack.
+    on_stack = set()
+
+    # With stats, pushing to the stack also records its largest size.
+    push = stack.append if stats is None else stats.appender(stack)
+
+    initial_cell = maze.index(y=rng.randint(0, height - 1), x=rng.randint(0, width - 1))
+
+    visited[initial_cell] = 1
+    push(initial_cell)
 
-    initial_cell = maze[randint(0, height - 1)][randint(0, width - 1)]
-    
-    visited.add(initial_cell)
-    stack.append(initial_cell)
+    if every:
+        on_stack.add(initial_cell)
+
+    if stats is not None:
+        stats.lap('setup')
 
     while stack:
         current_cell = stack.pop()
-        neighbours = [neighbour for neighbour in get_neighbours(maze, current_cell) if neighbour not in visited]
+        neighbours = [directions[move] for move in moves[borders[current_cell]] if not visited[current_cell + directions[move][0]]]
 
         if neighbours:
-            stack.append(current_cell)
-
-            neighbour = choice(neighbours)
-            carve_wall(current_cell, neighbour)
-            
-            visited.add(neighbour)
-            stack.append(neighbour)
-        
-        yield maze, stack
-    
+            push(current_cell)
+
+            offset, bit, opposite_bit = rng.choice(neighbours)
+            neighbour = current_cell + offset
+            walls[current_cell] &= ~bit
+            walls[neighbour] &= ~opposite_bit
+
+            visited[neighbour] = 1
+            push(neighbour)
+
+            if every:
+                on_stack.add(neighbour)
+                changed.add(neighbour)
+        elif every:
+            on_stack.discard(current_cell)
+
+        if every:
+            changed.add(current_cell)
+
+        steps += 1
+        if steps == every:
+            steps = 0
+            # The walls are written directly, so the version is bumped once
+            # per yield instead of once per carved wall.
+            maze.version += 1
+            yield maze, CellView(maze, on_stack), CellView(maze, changed)
+            changed = set()
+
+    maze.version += 1
+
+    # Every visited cell but the first was reached through a carved wall.
+    if stats is not None:
+        stats.count('carves', visited.count(1) - 1)
+        stats.lap('carve')
+
     return maze
 
 
-def prim(width: int, height: int) -> list[list[Cell]]:
+def prim(width: int, height: int, every: int = 1, seed: int = None, stats: Stats = None) -> Grid:
     """Generate a maze using Prim's algorithm.
-    
+
     1. Choose the initial cell, mark it as visited and add it's neighbours to the frontier.
-    2. While the frontier set is not empty.
-        1. Pop a cell from the frontier.
+    2. While the frontier is not empty.
+        1. Remove a random cell from the frontier, by swapping it with the last one.
         2. Choose a random "in" neighbour.
         3. Carve a wall from the current cell to the neighbour.
         4. Mark the current cell as visited.
         5. Add any of it's "out" neighbours to the frontier.
-    
+
     Parameters
     ----------
     width : int
         The width of the maze.
     height : int
         The height of the maze.
-    cell : Cell
-        The current cell.
-    
+    every : int, optional
+        Yield the state every this many steps, or never if it is 0. The
+        cells that changed since the previous yield are yielded with it.
+    seed : int, optional
+        The seed of the maze. The same seed always gives the same maze,
+        without touching the shared generator of the ``random`` module.
+    stats : Stats, optional
+        The statistics to count the carved walls and the largest
+        frontier in and to time the ``setup`` and ``carve`` phases in.
+
     Returns
     -------
-    list[list[Cell]]
+    Grid
         The maze.
     """
-    maze = [[Cell(x, y) for x in range(width)] for y in range(height)]
+    if stats is not None:
+        stats.start()
+
+    rng = _rng(seed)
+    maze = Grid(width, height)
+    walls = maze.walls
+    borders, directions, moves = _moves(maze)
+
+    # 0 for the cells outside of the maze, 1 for the frontier, 2 for the
+    # cells in the maze.
+    state = bytearray(width * height)
+    frontier = []
+    changed = set()
+    steps = 0
+
+    # The cells of the frontier, see on_stack in dfs.
+    in_frontier = set()
 
-    visited = set()
-    frontier = set()
+    # See dfs.
+    add = frontier.append if stats is None else stats.appender(frontier)
 
-    initial_cell = maze[randint(0, height - 1)][randint(0, width - 1)]
+    initial_cell = maze.index(y=rng.randint(0, height - 1), x=rng.randint(0, width - 1))
 
-    visited.add(initial_cell)
-    frontier.update(get_neighbours(maze, initial_cell))
+    state[initial_cell] = 2
+    if every:
+        changed.add(initial_cell)
+
+    for move in moves[borders[initial_cell]]:
+        neighbour = initial_cell + directions[move][0]
+        state[neighbour] = 1
+        add(neighbour)
+
+        if every:
+            in_frontier.add(neighbour)
+            changed.add(neighbour)
+
+    if stats is not None:
+        stats.lap('setup')
 
     while frontier:
-        current_cell = choice(list(frontier))
-        frontier.remove(current_cell)
-
-        in_neighbours = [in_neighbour for in_neighbour in get_neighbours(maze, current_cell) if in_neighbour in visited]
-
-        if in_neighbours:
-            in_neighbour = choice(in_neighbours)
-            carve_wall(current_cell, in_neighbour)
-            
-            visited.add(current_cell)
-            frontier.update([out_neighbour for out_neighbour in get_neighbours(maze, current_cell) if out_neighbour not in visited])
-        
-        yield maze, frontier
-    
+        i = rng.randrange(len(frontier))
+        current_cell = frontier[i]
+        frontier[i] = frontier[-1]
+        frontier.pop()
+
+        if every:
+            in_frontier.discard(current_cell)
+
+        in_neighbours = [directions[move] for move in moves[borders[current_cell]] if state[current_cell + directions[move][0]] == 2]
+
+        offset, bit, opposite_bit = rng.choice(in_neighbours)
+        walls[current_cell] &= ~bit
+        walls[current_cell + offset] &= ~opposite_bit
+
+        state[current_cell] = 2
+
+        for move in moves[borders[current_cell]]:
+            out_neighbour = current_cell + directions[move][0]
+            if not state[out_neighbour]:
+                state[out_neighbour] = 1
+                add(out_neighbour)
+
+                if every:
+                    in_frontier.add(out_neighbour)
+                    changed.add(out_neighbour)
+
+        if every:
+            changed.add(current_cell)
+            changed.add(current_cell + offset)
+
+        steps += 1
+        if steps == every:
+            steps = 0
+            maze.version += 1
+            yield maze, CellView(maze, in_frontier), CellView(maze, changed)
+            changed = set()
+
+    maze.version += 1
+
+    # Every cell added to the maze but the first was joined by a carved wall.
+    if stats is not None:
+        stats.count('carves', state.count(2) - 1)
+        stats.lap('carve')
+
+    return maze
+
+
+def kruskal(width: int, height: int, every: int = 1, seed: int = None) -> Grid:
+    """Generate a maze using Kruskal's algorithm.
+
+    1. Put every cell in its own set.
+    2. For every wall between two cells, in a random order.
+        1. If the cells on both sides of the wall are in different sets.
+            1. Remove the wall.
+            2. Join the sets of the two cells.
+
+    The sets are kept in a union-find array with path halving.
+
+    Parameters
+    ----------
+    width : int
+        The width of the maze.
+    height : int
+        The height of the maze.
+    every : int, optional
+        Yield the state every this many steps, or never if it is 0. The
+        cells that changed since the previous yield are yielded with it.
+    seed : int, optional
+        The seed of the maze. The same seed always gives the same maze,
+        without touching the shared generator of the ``random`` module.
+
+    Returns
+    -------
+    Grid
+        The maze.
+    """
+    rng = _rng(seed)
+    maze = Grid(width, height)
+    walls = maze.walls
+
+    cells = width * height
+    sets = array('i', range(cells))
+    changed = set()
+    special = ()
+    steps = 0
+    carved = 0
+
+    def find(index: int) -> int:
+        while sets[index] != index:
+            sets[index] = sets[sets[index]]
+            index = sets[index]
+        return index
+
+    # Every cell has an east wall (even) and a south wall (odd). The ones
+    # on the border are skipped.
+    edges = array('q', range(2 * cells))
+    rng.shuffle(edges)
+
+    for edge in edges:
+        if carved == cells - 1:
+            break
+
+        current_cell = edge >> 1
+
+        if edge & 1:
+            if current_cell >= cells - width:
+                continue
+            neighbour, bit, opposite_bit = current_cell + width, SOUTH, NORTH
+        else:
+            if current_cell % width == width - 1:
+                continue
+            neighbour, bit, opposite_bit = current_cell + 1, EAST, WEST
+
+        root, neighbour_root = find(current_cell), find(neighbour)
+
+        if root != neighbour_root:
+            sets[root] = neighbour_root
+            walls[current_cell] &= ~bit
+            walls[neighbour] &= ~opposite_bit
+            carved += 1
+
+            if every:
+                changed.add(current_cell)
+                changed.add(neighbour)
+
+        steps += 1
+        if steps == every:
+            steps = 0
+            maze.version += 1
+            # The edge is yielded whether it was carved or not, so both
+            # its cells and those of the previous one changed.
+            changed.update(special)
+            special = (current_cell, neighbour)
+            changed.update(special)
+            yield maze, CellView(maze, special), CellView(maze, changed)
+            changed = set()
+
+    maze.version += 1
+    return maze
+
+
+def wilson(width: int, height: int, every: int = 1, seed: int = None) -> Grid:
+    """Generate a maze using Wilson's algorithm.
+
+    1. Add a random cell to the maze.
+    2. For every cell which is not in the maze, in a random order.
+        1. Walk randomly from the cell until a cell in the maze is reached,
+           remembering the last direction taken out of every cell.
+        2. Follow the remembered directions from the cell, which erases the
+           loops of the walk, carving walls and adding the cells to the maze.
+
+    The result is a uniform spanning tree, so the mazes are not biased
+    towards long corridors or short dead ends.
+
+    Parameters
+    ----------
+    width : int
+        The width of the maze.
+    height : int
+        The height of the maze.
+    every : int, optional
+        Yield the state every this many steps, or never if it is 0. The
+        cells that changed since the previous yield are yielded with it.
+    seed : int, optional
+        The seed of the maze. The same seed always gives the same maze,
+        without touching the shared generator of the ``random`` module.
+
+    Returns
+    -------
+    Grid
+        The maze.
+    """
+    rng = _rng(seed)
+    maze = Grid(width, height)
+    walls = maze.walls
+    borders, directions, moves = _moves(maze)
+
+    cells = width * height
+    in_maze = bytearray(cells)
+    exits = bytearray(cells)
+    changed = set()
+    walk = set()
+    steps = 0
+
+    in_maze[rng.randrange(cells)] = 1
+
+    order = array('q', range(cells))
+    rng.shuffle(order)
+
+    def walked(cell: int, head: int = None) -> set[int]:
+        path = set()
+        while cell != head and cell not in path and not in_maze[cell]:
+            path.add(cell)
+            cell += directions[exits[cell]][0]
+        if head is not None:
+            path.add(head)
+        return path
+
+    for start in order:
+        if in_maze[start]:
+            continue
+
+        current_cell = start
+
+        while not in_maze[current_cell]:
+            exits[current_cell] = rng.choice(moves[borders[current_cell]])
+            current_cell += directions[exits[current_cell]][0]
+
+            steps += 1
+            if steps == every:
+                steps = 0
+                shown, walk = walk, walked(start, current_cell)
+                changed.update(shown ^ walk)
+                yield maze, CellView(maze, walk), CellView(maze, changed)
+                changed = set()
+
+        current_cell = start
+
+        while not in_maze[current_cell]:
+            offset, bit, opposite_bit = directions[exits[current_cell]]
+            walls[current_cell] &= ~bit
+            walls[current_cell + offset] &= ~opposite_bit
+            in_maze[current_cell] = 1
+
+            if every:
+                changed.add(current_cell)
+                changed.add(current_cell + offset)
+
+            current_cell += offset
+
+            steps += 1
+            if steps == every:
+                steps = 0
+                maze.version += 1
+                shown, walk = walk, walked(current_cell)
+                changed.update(shown ^ walk)
+                yield maze, CellView(maze, walk), CellView(maze, changed)
+                changed = set()
+
+    maze.version += 1
+    return maze
+
+
+def eller_rows(width: int, height: int, seed: int = None):
+    """Generate the rows of a maze using Eller's algorithm.
+
+    1. For every row of the maze.
+        1. Put every cell of the row which is not in a set in a new one.
+        2. Randomly join neighbouring cells of different sets, removing the
+           wall between them. On the last row, join all of them.
+        3. Randomly remove south walls, at least one for every set, and
+           carry the sets of those cells to the row below.
+        4. Yield the wall masks of the row.
+
+    Only the sets of the current row are kept, so the memory used is
+    linear in the width of the maze whatever its height. The rows can be
+    streamed to a file with ``maze_file.write_rows`` for mazes that do not
+    fit in memory.
+
+    Parameters
+    ----------
+    width : int
+        The width of the maze.
+    height : int
+        The height of the maze.
+    seed : int, optional
+        The seed of the maze. The same seed always gives the same maze,
+        without touching the shared generator of the ``random`` module.
+
+    Yields
+    ------
+    bytearray
+        The wall masks of the cells of a row, from the top row down.
+    """
+    rng = _rng(seed)
+    row = [None] * width
+    members = {}
+    next_set = 0
+
+    for y in range(height):
+        last_row = y == height - 1
+        walls = bytearray([ALL_WALLS]) * width
+
+        for x in range(width):
+            if row[x] is None:
+                row[x] = next_set
+                members[next_set] = [x]
+                next_set += 1
+            else:
+                walls[x] &= ~NORTH
+
+        for x in range(width - 1):
+            a, b = row[x], row[x + 1]
+
+            if a != b and (last_row or rng.random() < 0.5):
+                walls[x] &= ~EAST
+                walls[x + 1] &= ~WEST
+
+                # Relabel the smaller set, so a cell is relabelled at most
+                # log(width) times per row.
+                if len(members[a]) < len(members[b]):
+                    a, b = b, a
+                for i in members[b]:
+                    row[i] = a
+                members[a].extend(members.pop(b))
+
+        if not last_row:
+            below = [None] * width
+
+            for key, xs in members.items():
+                for x in [x for x in xs if rng.random() < 0.5] or [rng.choice(xs)]:
+                    walls[x] &= ~SOUTH
+                    below[x] = key
+
+            row = below
+            members = {}
+            for x, key in enumerate(row):
+                if key is not None:
+                    members.setdefault(key, []).append(x)
+
+        yield walls
+
+
+def eller(width: int, height: int, every: int = 1, seed: int = None) -> Grid:
+    """Generate a maze using Eller's algorithm.
+
+    The rows of ``eller_rows`` are copied into a grid, one row per step.
+
+    Parameters
+    ----------
+    width : int
+        The width of the maze.
+    height : int
+        The height of the maze.
+    every : int, optional
+        Yield the state every this many steps, or never if it is 0. The
+        cells that changed since the previous yield are yielded with it.
+    seed : int, optional
+        The seed of the maze. The same seed always gives the same maze,
+        without touching the shared generator of the ``random`` module.
+
+    Returns
+    -------
+    Grid
+        The maze.
+    """
+    maze = Grid(width, height)
+
+    # The first row that changed since the previous yield. The row shown
+    # as special at that yield changes back too.
+    first_row = 0
+    steps = 0
+
+    for y, walls in enumerate(eller_rows(width, height, seed)):
+        maze.walls[y * width:(y + 1) * width] = walls
+
+        steps += 1
+        if steps == every:
+            steps = 0
+            maze.version += 1
+            yield maze, CellView(maze, range(y * width, (y + 1) * width)), CellView(maze, range(first_row * width, (y + 1) * width))
+            first_row = y
+
+    maze.version += 1
     return maze
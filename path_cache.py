@@ -0,0 +1,230 @@
+from array import array
+from collections import OrderedDict
+from heapq import heappush, heappop
+from cell import Cell
+from grid import Grid
+from helpers import run_to_completion
+from path_finding import astar
+from search import SearchContext
+
+
+UNREACHED = -2
+
+
+class PathCache:
+    """Answer many path queries on the same maze.
+
+    Paths are kept in an LRU cache keyed by the version of the maze and
+    the indices of the start and end cells. Every wall or cost change
+    bumps ``Grid.version``, so an entry of an older maze is never returned, and
+    the stale entries are dropped on the next query.
+
+    A cell that keeps being queried gets its whole shortest-path tree
+    computed by a single-source Dijkstra. The tree answers the queries
+    from that cell to every end cell, and the queries from every start
+    cell to it: a path and its reverse differ in cost only by the costs
+    of their two ends, so the cheapest path one way is the cheapest the
+    other way too.
+
+    Attributes
+    ----------
+    maze : Grid
+        The maze the paths are found in.
+    solver : Callable
+        The path finding algorithm used when no tree answers a query.
+    capacity : int
+        The maximum number of cached paths.
+    tree_capacity : int
+        The maximum number of cached trees.
+    tree_after : int
+        The number of queries from a cell missing the cache before its
+        tree is built.
+    hits : int
+        The number of queries answered from the cache.
+    misses : int
+        The number of queries that needed a search.
+
+    Methods
+    -------
+    path(start_cell: Cell, end_cell: Cell)
+        Find the shortest path between two cells.
+    tree(root: int)
+        Get the shortest-path tree of a cell.
+    invalidate()
+        Drop every entry of an older version of the maze.
+    """
+
+    def __init__(self, maze: Grid, solver=astar, capacity: int = 1024, tree_capacity: int = 16, tree_after: int = 2) -> None:
+        """Initialize an empty cache.
+
+        Parameters
+        ----------
+        maze : Grid
+            The maze the paths are found in.
+        solver : Callable, optional
+            The path finding algorithm used when no tree answers a query.
+        capacity : int, optional
+            The maximum number of cached paths.
+        tree_capacity : int, optional
+            The maximum number of cached trees.
+        tree_after : int, optional
+            The number of queries from a cell missing the cache before
+            its tree is built.
+        """
+        self.maze = maze
+        self.solver = solver
+        self.capacity = capacity
+        self.tree_capacity = tree_capacity
+        self.tree_after = tree_after
+
+        self.context = SearchContext(maze.width * maze.height)
+        self.version = maze.version
+        self.paths = OrderedDict()
+        self.trees = OrderedDict()
+        self.queries = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate(self) -> None:
+        """Drop every entry of an older version of the maze."""
+        self.paths.clear()
+        self.trees.clear()
+        self.queries.clear()
+        self.version = self.maze.version
+
+    def path(self, start_cell: Cell, end_cell: Cell) -> list[Cell]:
+        """Find the shortest path between two cells.
+
+        Parameters
+        ----------
+        start_cell : Cell
+            The cell to start the path from.
+        end_cell : Cell
+            The cell to end the path at.
+
+        Returns
+        -------
+        list[Cell]
+            The path from the start cell to the end cell, or an empty
+            path if there is none.
+        """
+        if self.maze.version != self.version:
+            self.invalidate()
+
+        width = self.maze.width
+        start = start_cell.y * width + start_cell.x
+        end = end_cell.y * width + end_cell.x
+
+        key = (self.version, start, end)
+        indices = self.paths.get(key)
+
+        if indices is not None:
+            self.paths.move_to_end(key)
+            self.hits += 1
+        elif (self.version, start) in self.trees:
+            indices = self._walk(self.tree(start), end)[::-1]
+            self.hits += 1
+        elif (self.version, end) in self.trees:
+            indices = self._walk(self.tree(end), start)
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.queries[start] = self.queries.get(start, 0) + 1
+
+            if self.queries[start] >= self.tree_after:
+                indices = self._walk(self.tree(start), end)[::-1]
+            else:
+                path = run_to_completion(self.solver(self.maze, start_cell, end_cell, self.context, every=0))
+                indices = tuple(cell.y * width + cell.x for cell in path)
+
+            self.paths[key] = indices
+            if len(self.paths) > self.capacity:
+                self.paths.popitem(last=False)
+
+        return [self.maze.cell(index) for index in indices]
+
+    def tree(self, root: int) -> array:
+        """Get the shortest-path tree of a cell.
+
+        Parameters
+        ----------
+        root : int
+            The index of the cell.
+
+        Returns
+        -------
+        array
+            The parent of every cell on its shortest path from the root,
+            -1 for the root and ``UNREACHED`` for the cells that cannot
+            be reached.
+        """
+        if self.maze.version != self.version:
+            self.invalidate()
+
+        key = (self.version, root)
+        parents = self.trees.get(key)
+
+        if parents is not None:
+            self.trees.move_to_end(key)
+            return parents
+
+        walls = self.maze.walls
+        costs = self.maze.costs
+        passages = self.maze.passages
+        size = self.maze.width * self.maze.height
+
+        parents = array('i', [UNREACHED]) * size
+        g_scores = array('i', bytes(4 * size))
+
+        parents[root] = -1
+        heap = [(0, root)]
+
+        while heap:
+            g, current = heappop(heap)
+
+            if g > g_scores[current]:
+                continue
+
+            for offset in passages[walls[current]]:
+                neighbour = current + offset
+                new_g_score = g + costs[neighbour]
+
+                if parents[neighbour] == UNREACHED or new_g_score < g_scores[neighbour]:
+                    parents[neighbour] = current
+                    g_scores[neighbour] = new_g_score
+                    heappush(heap, (new_g_score, neighbour))
+
+        self.trees[key] = parents
+        if len(self.trees) > self.tree_capacity:
+            self.trees.popitem(last=False)
+
+        return parents
+
+    @staticmethod
+    def _walk(parents: array, index: int) -> tuple[int, ...]:
+        """Walk up a shortest-path tree.
+
+        Parameters
+        ----------
+        parents : array
+            The tree, as returned by ``tree``.
+        index : int
+            The index of the cell to start from.
+
+        Returns
+        -------
+        tuple[int, ...]
+            The indices of the cells from the cell up to the root, or an
+            empty tuple if the cell cannot be reached.
+        """
+        if parents[index] == UNREACHED:
+            return ()
+
+        indices = []
+
+        while index >= 0:
+            indices.append(index)
+            index = parents[index]
+
+        return tuple(indices)
@@ -1,13 +1,19 @@
+from heapq import heappush, heappop
+from itertools import count
 from cell import Cell
-from helpers import reconstruct_path, get_neighbours, heuristic, are_connected
+from contraction import ContractedGraph
+from grid import Grid, CellView, NORTH, SOUTH, EAST, WEST
+from helpers import reconstruct_path, heuristic
+from instrumentation import Stats
+from search import SearchContext
 
 
-def astar(maze: list[list[Cell]], start_cell: Cell, end_cell: Cell) -> list[Cell]:
+def astar(maze: Grid, start_cell: Cell, end_cell: Cell, context: SearchContext = None, every: int = 1, stats: Stats = None) -> list[Cell]:
     """A* pathfinding algorithm.
 
     1. Add the start cell to the open list.
     2. While the open list is not empty.
-        1. Get the cell with the lowest f score from the open list.
+        1. Pop the cell with the lowest f score from the open list, skipping stale entries.
         2. Add the current cell to the closed list.
         3. If the current cell is the end cell, return the path.
         4. For each of the current cell's neighbours.
@@ -20,62 +26,151 @@ def astar(maze: list[list[Cell]], start_cell: Cell, end_cell: Cell) -> list[Cell
                 4. Set the neighbour's parent to the current cell.
                 5. If the neighbour is not in the open list, add it to the open list.
     3. If no path is found, return an empty path.
-    
+
+    Moving to a neighbour costs the cost of entering it from ``Grid.costs``.
+    The h score is the Manhattan distance times the lowest cost of the
+    maze, which never overestimates the cost of the rest of the path.
+
     Parameters
     ----------
-    maze : list[list[Cell]]
+    maze : Grid
         The maze to find the path in.
     start_cell : Cell
         The cell to start the path from.
     end_cell : Cell
         The cell to end the path at.
-    
+    context : SearchContext, optional
+        The context to keep the scores and parents in. It is reset before
+        the search starts. A new one is created if none is given.
+    every : int, optional
+        Yield the state every this many steps, or never if it is 0. The
+        cells that changed since the previous yield are yielded with it.
+    stats : Stats, optional
+        The statistics to count the operations of the search in and to
+        time its ``setup``, ``search`` and ``path`` phases in.
+
     Returns
     -------
     list[Cell]
         The path from the start cell to the end cell.
     """
+    if stats is not None:
+        stats.start()
+
+    width = maze.width
+    walls = maze.walls
+    costs = maze.costs
+    scale = maze.min_cost()
+
+    # With stats, the heap functions and the passages are swapped for
+    # counting versions, so the loop has no checks of its own.
+    passages = maze.passages if stats is None else stats.passages(maze.passages)
+    push, pop = (heappush, heappop) if stats is None else stats.heap()
+
+    if context is None:
+        context = SearchContext(width * maze.height)
+
+    context.reset()
+
+    # The arrays of the context are used directly in the loop, it is the
+    # hot path of every search.
+    g_scores = context.g
+    parents = context.parent
+    reached = context.reached
+    closed = context.closed
+    generation = context.generation
+
     open_cells = set()
     closed_cells = set()
+    changed = set()
+    steps = 0
+
+    start = start_cell.y * width + start_cell.x
+    end = end_cell.y * width + end_cell.x
+
+    context.update(start, 0, -1)
+
+    # Entries are (f, h, tie, cell). Ties on f are broken towards the goal
+    # and then by insertion order. An improved cell is pushed again and its
+    # old entries are skipped.
+    tie = count()
+    h = heuristic(start_cell, end_cell) * scale
+    heap = []
+    push(heap, (h, h, next(tie), start))
+
+    if every:
+        open_cells.add(start)
+
+    if stats is not None:
+        stats.lap('setup')
+
+    while heap:
+        f, h, _, current = pop(heap)
+
+        if closed[current] == generation or f - h != g_scores[current]:
+            continue
+
+        closed[current] = generation
+        context.expansions += 1
+
+        if every:
+            open_cells.discard(current)
+            closed_cells.add(current)
+            changed.add(current)
 
-    open_cells.add(start_cell)
+        if current == end:
+            if stats is not None:
+                stats.count('expansions', context.expansions)
+                stats.lap('search')
 
-    while len(open_cells) > 0:
-        current_cell = min(open_cells, key=lambda cell: cell.f)
+            path = reconstruct_path(maze, context, end_cell)
 
-        open_cells.remove(current_cell)
-        closed_cells.add(current_cell)
+            if stats is not None:
+                stats.lap('path')
 
-        if current_cell == end_cell:
-            return reconstruct_path(current_cell)
+            return path
 
-        for neighbour in get_neighbours(maze, current_cell):
-            if neighbour in closed_cells or not are_connected(current_cell, neighbour):
+        g = g_scores[current]
+
+        for offset in passages[walls[current]]:
+            neighbour = current + offset
+
+            if closed[neighbour] == generation:
                 continue
 
-            new_g_score = current_cell.g + heuristic(neighbour, current_cell)
+            new_g_score = g + costs[neighbour]
+
+            if reached[neighbour] != generation or new_g_score < g_scores[neighbour]:
+                g_scores[neighbour] = new_g_score
+                parents[neighbour] = current
+                reached[neighbour] = generation
 
-            if neighbour not in open_cells or new_g_score < neighbour.g:
-                neighbour.g = new_g_score
-                neighbour.h = heuristic(neighbour, end_cell)
-                neighbour.f = neighbour.g + neighbour.h
-                
-                neighbour.parent = current_cell
+                h = (abs(neighbour % width - end_cell.x) + abs(neighbour // width - end_cell.y)) * scale
+                push(heap, (new_g_score + h, h, next(tie), neighbour))
 
-                if neighbour not in open_cells:
+                if every:
                     open_cells.add(neighbour)
-        
-        yield maze, open_cells, closed_cells
+                    changed.add(neighbour)
+
+        steps += 1
+        if steps == every:
+            steps = 0
+            yield maze, CellView(maze, open_cells), CellView(maze, closed_cells), CellView(maze, changed)
+            changed = set()
+
+    if stats is not None:
+        stats.count('expansions', context.expansions)
+        stats.lap('search')
 
     return []
 
 
-def dijkstra(maze: list[list[Cell]], start_cell: Cell, end_cell: Cell) -> list[Cell]:
+def dijkstra(maze: Grid, start_cell: Cell, end_cell: Cell, context: SearchContext = None, every: int = 1, stats: Stats = None) -> list[Cell]:
     """Dijkstra's algorithm.
 
     1. Add the start cell to the open list.
     2. While the open list is not empty.
-        1. Get the cell with the lowest g score from the open list.
+        1. Pop the cell with the lowest g score from the open list, skipping stale entries.
         2. Add the current cell to the closed list.
         3. If the current cell is the end cell, return the path.
         4. For each of the current cell's neighbours.
@@ -86,47 +181,815 @@ def dijkstra(maze: list[list[Cell]], start_cell: Cell, end_cell: Cell) -> list[C
                 3. If the neighbour is not in the open list, add it to the open list.
     3. If no path is found, return an empty path.
 
+    Moving to a neighbour costs the cost of entering it from ``Grid.costs``.
+
+    Parameters
+    ----------
+    maze : Grid
+        The maze to find the path in.
+    start_cell : Cell
+        The cell to start the path from.
+    end_cell : Cell
+        The cell to end the path at.
+    context : SearchContext, optional
+        The context to keep the scores and parents in. It is reset before
+        the search starts. A new one is created if none is given.
+    every : int, optional
+        Yield the state every this many steps, or never if it is 0. The
+        cells that changed since the previous yield are yielded with it.
+    stats : Stats, optional
+        The statistics to count the operations of the search in and to
+        time its ``setup``, ``search`` and ``path`` phases in.
+
+    Returns
+    -------
+    list[Cell]
+        The path from the start cell to the end cell.
+    """
+    if stats is not None:
+        stats.start()
+
+    width = maze.width
+    walls = maze.walls
+    costs = maze.costs
+
+    # See astar.
+    passages = maze.passages if stats is None else stats.passages(maze.passages)
+    push, pop = (heappush, heappop) if stats is None else stats.heap()
+
+    if context is None:
+        context = SearchContext(width * maze.height)
+
+    context.reset()
+
+    # See astar.
+    g_scores = context.g
+    parents = context.parent
+    reached = context.reached
+    closed = context.closed
+    generation = context.generation
+
+    open_cells = set()
+    closed_cells = set()
+    changed = set()
+    steps = 0
+
+    start = start_cell.y * width + start_cell.x
+    end = end_cell.y * width + end_cell.x
+
+    context.update(start, 0, -1)
+
+    # Entries are (g, tie, cell), see astar.
+    tie = count()
+    heap = []
+    push(heap, (0, next(tie), start))
+
+    if every:
+        open_cells.add(start)
+
+    if stats is not None:
+        stats.lap('setup')
+
+    while heap:
+        g, _, current = pop(heap)
+
+        if closed[current] == generation or g != g_scores[current]:
+            continue
+
+        closed[current] = generation
+        context.expansions += 1
+
+        if every:
+            open_cells.discard(current)
+            closed_cells.add(current)
+            changed.add(current)
+
+        if current == end:
+            if stats is not None:
+                stats.count('expansions', context.expansions)
+                stats.lap('search')
+
+            path = reconstruct_path(maze, context, end_cell)
+
+            if stats is not None:
+                stats.lap('path')
+
+            return path
+
+        for offset in passages[walls[current]]:
+            neighbour = current + offset
+
+            if closed[neighbour] == generation:
+                continue
+
+            new_g_score = g + costs[neighbour]
+
+            if reached[neighbour] != generation or new_g_score < g_scores[neighbour]:
+                g_scores[neighbour] = new_g_score
+                parents[neighbour] = current
+                reached[neighbour] = generation
+
+                push(heap, (new_g_score, next(tie), neighbour))
+
+                if every:
+                    open_cells.add(neighbour)
+                    changed.add(neighbour)
+
+        steps += 1
+        if steps == every:
+            steps = 0
+            yield maze, CellView(maze, open_cells), CellView(maze, closed_cells), CellView(maze, changed)
+            changed = set()
+
+    if stats is not None:
+        stats.count('expansions', context.expansions)
+        stats.lap('search')
+
+    return []
+
+
+def dial(maze: Grid, start_cell: Cell, end_cell: Cell, context: SearchContext = None, every: int = 1) -> list[Cell]:
+    """Dial's algorithm, Dijkstra's algorithm with a bucket queue.
+
+    1. Add the start cell to the bucket of its g score.
+    2. While a bucket is not empty.
+        1. Move on to the next bucket until one is not empty, and pop a cell from it, skipping stale entries.
+        2. Add the current cell to the closed list.
+        3. If the current cell is the end cell, return the path.
+        4. For each of the current cell's neighbours.
+            1. If the neighbour is in the closed list or it is not walkable, skip to the next neighbour.
+            2. If the neighbour is not in the open list or the new path to the neighbour is shorter than the old path.
+                1. Set the neighbour's g score to the new path's g score.
+                2. Set the neighbour's parent to the current cell.
+                3. Add the neighbour to the bucket of its new g score.
+    3. If no path is found, return an empty path.
+
+    The costs of entering the cells are small integers, so the g scores of
+    the open cells always lie between the g score of the current cell and
+    that plus the highest cost. The open list is a ring of one bucket per
+    score in that range, and popping a cell only steps to the next
+    non-empty bucket instead of sifting a heap.
+
     Parameters
     ----------
-    maze : list[list[Cell]]
+    maze : Grid
         The maze to find the path in.
     start_cell : Cell
         The cell to start the path from.
     end_cell : Cell
         The cell to end the path at.
+    context : SearchContext, optional
+        The context to keep the scores and parents in. It is reset before
+        the search starts. A new one is created if none is given.
+    every : int, optional
+        Yield the state every this many steps, or never if it is 0. The
+        cells that changed since the previous yield are yielded with it.
 
     Returns
     -------
     list[Cell]
         The path from the start cell to the end cell.
     """
+    width = maze.width
+    walls = maze.walls
+    costs = maze.costs
+    passages = maze.passages
+
+    if context is None:
+        context = SearchContext(width * maze.height)
+
+    context.reset()
+
+    # See astar.
+    g_scores = context.g
+    parents = context.parent
+    reached = context.reached
+    closed = context.closed
+    generation = context.generation
+
     open_cells = set()
     closed_cells = set()
+    changed = set()
+    steps = 0
 
-    open_cells.add(start_cell)
+    start = start_cell.y * width + start_cell.x
+    end = end_cell.y * width + end_cell.x
 
-    while len(open_cells) > 0:
-        current_cell = min(open_cells, key=lambda cell: cell.g)
+    context.update(start, 0, -1)
 
-        open_cells.remove(current_cell)
-        closed_cells.add(current_cell)
+    # The bucket of a g score is at its remainder by the size of the ring.
+    # An improved cell is added again and its old entry is skipped.
+    size = maze.max_cost() + 1
+    buckets = [[] for _ in range(size)]
+    buckets[0].append(start)
+    entries = 1
+    g = 0
 
-        if current_cell == end_cell:
-            return reconstruct_path(current_cell)
+    if every:
+        open_cells.add(start)
 
-        for neighbour in get_neighbours(maze, current_cell):
-            if neighbour in closed_cells or not are_connected(current_cell, neighbour):
+    while entries:
+        bucket = buckets[g % size]
+        while not bucket:
+            g += 1
+            bucket = buckets[g % size]
+
+        current = bucket.pop()
+        entries -= 1
+
+        if closed[current] == generation or g != g_scores[current]:
+            continue
+
+        closed[current] = generation
+        context.expansions += 1
+
+        if every:
+            open_cells.discard(current)
+            closed_cells.add(current)
+            changed.add(current)
+
+        if current == end:
+            return reconstruct_path(maze, context, end_cell)
+
+        for offset in passages[walls[current]]:
+            neighbour = current + offset
+
+            if closed[neighbour] == generation:
                 continue
-            
-            new_g_score = current_cell.g + heuristic(neighbour, current_cell)
 
-            if neighbour not in open_cells or new_g_score < neighbour.g:
-                neighbour.g = new_g_score
-                neighbour.parent = current_cell
+            new_g_score = g + costs[neighbour]
+
+            if reached[neighbour] != generation or new_g_score < g_scores[neighbour]:
+                g_scores[neighbour] = new_g_score
+                parents[neighbour] = current
+                reached[neighbour] = generation
+
+                buckets[new_g_score % size].append(neighbour)
+                entries += 1
 
-                if neighbour not in open_cells:
+                if every:
                     open_cells.add(neighbour)
+                    changed.add(neighbour)
 
-        yield maze, open_cells, closed_cells
+        steps += 1
+        if steps == every:
+            steps = 0
+            yield maze, CellView(maze, open_cells), CellView(maze, closed_cells), CellView(maze, changed)
+            changed = set()
 
     return []
+
+
+def bidirectional_astar(
+    maze: Grid,
+    start_cell: Cell,
+    end_cell: Cell,
+    context: SearchContext = None,
+    every: int = 1,
+    reverse_context: SearchContext = None,
+) -> list[Cell]:
+    """Bidirectional A* pathfinding algorithm.
+
+    1. Run A* from the start cell towards the end cell and from the end cell towards the start cell, with balanced heuristics.
+    2. While both open lists are not empty.
+        1. Expand the cell with the lowest f score of the direction with fewer open cells.
+        2. Whenever a neighbour has been reached from the other direction, remember the path through it if it is the shortest so far.
+        3. Stop once the lowest f scores of both directions add up to at least the shortest path found.
+    3. Join the two halves of the shortest path, or return an empty path if none was found.
+
+    Parameters
+    ----------
+    maze : Grid
+        The maze to find the path in.
+    start_cell : Cell
+        The cell to start the path from.
+    end_cell : Cell
+        The cell to end the path at.
+    context : SearchContext, optional
+        The context of the forward search. The expansions of both
+        directions are counted in it.
+    every : int, optional
+        Yield the state every this many steps, or never if it is 0. The
+        cells that changed since the previous yield are yielded with it.
+    reverse_context : SearchContext, optional
+        The context of the backward search, the companion of ``context``
+        if none is given.
+
+    Returns
+    -------
+    list[Cell]
+        The path from the start cell to the end cell.
+    """
+    return _bidirectional(maze, start_cell, end_cell, context, reverse_context, every, True)
+
+
+def bidirectional_dijkstra(
+    maze: Grid,
+    start_cell: Cell,
+    end_cell: Cell,
+    context: SearchContext = None,
+    every: int = 1,
+    reverse_context: SearchContext = None,
+) -> list[Cell]:
+    """Bidirectional Dijkstra's algorithm.
+
+    1. Run Dijkstra's algorithm from the start cell and from the end cell.
+    2. While both open lists are not empty.
+        1. Expand the cell with the lowest g score of the direction with fewer open cells.
+        2. Whenever a neighbour has been reached from the other direction, remember the path through it if it is the shortest so far.
+        3. Stop once the lowest g scores of both directions add up to at least the shortest path found.
+    3. Join the two halves of the shortest path, or return an empty path if none was found.
+
+    Parameters
+    ----------
+    maze : Grid
+        The maze to find the path in.
+    start_cell : Cell
+        The cell to start the path from.
+    end_cell : Cell
+        The cell to end the path at.
+    context : SearchContext, optional
+        The context of the forward search. The expansions of both
+        directions are counted in it.
+    every : int, optional
+        Yield the state every this many steps, or never if it is 0. The
+        cells that changed since the previous yield are yielded with it.
+    reverse_context : SearchContext, optional
+        The context of the backward search, the companion of ``context``
+        if none is given.
+
+    Returns
+    -------
+    list[Cell]
+        The path from the start cell to the end cell.
+    """
+    return _bidirectional(maze, start_cell, end_cell, context, reverse_context, every, False)
+
+
+def _bidirectional(
+    maze: Grid,
+    start_cell: Cell,
+    end_cell: Cell,
+    context: SearchContext,
+    reverse_context: SearchContext,
+    every: int,
+    informed: bool,
+) -> list[Cell]:
+    """Search from both ends of the path at once.
+
+    With ``informed`` set, both directions are A* searches with balanced
+    potentials: half the distance to the end cell minus half the distance
+    to the start cell forwards, and its opposite backwards. Both then
+    search the same graph with reduced costs, like bidirectional
+    Dijkstra, so the search can stop once the lowest keys of both
+    directions add up to the shortest path found. A heuristic of its own
+    per direction would only let it stop once either frontier reaches the
+    other end, after sweeping most of a maze. Without ``informed`` the
+    potentials are 0. The keys are doubled to keep them integers.
+
+    The direction with fewer cells open is expanded, which keeps the two
+    frontiers about the same size.
+
+    The backward search walks the moves of the path the other way round,
+    so its step from a cell to a neighbour costs the cost of entering the
+    cell it leaves.
+    """
+    width = maze.width
+    walls = maze.walls
+    costs = maze.costs
+    passages = maze.passages
+    scale = maze.min_cost() if informed else 0
+
+    if context is None:
+        context = SearchContext(width * maze.height)
+    if reverse_context is None:
+        reverse_context = context.companion()
+
+    context.reset()
+    reverse_context.reset()
+
+    open_cells = set()
+    closed_cells = set()
+    changed = set()
+    steps = 0
+
+    start = start_cell.y * width + start_cell.x
+    end = end_cell.y * width + end_cell.x
+
+    def p(index: int) -> int:
+        x, y = index % width, index // width
+        return (abs(x - end_cell.x) + abs(y - end_cell.y) - abs(x - start_cell.x) - abs(y - start_cell.y)) * scale
+
+    # Each direction is (context, heap, sign of its potential, other
+    # context), and the cells each has open and not closed are counted.
+    tie = count()
+    forward = (context, [], 1, reverse_context)
+    backward = (reverse_context, [], -1, context)
+    live = {context: 1, reverse_context: 1}
+
+    for (search, heap, sign, _), root in ((forward, start), (backward, end)):
+        search.update(root, 0, -1)
+        heappush(heap, (sign * p(root), sign * p(root), next(tie), root))
+
+        if every:
+            open_cells.add(root)
+
+    # The shortest path found so far goes from the start cell to
+    # meeting[0], then to its neighbour meeting[1] and on to the end cell.
+    best = 0 if start == end else float('inf')
+    meeting = (start, end)
+
+    while forward[1] and backward[1]:
+        for search, heap, _, _ in (forward, backward):
+            while heap:
+                key, potential, _, index = heap[0]
+                if not search.is_closed(index) and key - potential == 2 * search.g[index]:
+                    break
+                heappop(heap)
+
+        if not forward[1] or not backward[1]:
+            break
+
+        if forward[1][0][0] + backward[1][0][0] >= 2 * best:
+            break
+
+        direction = forward if live[context] <= live[reverse_context] else backward
+        search, heap, sign, other = direction
+
+        _, _, _, current = heappop(heap)
+
+        search.close(current)
+        live[search] -= 1
+        if search is reverse_context:
+            context.expansions += 1
+
+        if every:
+            open_cells.discard(current)
+            closed_cells.add(current)
+            changed.add(current)
+
+        g = search.g[current]
+        is_forward = direction is forward
+
+        for offset in passages[walls[current]]:
+            neighbour = current + offset
+            new_g_score = g + (costs[neighbour] if is_forward else costs[current])
+
+            if other.is_open(neighbour) and new_g_score + other.g[neighbour] < best:
+                best = new_g_score + other.g[neighbour]
+                meeting = (current, neighbour) if is_forward else (neighbour, current)
+
+            if search.is_closed(neighbour):
+                continue
+
+            if not search.is_open(neighbour) or new_g_score < search.g[neighbour]:
+                if not search.is_open(neighbour):
+                    live[search] += 1
+
+                search.update(neighbour, new_g_score, current)
+                potential = sign * p(neighbour)
+                heappush(heap, (2 * new_g_score + potential, potential, next(tie), neighbour))
+
+                if every:
+                    if neighbour not in closed_cells:
+                        open_cells.add(neighbour)
+                    changed.add(neighbour)
+
+        steps += 1
+        if steps == every:
+            steps = 0
+            yield maze, CellView(maze, open_cells), CellView(maze, closed_cells), CellView(maze, changed)
+            changed = set()
+
+    if best == float('inf'):
+        return []
+
+    if start == end:
+        path = [start]
+    else:
+        path = context.path(meeting[0]) + reverse_context.path(meeting[1])[::-1]
+
+    return [maze.cell(index) for index in path]
+
+
+def contracted_astar(maze: Grid, start_cell: Cell, end_cell: Cell, context: SearchContext = None, every: int = 1) -> list[Cell]:
+    """A* over the contracted corridors of a maze.
+
+    1. Contract every corridor of the maze into a single edge between junctions and dead ends.
+    2. Follow the corridors around the start and end cells to the nodes at their ends.
+    3. Run A* over the nodes, remembering the cheapest path to the end cell found through any node at the end of its corridor.
+    4. Stop once the lowest f score is not lower than the shortest path found.
+    5. Expand the corridors of the shortest path back into cells, or return an empty path if none was found.
+
+    Parameters
+    ----------
+    maze : Grid
+        The maze to find the path in.
+    start_cell : Cell
+        The cell to start the path from.
+    end_cell : Cell
+        The cell to end the path at.
+    context : SearchContext, optional
+        The context to keep the scores and parents in. It is reset before
+        the search starts. A new one is created if none is given.
+    every : int, optional
+        Yield the state every this many steps, or never if it is 0. The
+        cells that changed since the previous yield are yielded with it.
+
+    Returns
+    -------
+    list[Cell]
+        The path from the start cell to the end cell.
+    """
+    graph = ContractedGraph.of(maze)
+    width = maze.width
+
+    if context is None:
+        context = SearchContext(width * maze.height)
+
+    context.reset()
+
+    open_cells = set()
+    closed_cells = set()
+    changed = set()
+    steps = 0
+
+    start = start_cell.y * width + start_cell.x
+    end = end_cell.y * width + end_cell.x
+
+    scale = maze.min_cost()
+
+    def h(index: int) -> int:
+        return (abs(index % width - end_cell.x) + abs(index // width - end_cell.y)) * scale
+
+    tie = count()
+    heap = []
+
+    best = 0 if start == end else float('inf')
+    best_node = None
+    direct = [start]
+
+    context.update(start, 0, -1)
+
+    # The corridors from the start cell lead to the first nodes of the
+    # search, or straight to the end cell.
+    if graph.is_node(start):
+        heappush(heap, (h(start), h(start), next(tie), start))
+    else:
+        for cells in graph.corridors(start, {end}):
+            node = cells[-1]
+            cost = graph.cost(cells)
+            if node == end and cost < best:
+                best = cost
+                direct = [start] + cells
+            elif node != start and node != end and (not context.is_open(node) or cost < context.g[node]):
+                context.update(node, cost, cells[-2] if len(cells) > 1 else start)
+                heappush(heap, (cost + h(node), h(node), next(tie), node))
+
+    # The corridors from the end cell tell how much it costs to reach it
+    # from each node, as (cost, cells). They are walked from the end cell,
+    # so the cost counts the end cell instead of the node.
+    targets = {}
+    if graph.is_node(end):
+        targets[end] = (0, [])
+    else:
+        for cells in graph.corridors(end):
+            cost = graph.cost(cells[:-1]) + maze.costs[end]
+            if cells[-1] not in targets or cost < targets[cells[-1]][0]:
+                targets[cells[-1]] = (cost, cells)
+
+    if every:
+        open_cells.update(node for _, _, _, node in heap)
+
+    while heap and heap[0][0] < best:
+        f, h_score, _, current = heappop(heap)
+
+        if context.is_closed(current) or f - h_score != context.g[current]:
+            continue
+
+        context.close(current)
+
+        if every:
+            open_cells.discard(current)
+            closed_cells.add(current)
+            changed.add(current)
+
+        g = context.g[current]
+
+        if current in targets and g + targets[current][0] < best:
+            best = g + targets[current][0]
+            best_node = current
+
+        for node, cost, last in graph.edges[current]:
+            new_g_score = g + cost
+
+            if context.is_closed(node):
+                continue
+
+            if not context.is_open(node) or new_g_score < context.g[node]:
+                context.update(node, new_g_score, last)
+                heappush(heap, (new_g_score + h(node), h(node), next(tie), node))
+
+                if every:
+                    open_cells.add(node)
+                    changed.add(node)
+
+        steps += 1
+        if steps == every:
+            steps = 0
+            yield maze, CellView(maze, open_cells), CellView(maze, closed_cells), CellView(maze, changed)
+            changed = set()
+
+    if best == float('inf'):
+        return []
+
+    if best_node is None:
+        return [maze.cell(index) for index in direct]
+
+    # Follow the parents back to the start cell, walking every corridor
+    # between two nodes.
+    path = []
+    current = best_node
+
+    while current != start:
+        path.append(current)
+        parent = context.parent[current]
+
+        if parent == start or graph.is_node(parent):
+            current = parent
+        else:
+            cells = graph.walk(current, parent, {start})
+            path.extend(cells[:-1])
+            current = cells[-1]
+
+    path.append(start)
+    path.reverse()
+
+    if best_node != end:
+        path.extend(targets[best_node][1][-2::-1])
+        path.append(end)
+
+    return [maze.cell(index) for index in path]
+
+
+def jump_point_search(maze: Grid, start_cell: Cell, end_cell: Cell, context: SearchContext = None, every: int = 1) -> list[Cell]:
+    """Jump Point Search.
+
+    1. Add the start cell to the open list.
+    2. While the open list is not empty.
+        1. Pop the cell with the lowest f score from the open list.
+        2. If the current cell is the end cell, return the path.
+        3. For each direction worth following from the current cell.
+            1. Jump in that direction, skipping every cell that has no forced neighbour.
+            2. Add the jump point found, if any, to the open list like A* would add a neighbour.
+    3. If no path is found, return an empty path.
+
+    Moving horizontally, a jump stops at the end cell or at a cell with a
+    forced vertical neighbour, one that cannot be reached as cheaply
+    through the previous cell. Moving vertically, a jump also stops at any
+    cell from which a horizontal jump finds a jump point. Only the jump
+    points are expanded, which prunes most of the cells of open areas.
+
+    Skipping cells is only sound when every cell costs the same, so a maze
+    with weighted cells is searched with ``astar`` instead.
+
+    Parameters
+    ----------
+    maze : Grid
+        The maze to find the path in.
+    start_cell : Cell
+        The cell to start the path from.
+    end_cell : Cell
+        The cell to end the path at.
+    context : SearchContext, optional
+        The context to keep the scores and parents in. It is reset before
+        the search starts. A new one is created if none is given.
+    every : int, optional
+        Yield the state every this many steps, or never if it is 0. The
+        cells that changed since the previous yield are yielded with it.
+
+    Returns
+    -------
+    list[Cell]
+        The path from the start cell to the end cell.
+    """
+    if maze.min_cost() != maze.max_cost():
+        return (yield from astar(maze, start_cell, end_cell, context, every))
+
+    width = maze.width
+    walls = maze.walls
+
+    if context is None:
+        context = SearchContext(width * maze.height)
+
+    context.reset()
+
+    open_cells = set()
+    closed_cells = set()
+    changed = set()
+    steps = 0
+
+    start = start_cell.y * width + start_cell.x
+    end = end_cell.y * width + end_cell.x
+
+    horizontal = ((EAST, 1), (WEST, -1))
+    vertical = ((NORTH, -width), (SOUTH, width))
+
+    def h(index: int) -> int:
+        return abs(index % width - end_cell.x) + abs(index // width - end_cell.y)
+
+    def jump(current: int, bit: int, delta: int) -> int:
+        """Jump from a cell in a direction and return the jump point, or -1."""
+        sides = vertical if bit in (EAST, WEST) else horizontal
+
+        while not walls[current] & bit:
+            previous, current = current, current + delta
+
+            if current == end:
+                return current
+
+            for side_bit, side_delta in sides:
+                if not walls[current] & side_bit and (walls[previous] & side_bit or walls[previous + side_delta] & bit):
+                    return current
+
+            if sides is horizontal and (jump(current, EAST, 1) >= 0 or jump(current, WEST, -1) >= 0):
+                return current
+
+        return -1
+
+    context.update(start, 0, -1)
+
+    tie = count()
+    heap = [(h(start), h(start), next(tie), start)]
+
+    if every:
+        open_cells.add(start)
+
+    while heap:
+        f, h_score, _, current = heappop(heap)
+
+        if context.is_closed(current) or f - h_score != context.g[current]:
+            continue
+
+        context.close(current)
+
+        if every:
+            open_cells.discard(current)
+            closed_cells.add(current)
+            changed.add(current)
+
+        if current == end:
+            break
+
+        parent = context.parent[current]
+
+        if parent < 0:
+            directions = horizontal + vertical
+        elif parent // width == current // width:
+            forward = horizontal[0] if current > parent else horizontal[1]
+            directions = (forward,) + vertical
+        else:
+            forward = vertical[1] if current > parent else vertical[0]
+            directions = (forward,) + horizontal
+
+        for bit, delta in directions:
+            if walls[current] & bit:
+                continue
+
+            point = jump(current, bit, delta)
+
+            if point < 0 or context.is_closed(point):
+                continue
+
+            new_g_score = context.g[current] + abs(point % width - current % width) + abs(point // width - current // width)
+
+            if not context.is_open(point) or new_g_score < context.g[point]:
+                context.update(point, new_g_score, current)
+                heappush(heap, (new_g_score + h(point), h(point), next(tie), point))
+
+                if every:
+                    open_cells.add(point)
+                    changed.add(point)
+
+        steps += 1
+        if steps == every:
+            steps = 0
+            yield maze, CellView(maze, open_cells), CellView(maze, closed_cells), CellView(maze, changed)
+            changed = set()
+    else:
+        return []
+
+    # Fill in the straight lines between consecutive jump points.
+    path = [end]
+    current = end
+
+    while context.parent[current] >= 0:
+        parent = context.parent[current]
+        delta = 1 if parent // width == current // width else width
+        if parent > current:
+            delta = -delta
+        while current != parent:
+            current -= delta
+            path.append(current)
+
+    return [maze.cell(index) for index in path[::-1]]
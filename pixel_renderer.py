@@ -0,0 +1,152 @@
+import struct
+import zlib
+import numpy as np
+from cell import Cell
+from colours import BLACK, WHITE, RED, GREEN, BLUE, YELLOW, CYAN, PINK, GREY
+from grid import Grid, NORTH, SOUTH, EAST, WEST, ALL_WALLS
+
+
+EMPTY = 0
+CLOSED = 1
+OPEN = 2
+PATH = 3
+SPECIAL = 4
+END = 5
+START = 6
+WALLED = 7
+
+PALETTE = np.array(
+    [[(colour >> 16) & 0xFF, (colour >> 8) & 0xFF, colour & 0xFF] for colour in (WHITE, BLUE, CYAN, YELLOW, PINK, GREEN, RED, GREY)],
+    dtype=np.uint8,
+)
+
+WALL_COLOUR = np.array([(BLACK >> 16) & 0xFF, (BLACK >> 8) & 0xFF, BLACK & 0xFF], dtype=np.uint8)
+
+
+def cell_states(
+    maze: Grid,
+    start_cell: Cell = None,
+    end_cell: Cell = None,
+    path: list[Cell] = [],
+    special_cells: set[Cell] = set(),
+    open_cells: set[Cell] = set(),
+    closed_cells: set[Cell] = set(),
+) -> np.ndarray:
+    """Get the state of every cell of a maze.
+
+    The states use the same priorities as ``main.draw_maze``, so a start
+    cell that is also closed is drawn as the start cell.
+
+    Parameters
+    ----------
+    maze : Grid
+        The maze the cells belong to.
+    start_cell : Cell, optional
+        The start cell.
+    end_cell : Cell, optional
+        The end cell.
+    path : list[Cell], optional
+        The cells on the path.
+    special_cells : set[Cell], optional
+        The special cells.
+    open_cells : set[Cell], optional
+        The open cells.
+    closed_cells : set[Cell], optional
+        The closed cells.
+
+    Returns
+    -------
+    np.ndarray
+        A ``(height, width)`` array with the state of every cell.
+    """
+    states = np.zeros(maze.width * maze.height, dtype=np.uint8)
+
+    for state, cells in ((CLOSED, closed_cells), (OPEN, open_cells), (PATH, path), (SPECIAL, special_cells)):
+        indices = np.fromiter((cell.y * maze.width + cell.x for cell in cells), dtype=np.int64)
+        states[indices] = state
+
+    if end_cell:
+        states[end_cell.y * maze.width + end_cell.x] = END
+    if start_cell:
+        states[start_cell.y * maze.width + start_cell.x] = START
+
+    return states.reshape(maze.height, maze.width)
+
+
+def render(maze: Grid, states: np.ndarray = None, size: int = 4) -> np.ndarray:
+    """Render a maze to an RGB pixel buffer.
+
+    The whole frame is built with array operations straight from the wall
+    masks of the maze, so the cost does not depend on a per-cell draw
+    call.
+
+    Parameters
+    ----------
+    maze : Grid
+        The maze to render.
+    states : np.ndarray, optional
+        The state of every cell, as returned by ``cell_states``.
+    size : int, optional
+        The size of a cell in pixels.
+
+    Returns
+    -------
+    np.ndarray
+        A ``(height * size, width * size, 3)`` array of pixels.
+    """
+    height, width = maze.height, maze.width
+
+    walls = np.frombuffer(bytes(maze.walls), dtype=np.uint8).reshape(height, width)
+
+    if states is None:
+        states = np.zeros((height, width), dtype=np.uint8)
+
+    states = np.where((states == EMPTY) & (walls == ALL_WALLS), WALLED, states)
+
+    cells = np.empty((height, size, width, size, 3), dtype=np.uint8)
+    cells[...] = PALETTE[states][:, None, :, None]
+
+    # A cell owns the top row and the left column of its pixels. The south
+    # and east walls of a cell are drawn there by its neighbours.
+    north = (walls & NORTH) != 0
+    north[1:] |= (walls[:-1] & SOUTH) != 0
+    west = (walls & WEST) != 0
+    west[:, 1:] |= (walls[:, :-1] & EAST) != 0
+
+    corner = north | west
+    corner[:, 1:] |= north[:, :-1]
+    corner[1:] |= west[:-1]
+
+    cells[:, 0, :, :][north] = WALL_COLOUR
+    cells[:, :, :, 0].transpose(0, 2, 1, 3)[west] = WALL_COLOUR
+    cells[:, 0, :, 0][corner] = WALL_COLOUR
+
+    return cells.reshape(height * size, width * size, 3)
+
+
+def save_png(frame: np.ndarray, filename: str) -> None:
+    """Save a frame as a PNG image.
+
+    This does not need pygame or a display, so frames can be written on
+    headless machines.
+
+    Parameters
+    ----------
+    frame : np.ndarray
+        The ``(height, width, 3)`` array of pixels to save.
+    filename : str
+        The file to write the image to.
+    """
+    height, width, _ = frame.shape
+
+    rows = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    rows[:, 1:] = frame.reshape(height, width * 3)
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    with open(filename, 'wb') as file:
+        file.write(b'\x89PNG\r\n\x1a\n')
+        file.write(chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+        file.write(chunk(b'IDAT', zlib.compress(rows.tobytes(), 6)))
+        file.write(chunk(b'IEND', b''))
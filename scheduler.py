@@ -0,0 +1,98 @@
+STEPS = 'steps'
+BUDGET = 'budget'
+INSTANT = 'instant'
+
+
+class StepScheduler:
+    """Decide how many steps of an algorithm to run per frame.
+
+    The scheduler has three modes:
+
+    - ``STEPS`` runs a fixed number of steps per frame.
+    - ``BUDGET`` runs steps until a time budget per frame is spent.
+    - ``INSTANT`` runs the algorithm to completion in a single frame.
+
+    The steps are run by a ``worker.AlgorithmWorker``, which the render
+    loop gives the allowance and the budget of the scheduler every frame.
+    In ``INSTANT`` mode no worker is started, the algorithm is run with
+    its ``run`` method instead.
+
+    Attributes
+    ----------
+    mode : str
+        The current mode.
+    steps_per_frame : int
+        The number of steps per frame in ``STEPS`` mode.
+    time_budget : float
+        The time in seconds spent per frame in ``BUDGET`` mode.
+    allowance : int
+        The number of steps a worker may run per frame in ``STEPS`` mode,
+        None in the other modes. See ``worker.AlgorithmWorker.allow``.
+    budget : float
+        The time in seconds a worker may run per frame in ``BUDGET`` mode,
+        None in the other modes.
+
+    Methods
+    -------
+    faster()
+        Double the number of steps per frame.
+    slower()
+        Halve the number of steps per frame.
+    toggle(mode: str)
+        Switch to a mode, or back to ``STEPS`` if it is already active.
+    """
+
+    MAX_STEPS_PER_FRAME = 2 ** 20
+
+    def __init__(self, steps_per_frame: int = 1, time_budget: float = 0.012) -> None:
+        """Initialize a scheduler.
+
+        Parameters
+        ----------
+        steps_per_frame : int, optional
+            The number of steps per frame in ``STEPS`` mode.
+        time_budget : float, optional
+            The time in seconds spent per frame in ``BUDGET`` mode.
+        """
+        self.mode = STEPS
+        self.steps_per_frame = steps_per_frame
+        self.time_budget = time_budget
+
+    @property
+    def allowance(self) -> int:
+        """The number of steps a worker may run per frame."""
+        return self.steps_per_frame if self.mode == STEPS else None
+
+    @property
+    def budget(self) -> float:
+        """The time in seconds a worker may run per frame."""
+        return self.time_budget if self.mode == BUDGET else None
+
+    def faster(self) -> None:
+        """Double the number of steps per frame."""
+        self.mode = STEPS
+        self.steps_per_frame = min(self.steps_per_frame * 2, self.MAX_STEPS_PER_FRAME)
+
+    def slower(self) -> None:
+        """Halve the number of steps per frame."""
+        self.mode = STEPS
+        self.steps_per_frame = max(self.steps_per_frame // 2, 1)
+
+    def toggle(self, mode: str) -> None:
+        """Switch to a mode, or back to ``STEPS`` if it is already active.
+
+        Parameters
+        ----------
+        mode : str
+            The mode to switch to.
+        """
+        self.mode = STEPS if self.mode == mode else mode
+
+    def __str__(self) -> str:
+        """Describe the current speed."""
+        if self.mode == STEPS:
+            return f'{self.steps_per_frame} steps/frame'
+        elif self.mode == BUDGET:
+            return f'{self.time_budget * 1000:.0f} ms/frame'
+        else:
+            return 'instant'
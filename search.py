@@ -0,0 +1,177 @@
+from array import array
+
+
+class SearchContext:
+    """The state of a single search.
+
+    This class holds the g scores, parents and visited flags of a search
+    in dense arrays indexed like a ``Grid``, so the cells of the maze are
+    never written to. Every entry is stamped with the generation it was
+    written in and ``reset`` only bumps the generation, which makes
+    starting a new search O(1) however large the maze is. Two searches
+    can run on the same maze at once as long as each has its own context.
+    The bidirectional searches run their backward search in the
+    ``companion`` of the context they are given, so it is reused with it.
+
+    Attributes
+    ----------
+    size : int
+        The number of cells the context can hold.
+    generation : int
+        The generation of the current search.
+    g : array
+        Cost of the path from the start cell to every cell.
+    parent : array
+        The index of the parent of every cell, -1 for the start cell.
+    expansions : int
+        The number of cells closed by the current search.
+
+    Methods
+    -------
+    reset()
+        Forget the current search.
+    companion()
+        Get the context of a second search run alongside this one.
+    is_open(index: int)
+        Check if a cell has been reached by the current search.
+    is_closed(index: int)
+        Check if a cell has been expanded by the current search.
+    update(index: int, g: int, parent: int)
+        Set the g score and parent of a cell.
+    close(index: int)
+        Mark a cell as expanded.
+    path(index: int)
+        Get the indices of the path from the start cell to a cell.
+    """
+
+    MAX_GENERATION = 2 ** 32 - 1
+
+    def __init__(self, size: int) -> None:
+        """Initialize an empty context.
+
+        Parameters
+        ----------
+        size : int
+            The number of cells the context can hold.
+        """
+        self.size = size
+        self.generation = 1
+        self.expansions = 0
+
+        self.g = array('i', bytes(4 * size))
+        self.parent = array('i', bytes(4 * size))
+
+        self.reached = array('I', bytes(4 * size))
+        self.closed = array('I', bytes(4 * size))
+
+        self._companion = None
+
+    def reset(self) -> None:
+        """Forget the current search.
+
+        The arrays are only cleared when the generation counter wraps
+        around, which happens once every four billion searches.
+        """
+        self.expansions = 0
+
+        if self.generation == self.MAX_GENERATION:
+            self.reached = array('I', bytes(4 * self.size))
+            self.closed = array('I', bytes(4 * self.size))
+            self.generation = 1
+        else:
+            self.generation += 1
+
+    def companion(self) -> 'SearchContext':
+        """Get the context of a second search run alongside this one.
+
+        It is created the first time it is needed and kept with this
+        context, so reusing this context reuses it too.
+
+        Returns
+        -------
+        SearchContext
+            A context of the same size, which is never this one.
+        """
+        if self._companion is None:
+            self._companion = SearchContext(self.size)
+
+        return self._companion
+
+    def is_open(self, index: int) -> bool:
+        """Check if a cell has been reached by the current search.
+
+        Parameters
+        ----------
+        index : int
+            The index of the cell.
+
+        Returns
+        -------
+        bool
+            True if the cell has a g score, False otherwise.
+        """
+        return self.reached[index] == self.generation
+
+    def is_closed(self, index: int) -> bool:
+        """Check if a cell has been expanded by the current search.
+
+        Parameters
+        ----------
+        index : int
+            The index of the cell.
+
+        Returns
+        -------
+        bool
+            True if the cell is closed, False otherwise.
+        """
+        return self.closed[index] == self.generation
+
+    def update(self, index: int, g: int, parent: int) -> None:
+        """Set the g score and parent of a cell.
+
+        Parameters
+        ----------
+        index : int
+            The index of the cell.
+        g : int
+            Cost of the path from the start cell.
+        parent : int
+            The index of the parent cell, -1 for the start cell.
+        """
+        self.g[index] = g
+        self.parent[index] = parent
+        self.reached[index] = self.generation
+
+    def close(self, index: int) -> None:
+        """Mark a cell as expanded.
+
+        Parameters
+        ----------
+        index : int
+            The index of the cell.
+        """
+        self.closed[index] = self.generation
+        self.expansions += 1
+
+    def path(self, index: int) -> list[int]:
+        """Get the indices of the path from the start cell to a cell.
+
+        Parameters
+        ----------
+        index : int
+            The index of the last cell of the path.
+
+        Returns
+        -------
+        list[int]
+            The indices of the cells on the path, starting from the
+            start cell.
+        """
+        path = []
+
+        while index >= 0:
+            path.append(index)
+            index = self.parent[index]
+
+        return path[::-1]
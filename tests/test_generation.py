@@ -0,0 +1,65 @@
+import pytest
+from algorithm import MazeGenerationAlgorithm
+from helpers import run_to_completion
+from grid import Grid
+
+
+SIZES = [(1, 1), (25, 15), (40, 1), (1, 30), (60, 40)]
+
+SEEDS = [0, 1, 2]
+
+
+def reachable(maze: Grid, source: int) -> int:
+    """Count the cells that can be reached from a cell."""
+    seen = {source}
+    frontier = [source]
+
+    while frontier:
+        index = frontier.pop()
+
+        for offset in maze.passages[maze.walls[index]]:
+            if index + offset not in seen:
+                seen.add(index + offset)
+                frontier.append(index + offset)
+
+    return len(seen)
+
+
+def check_perfect(maze: Grid) -> None:
+    """Check that a maze is a spanning tree of its grid, walled all around."""
+    cells = maze.width * maze.height
+    passages = sum(len(maze.passages[mask]) for mask in maze.walls) // 2
+
+    assert passages == cells - 1
+    assert reachable(maze, 0) == cells
+
+    for index, mask in enumerate(maze.walls):
+        for offset in maze.passages[mask]:
+            assert index + offset in maze.neighbours(index)
+
+
+@pytest.mark.parametrize('generator', MazeGenerationAlgorithm, ids=lambda generator: generator.name.lower())
+@pytest.mark.parametrize('width, height', SIZES)
+@pytest.mark.parametrize('seed', SEEDS)
+def test_perfect(generator, width, height, seed):
+    check_perfect(generator.run(width, height, seed=seed))
+
+
+@pytest.mark.parametrize('generator', MazeGenerationAlgorithm, ids=lambda generator: generator.name.lower())
+def test_seeded(generator):
+    assert bytes(generator.run(30, 20, seed=5).walls) == bytes(generator.run(30, 20, seed=5).walls)
+
+
+@pytest.mark.parametrize('generator', MazeGenerationAlgorithm, ids=lambda generator: generator.name.lower())
+def test_animation_changes(generator):
+    # Every cell the animation shows as special, or stops showing, is in
+    # the cells it reports as changed.
+    shown = set()
+    algorithm = generator.animate(30, 20, seed=3)
+
+    for _, special, changed in algorithm:
+        special = set(special)
+        assert special ^ shown <= set(changed)
+        shown = special
+
+    assert bytes(run_to_completion(generator.animate(30, 20, seed=3)).walls) == bytes(generator.run(30, 20, seed=3).walls)
@@ -0,0 +1,117 @@
+import heapq
+import random
+import pytest
+from algorithm import MazeGenerationAlgorithm, PathFindingAlgorithm
+from grid import Grid, CellView
+from helpers import run_to_completion
+from search import SearchContext
+
+
+# The share of the cells with an extra wall carved, so the mazes have
+# loops and more than one path between two cells.
+LOOPS = 0.1
+
+QUERIES = 20
+
+
+def maze_with_loops(width: int, height: int, seed: int, weighted: bool) -> Grid:
+    """Generate a maze with loops, with random costs if weighted."""
+    rng = random.Random(seed)
+    maze = MazeGenerationAlgorithm.DFS.run(width, height, seed=seed)
+
+    for index in range(width * height):
+        if rng.random() < LOOPS:
+            maze.carve(index, rng.choice(maze.neighbours(index)))
+
+        if weighted and rng.random() < 0.3:
+            maze.set_cost(index, rng.randint(2, 9))
+
+    return maze
+
+
+def reference_costs(maze: Grid, source: int) -> list[int]:
+    """Get the cost of the cheapest path from a cell to every cell."""
+    costs = [None] * (maze.width * maze.height)
+    heap = [(0, source)]
+
+    while heap:
+        cost, index = heapq.heappop(heap)
+
+        if costs[index] is not None:
+            continue
+
+        costs[index] = cost
+
+        for offset in maze.passages[maze.walls[index]]:
+            if costs[index + offset] is None:
+                heapq.heappush(heap, (cost + maze.costs[index + offset], index + offset))
+
+    return costs
+
+
+def path_cost(maze: Grid, path: list) -> int:
+    """Get the cost of a path, checking that every step follows a passage."""
+    indices = [maze.index(cell.x, cell.y) for cell in path]
+
+    for index, following in zip(indices, indices[1:]):
+        assert following - index in maze.passages[maze.walls[index]]
+
+    return sum(maze.costs[index] for index in indices[1:])
+
+
+def queries(maze: Grid, seed: int) -> list[tuple[int, int]]:
+    """Get the corner to corner query and random ones."""
+    rng = random.Random(seed)
+    cells = maze.width * maze.height
+
+    return [(0, cells - 1)] + [(rng.randrange(cells), rng.randrange(cells)) for _ in range(QUERIES)]
+
+
+@pytest.mark.parametrize('solver', PathFindingAlgorithm, ids=lambda solver: solver.name.lower())
+@pytest.mark.parametrize('weighted', [False, True], ids=['unweighted', 'weighted'])
+@pytest.mark.parametrize('seed', [0, 1])
+def test_cheapest_path(solver, weighted, seed):
+    maze = maze_with_loops(40, 30, seed, weighted)
+    context = SearchContext(maze.width * maze.height)
+
+    # The context is reused, like PathCache and the batch runner do.
+    for start, end in queries(maze, seed):
+        path = solver.run(maze, maze.cell(start), maze.cell(end), context)
+
+        assert (path[0].x, path[0].y) == (start % maze.width, start // maze.width)
+        assert (path[-1].x, path[-1].y) == (end % maze.width, end // maze.width)
+        assert path_cost(maze, path) == reference_costs(maze, start)[end]
+
+
+@pytest.mark.parametrize('solver', PathFindingAlgorithm, ids=lambda solver: solver.name.lower())
+def test_no_path(solver):
+    maze = maze_with_loops(20, 10, 0, True)
+
+    # Walling in the end cell leaves no path to it.
+    end = maze.width * maze.height - 1
+    for neighbour in maze.neighbours(end):
+        maze.add_wall(end, neighbour)
+
+    assert solver.run(maze, maze.cell(0), maze.cell(end)) == []
+
+
+@pytest.mark.parametrize('solver', PathFindingAlgorithm, ids=lambda solver: solver.name.lower())
+def test_animation(solver):
+    maze = maze_with_loops(30, 20, 2, True)
+    start, end = maze.cell(0), maze.cell(maze.width * maze.height - 1)
+
+    assert run_to_completion(solver.animate(maze, start, end)) == solver.run(maze, start, end)
+
+
+@pytest.mark.parametrize('solver', PathFindingAlgorithm, ids=lambda solver: solver.name.lower())
+def test_yielded_state(solver):
+    # Unweighted, so Jump Point Search does not fall back to A*.
+    maze = maze_with_loops(30, 20, 2, False)
+    start, end = maze.cell(0), maze.cell(maze.width * maze.height - 1)
+
+    states = list(solver.animate(maze, start, end))
+
+    assert states
+    for _, open_cells, closed_cells, changed in states:
+        assert all(isinstance(cells, CellView) for cells in (open_cells, closed_cells, changed))
+    assert len(states[-1][2]) > 0
@@ -0,0 +1,35 @@
+import argparse
+import json
+from benchmarks.suite import compare
+
+
+def write_results(path, timings: dict) -> str:
+    """Write a result file with some timings."""
+    path.write_text(json.dumps({'timings': timings}))
+    return str(path)
+
+
+def run_compare(tmp_path, baseline: dict, current: dict, threshold: float = 0.2) -> int:
+    """Compare two sets of timings."""
+    args = argparse.Namespace(
+        baseline=write_results(tmp_path / 'baseline.json', baseline),
+        current=write_results(tmp_path / 'current.json', current),
+        threshold=threshold,
+    )
+    return compare(args)
+
+
+def test_compare_same(tmp_path):
+    assert run_compare(tmp_path, {'solve/astar/25x15': 1.0}, {'solve/astar/25x15': 1.1}) == 0
+
+
+def test_compare_slower(tmp_path):
+    assert run_compare(tmp_path, {'solve/astar/25x15': 1.0}, {'solve/astar/25x15': 1.5}) == 1
+
+
+def test_compare_new(tmp_path):
+    assert run_compare(tmp_path, {'solve/astar/25x15': 1.0}, {'solve/astar/25x15': 1.0, 'solve/dial/25x15': 1.0}) == 0
+
+
+def test_compare_missing(tmp_path):
+    assert run_compare(tmp_path, {'solve/astar/25x15': 1.0, 'solve/dial/25x15': 1.0}, {'solve/astar/25x15': 1.0}) == 1
@@ -0,0 +1,834 @@
+import math
+from collections import OrderedDict
+import pygame
+from cell import Cell
+from colours import BLACK, WHITE, RED, GREEN, BLUE, YELLOW, CYAN, PINK, GREY
+from grid import Grid, CellView, NORTH, SOUTH, EAST, WEST, ALL_WALLS
+
+
+# The width and height of a chunk, in cells.
+CHUNK = 64
+
+# The sizes of a cell in pixels the camera can zoom to. Below
+# DETAIL_SIZE the walls are too thin to draw and the overview is shown,
+# which has 2 pixels per cell, halved as many times as needed.
+ZOOM_LEVELS = (0.25, 0.5, 1, 2, 4, 8, 16, 32)
+DETAIL_SIZE = 4
+
+# The number of rows of a level shrunk at once when the levels of the
+# overview are made, which bounds the memory of the 32-bit copies.
+BAND = 512
+
+# The overlays of cell_colour, from the lowest priority to the highest,
+# so the last one drawn on a cell wins.
+OVERLAYS = (
+    ('closed_cells', BLUE),
+    ('open_cells', CYAN),
+    ('path', YELLOW),
+    ('special_cells', PINK),
+    ('end_cell', GREEN),
+    ('start_cell', RED),
+)
+
+# The overview has a pixel for every cell, every wall and every corner
+# where walls meet, see Viewport.overview. The pixels are indices into a
+# palette of walls, open cells, uncarved cells and then the colours of the
+# costs from 2 up.
+WALL, OPEN, UNCARVED = 0, 1, 2
+
+# The pixel of a cell from its mask and from its cost, and whether a
+# pixel is a wall. An open wall has the colour of the cell below or to
+# the right of it, which covers it when the cells are drawn one by one,
+# so the masks of the walls keep that colour where a wall is open.
+CELL_PIXELS = bytes(UNCARVED if mask == ALL_WALLS else OPEN for mask in range(256))
+NORTH_MASKS = bytes(0 if mask & NORTH else 0xFF for mask in range(256))
+EAST_MASKS = bytes(0 if mask & EAST else 0xFF for mask in range(256))
+WEST_MASKS = bytes(0 if mask & WEST else 0xFF for mask in range(256))
+SOUTH_PIXELS = bytes(WALL if mask & SOUTH else OPEN for mask in range(256))
+COST_PIXELS = bytes(0 if cost <= 1 else min(cost + 1, 255) for cost in range(256))
+IS_WALL = bytes(pixel == WALL for pixel in range(256))
+NOT_WALL_MASKS = bytes(0 if pixel == WALL else 0xFF for pixel in range(256))
+
+
+class Viewport:
+    """A camera over a maze, with pan and zoom.
+
+    Only the cells in view are drawn. Both views are made from an
+    overview of the whole maze with a pixel per cell and per wall, which
+    is kept up to date a row at a time as cells change. Zoomed out, when
+    the walls would be thinner than a pixel, the part in view is scaled
+    down from it. Close up, the maze is cut into chunks of ``CHUNK`` by
+    ``CHUNK`` cells, made by stretching the cells of the overview while
+    keeping its walls a pixel thick. They are kept in an LRU cache, so a
+    frame is a handful of blits however large the maze is, and a chunk is
+    only made again when a wall or a cost inside it changes.
+
+    The overlay of every cell is kept in a byte per cell, updated from
+    the cells that changed since the previous frame, so the open and
+    closed cells of a search over the whole maze are not looked up every
+    frame. The part in view is scaled like the overview, or stretched
+    like a chunk with the walls of the overview left uncovered, and
+    blitted over the maze.
+
+    Attributes
+    ----------
+    maze : Grid
+        The maze to draw.
+    width : int
+        The width of the view in pixels.
+    height : int
+        The height of the view in pixels.
+    size : float
+        The size of a cell in pixels, one of ``ZOOM_LEVELS``.
+    x : float
+        The x coordinate of the cell at the left edge of the view, in
+        cells.
+    y : float
+        The y coordinate of the cell at the top edge of the view, in
+        cells.
+    terrain : Callable
+        Gives the colour of a cell from its cost if it is more than 1, or
+        None to draw weighted cells like the others.
+    capacity : int
+        The number of chunk pixels kept in the cache.
+    chunks : OrderedDict
+        The cached chunk surfaces, keyed by ``(x, y, size)``.
+    palette : list[tuple[int, int, int]]
+        The colours of the pixels of the overview and of the chunks.
+
+    Methods
+    -------
+    reset(maze: Grid)
+        Show another maze.
+    fit()
+        Zoom and pan so the whole maze is in view.
+    pan(dx: float, dy: float)
+        Move the camera.
+    zoom(steps: int, px: int, py: int)
+        Zoom in or out around a point of the view.
+    cell_at(px: int, py: int)
+        Get the maze coordinates under a point of the view.
+    invalidate(cells: Collection[Cell])
+        Update the view after cells changed.
+    overview()
+        Get the overview of the maze.
+    level(size: float)
+        Get the overview at a size under which it is not made of chunks.
+    draw(surface: pygame.Surface, overlays: dict, changed: Collection[Cell] = None)
+        Draw the maze and its overlays.
+    """
+
+    def __init__(self, maze: Grid, width: int, height: int, terrain=None, capacity: int = 2 ** 25) -> None:
+        """Initialize a viewport showing the whole maze.
+
+        Parameters
+        ----------
+        maze : Grid
+            The maze to draw.
+        width : int
+            The width of the view in pixels.
+        height : int
+            The height of the view in pixels.
+        terrain : Callable, optional
+            Gives the colour of a cell from its cost if it is more than 1.
+        capacity : int, optional
+            The number of chunk pixels kept in the cache, 32 million by
+            default, about 128 MB.
+        """
+        self.width = width
+        self.height = height
+        self.terrain = terrain
+        self.capacity = capacity
+        self.chunks = OrderedDict()
+        self.cached = 0
+
+        self._overview = None
+        self._overview_version = None
+        self._levels = None
+        self._pixels = None
+        self._marks = None
+        self._sources = None
+        self._layers = {}
+
+        self.palette = [rgb(colour) for colour in (BLACK, WHITE, GREY)]
+        self.palette.extend(rgb(WHITE if terrain is None else terrain(pixel - 1)) for pixel in range(3, 256))
+
+        # The marks are indices into OVERLAYS from 1, 0 for none.
+        self.overlay_palette = [rgb(BLACK)] + [rgb(colour) for _, colour in OVERLAYS]
+
+        self.reset(maze)
+        self.fit()
+
+    def reset(self, maze: Grid) -> None:
+        """Show another maze.
+
+        The camera stays where it is, so a new maze of the same size is
+        shown at the same place.
+
+        Parameters
+        ----------
+        maze : Grid
+            The maze to draw.
+        """
+        self.maze = maze
+        self.chunks.clear()
+        self.cached = 0
+        self._pixels = None
+        self._marks = None
+        self._layers.clear()
+
+    def fit(self) -> None:
+        """Zoom and pan so the whole maze is in view."""
+        fitting = [size for size in ZOOM_LEVELS if self.maze.width * size <= self.width and self.maze.height * size <= self.height]
+        self.size = fitting[-1] if fitting else ZOOM_LEVELS[0]
+
+        self.x = (self.maze.width - self.width / self.size) / 2
+        self.y = (self.maze.height - self.height / self.size) / 2
+        self._clamp()
+
+    def _clamp(self) -> None:
+        """Keep at least half of the view on the maze."""
+        half_width = self.width / self.size / 2
+        half_height = self.height / self.size / 2
+
+        self.x = min(max(self.x, -half_width), self.maze.width - half_width)
+        self.y = min(max(self.y, -half_height), self.maze.height - half_height)
+
+    def pan(self, dx: float, dy: float) -> None:
+        """Move the camera.
+
+        Parameters
+        ----------
+        dx : float
+            The distance to move the maze to the right, in pixels.
+        dy : float
+            The distance to move the maze down, in pixels.
+        """
+        self.x -= dx / self.size
+        self.y -= dy / self.size
+        self._clamp()
+
+    def zoom(self, steps: int, px: int, py: int) -> None:
+        """Zoom in or out around a point of the view.
+
+        Parameters
+        ----------
+        steps : int
+            The number of zoom levels to zoom in by, negative to zoom out.
+        px : int
+            The x coordinate of the point in the view, which stays over
+            the same cell.
+        py : int
+            The y coordinate of the point in the view.
+        """
+        level = ZOOM_LEVELS.index(self.size) + steps
+        level = min(max(level, 0), len(ZOOM_LEVELS) - 1)
+
+        x, y = self.cell_at(px, py)
+        self.size = ZOOM_LEVELS[level]
+        self.x = x - px / self.size
+        self.y = y - py / self.size
+        self._clamp()
+
+    def cell_at(self, px: int, py: int) -> tuple[float, float]:
+        """Get the maze coordinates under a point of the view.
+
+        Parameters
+        ----------
+        px : int
+            The x coordinate of the point in the view.
+        py : int
+            The y coordinate of the point in the view.
+
+        Returns
+        -------
+        tuple[float, float]
+            The coordinates in cells, the integer parts being the
+            coordinates of the cell. They may be outside of the maze.
+        """
+        left, top = self._origin()
+        return (px - left) / self.size, (py - top) / self.size
+
+    def _origin(self) -> tuple[int, int]:
+        """Get the position of the top left corner of the maze in the view."""
+        return round(-self.x * self.size), round(-self.y * self.size)
+
+    def invalidate(self, cells) -> None:
+        """Update the view after cells changed.
+
+        The rows of the overview with the cells are made again and the
+        chunks with the cells are forgotten. The overview is made again
+        from scratch if the version of the maze changed and this was not
+        called.
+
+        Parameters
+        ----------
+        cells : Collection[Cell]
+            The cells whose walls or costs changed.
+        """
+        rows = {cell.y for cell in cells}
+
+        if not rows:
+            return
+
+        if self._pixels is not None:
+            if len(rows) > self.maze.height // 4:
+                self._pixels = None
+            else:
+                for y in rows:
+                    self._paint_row(y)
+                for y in rows | {y + 1 for y in rows}:
+                    self._paint_corners(y)
+
+                if self._levels is not None:
+                    for y in rows:
+                        self._shrink(2 * y, 2 * y + 3)
+
+                self._overview_version = self.maze.version
+
+        # A chunk also has the corners around its cells, which depend on
+        # the walls of the cells next to it.
+        keys = set()
+        for cell in cells:
+            for x in range(cell.x - 1, cell.x + 2):
+                for y in range(cell.y - 1, cell.y + 2):
+                    keys.add((x // CHUNK, y // CHUNK))
+
+        for key in [key for key in self.chunks if key[:2] in keys]:
+            surface = self.chunks.pop(key)
+            self.cached -= surface.get_width() * surface.get_height()
+        for key in [key for key in self._layers if key[:2] in keys]:
+            del self._layers[key]
+
+    def draw(self, surface: pygame.Surface, overlays: dict, changed=None) -> None:
+        """Draw the maze and its overlays.
+
+        Parameters
+        ----------
+        surface : pygame.Surface
+            The surface to draw on, the size of the view.
+        overlays : dict
+            The start, end, path, special, open and closed cells, as
+            keyword arguments of ``main.cell_colour``.
+        changed : Collection[Cell], optional
+            The cells whose overlay changed since the previous frame. The
+            overlays are marked again from scratch if it is None, or if
+            one of them is another collection than in the previous frame.
+        """
+        surface.fill(BLACK)
+
+        if self.size >= DETAIL_SIZE:
+            self._draw_chunks(surface)
+        else:
+            self._draw_overview(surface)
+
+        self._mark(overlays, changed)
+        self._draw_marks(surface)
+        self._draw_cells(surface, overlays)
+
+    def _visible(self) -> tuple[int, int, int, int]:
+        """Get the range of the cells in view, as ``(x0, y0, x1, y1)``."""
+        x0 = max(math.floor(self.x), 0)
+        y0 = max(math.floor(self.y), 0)
+        x1 = min(math.ceil(self.x + self.width / self.size) + 1, self.maze.width)
+        y1 = min(math.ceil(self.y + self.height / self.size) + 1, self.maze.height)
+
+        return x0, y0, x1, y1
+
+    def _draw_chunks(self, surface: pygame.Surface) -> None:
+        """Blit the chunks in view, making the missing ones."""
+        self.overview()
+
+        left, top = self._origin()
+        x0, y0, x1, y1 = self._visible()
+        size = int(self.size)
+
+        for cy in range(y0 // CHUNK, (y1 - 1) // CHUNK + 1):
+            for cx in range(x0 // CHUNK, (x1 - 1) // CHUNK + 1):
+                key = (cx, cy, size)
+                chunk = self.chunks.get(key)
+
+                if chunk is None:
+                    chunk = self.chunks[key] = self._render_chunk(cx, cy, size)
+                    self.cached += chunk.get_width() * chunk.get_height()
+                else:
+                    self.chunks.move_to_end(key)
+
+                surface.blit(chunk, (left + cx * CHUNK * size, top + cy * CHUNK * size))
+
+        # The chunks in view were just used, so only older ones are
+        # dropped, even if the view alone needs more than the capacity.
+        while self.cached > self.capacity and len(self.chunks) > 1:
+            _, chunk = self.chunks.popitem(last=False)
+            self.cached -= chunk.get_width() * chunk.get_height()
+
+    def _render_chunk(self, cx: int, cy: int, size: int) -> pygame.Surface:
+        """Make the surface of a chunk from the overview.
+
+        Every row of the overview is stretched by repeating its cells
+        ``size - 1`` times and its walls once, then the rows of cells are
+        repeated the same way.
+        """
+        pixels = self._pixels
+        pitch = 2 * self.maze.width + 1
+
+        width = min(CHUNK, self.maze.width - cx * CHUNK)
+        height = min(CHUNK, self.maze.height - cy * CHUNK)
+        first = 2 * cy * CHUNK * pitch + 2 * cx * CHUNK
+        span = 2 * width + 1
+
+        rows = []
+
+        for y in range(2 * height + 1):
+            start = first + y * pitch
+            segment = pixels[start:start + span]
+
+            rows.append(stretch(segment, width, size, y % 2))
+
+        chunk = pygame.image.frombuffer(b''.join(rows), (width * size + 1, height * size + 1), 'P')
+        chunk.set_palette(self.palette)
+
+        # Blitting is faster between surfaces of the same format.
+        return chunk.convert() if pygame.display.get_surface() else chunk
+
+    def overview(self) -> pygame.Surface:
+        """Get the overview of the maze.
+
+        The overview has a pixel for every cell, every wall between two
+        cells and every corner, so cell ``(x, y)`` is the pixel
+        ``(2x + 1, 2y + 1)``. A corner is black if a wall touches it and
+        has the colour of the cell below and to the right of it otherwise,
+        as the top left pixel of that cell. It is made a row at a time
+        with ``bytes.translate`` and integers used as arrays of bytes.
+
+        Returns
+        -------
+        pygame.Surface
+            An 8-bit surface of ``2 * width + 1`` by ``2 * height + 1``
+            pixels.
+        """
+        if self._pixels is not None and self._overview_version == self.maze.version:
+            return self._overview
+
+        width, height = self.maze.width, self.maze.height
+
+        self._pixels = bytearray((2 * width + 1) * (2 * height + 1))
+        self._ones = int.from_bytes(b'\x01' * (width + 1), 'big')
+
+        for y in range(height):
+            self._paint_row(y)
+        for y in range(height + 1):
+            self._paint_corners(y)
+
+        self._overview = pygame.image.frombuffer(self._pixels, (2 * width + 1, 2 * height + 1), 'P')
+        self._overview.set_palette(self.palette)
+        self._overview_version = self.maze.version
+
+        # The chunks and the levels are made from the overview.
+        self.chunks.clear()
+        self.cached = 0
+        self._levels = None
+        self._layers.clear()
+
+        return self._overview
+
+    def _paint_row(self, y: int) -> None:
+        """Set the pixels of a row of cells and of their walls in the overview."""
+        width = self.maze.width
+        pitch = 2 * width + 1
+        pixels = self._pixels
+
+        masks = bytes(self.maze.walls[y * width:(y + 1) * width])
+        cells = masks.translate(CELL_PIXELS)
+
+        if self.terrain is not None:
+            costs = bytes(self.maze.costs[y * width:(y + 1) * width])
+
+            if max(costs) > 1:
+                costs = costs.translate(COST_PIXELS)
+                cells = bytes(cost if cost and cell == OPEN else cell for cell, cost in zip(cells, costs))
+
+        top = 2 * y * pitch
+        middle = top + pitch
+
+        pixels[top + 1:top + pitch:2] = keep(cells, masks.translate(NORTH_MASKS))
+        pixels[middle] = cells[0] & WEST_MASKS[masks[0]]
+        pixels[middle + 1:middle + pitch:2] = cells
+        pixels[middle + 2:middle + pitch:2] = keep(cells[1:] + bytes((OPEN,)), masks.translate(EAST_MASKS))
+
+        if y == self.maze.height - 1:
+            bottom = middle + pitch
+            pixels[bottom + 1:bottom + pitch:2] = masks.translate(SOUTH_PIXELS)
+
+    def _paint_corners(self, y: int) -> None:
+        """Set the corners above a row of cells, or below the last row.
+
+        Every byte of the integers is a corner, so the walls around all
+        the corners of the row are combined at once.
+        """
+        width = self.maze.width
+        pitch = 2 * width + 1
+        pixels = self._pixels
+        row = 2 * y * pitch
+
+        # The walls to the left and to the right of the corners.
+        walls = pixels[row + 1:row + pitch:2].translate(IS_WALL)
+        touched = int.from_bytes(b'\x00' + walls, 'big') | int.from_bytes(walls + b'\x00', 'big')
+
+        # The walls above and below them.
+        if y > 0:
+            touched |= int.from_bytes(pixels[row - pitch:row:2].translate(IS_WALL), 'big')
+        if y < self.maze.height:
+            touched |= int.from_bytes(pixels[row + pitch:row + 2 * pitch:2].translate(IS_WALL), 'big')
+            colours = pixels[row + pitch + 1:row + 2 * pitch:2] + bytes((OPEN,))
+        else:
+            colours = bytes((OPEN,)) * (width + 1)
+
+        # Every byte of the mask is 255 for the corners without walls and
+        # 0 for the others.
+        mask = (touched ^ self._ones) * 0xFF
+        pixels[row:row + pitch:2] = keep(colours, mask.to_bytes(width + 1, 'big'))
+
+    def level(self, size: float) -> pygame.Surface:
+        """Get the overview at a size under which it is not made of chunks.
+
+        Every level is half the size of the one above, each of its pixels
+        the average of four pixels of that level, so the walls fade into
+        the cells instead of hiding them or disappearing. The levels are
+        made when first needed and then updated only where cells change.
+
+        Parameters
+        ----------
+        size : float
+            The size of a cell in pixels, 2 or a power of 2 below it.
+
+        Returns
+        -------
+        pygame.Surface
+            The overview at that size, with the maze in its top left
+            corner.
+        """
+        overview = self.overview()
+
+        if self._levels is None:
+            self._levels = [overview]
+
+            while 2 ** (1 - len(self._levels)) >= ZOOM_LEVELS[0]:
+                above = self._levels[-1]
+                self._levels.append(pygame.Surface((above.get_width() // 2, above.get_height() // 2), 0, 32))
+
+            for top in range(0, overview.get_height(), BAND):
+                self._shrink(top, top + BAND)
+
+        return self._levels[round(math.log2(2 / size))]
+
+    def _shrink(self, top: int, bottom: int) -> None:
+        """Update the levels below the overview after rows of it changed.
+
+        Parameters
+        ----------
+        top : int
+            The first row of the overview that changed.
+        bottom : int
+            The row after the last one that changed.
+        """
+        for above, level in zip(self._levels, self._levels[1:]):
+            top, bottom = top // 2, min((bottom + 1) // 2, level.get_height())
+
+            if top >= bottom:
+                return
+
+            area = pygame.Rect(0, 2 * top, 2 * level.get_width(), 2 * (bottom - top))
+
+            # Only surfaces of 24 or 32 bits can be smoothly scaled.
+            band = pygame.Surface(area.size, 0, 32)
+            band.blit(above, (0, 0), area)
+
+            level.blit(pygame.transform.smoothscale(band, (level.get_width(), bottom - top)), (0, top))
+
+    def _draw_overview(self, surface: pygame.Surface) -> None:
+        """Blit the overview at the current size."""
+        surface.blit(self.level(self.size), self._origin())
+
+    def _mark(self, overlays: dict, changed) -> None:
+        """Update the marks of the cells whose overlay changed."""
+        width, height = self.maze.width, self.maze.height
+
+        # An overlay is the same as in the previous frame if it is the
+        # same collection, or a view of the same indices.
+        sources = {name: getattr(cells, 'indices', cells) for name, cells in overlays.items() if not isinstance(cells, Cell)}
+
+        if self._marks is None:
+            self._marks = bytearray(width * height)
+            self._sources = None
+            self._marked = pygame.image.frombuffer(self._marks, (width, height), 'P')
+            self._marked.set_palette(self.overlay_palette)
+            self._marked.set_colorkey(0)
+
+        marks = self._marks
+        same = self._sources is not None and sources.keys() == self._sources.keys() and all(
+            cells is self._sources[name] for name, cells in sources.items())
+        self._sources = sources
+
+        if changed is None or not same:
+            marks[:] = bytes(len(marks))
+            self._layers.clear()
+
+            for mark, (name, _) in enumerate(OVERLAYS, 1):
+                cells = overlays.get(name)
+
+                if cells is None or isinstance(cells, Cell):
+                    continue
+                if isinstance(cells, CellView):
+                    for index in cells.indices:
+                        marks[index] = mark
+                else:
+                    for cell in cells:
+                        marks[cell.y * width + cell.x] = mark
+            return
+
+        # The marks are cleared, then set from the lowest priority up, so
+        # the cells are looked up in every collection at once.
+        changed = [cell for cell in changed if 0 <= cell.x < width and 0 <= cell.y < height]
+        indices = [cell.y * width + cell.x for cell in changed]
+
+        for index in indices:
+            marks[index] = 0
+
+        for mark, (name, _) in enumerate(OVERLAYS, 1):
+            cells = overlays.get(name)
+
+            if isinstance(cells, CellView):
+                for index in filter(cells.indices.__contains__, indices):
+                    marks[index] = mark
+            elif cells is not None and not isinstance(cells, Cell):
+                for cell in filter(cells.__contains__, changed):
+                    marks[cell.y * width + cell.x] = mark
+
+        chunks = {(index % width // CHUNK, index // width // CHUNK) for index in indices}
+
+        # The corners and walls at the left and top of a chunk have the
+        # marks of the cells to their right and below, in the next chunk.
+        keys = {(cx - dx, cy - dy) for cx, cy in chunks for dx in (0, 1) for dy in (0, 1)}
+
+        for key in [key for key in self._layers if key[:2] in keys]:
+            del self._layers[key]
+
+    def _draw_marks(self, surface: pygame.Surface) -> None:
+        """Blit the marks of the cells in view over the maze."""
+        if not any(self._sources.values()):
+            return
+
+        left, top = self._origin()
+        x0, y0, x1, y1 = self._visible()
+
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        if self.size >= DETAIL_SIZE:
+            self._draw_layers(surface)
+            return
+
+        # Zoomed out, a pixel shows the first of the cells under it, so
+        # the area starts on a whole pixel.
+        if self.size < 1:
+            step = round(1 / self.size)
+            x0 -= x0 % step
+            y0 -= y0 % step
+
+        area = self._marked.subsurface((x0, y0, x1 - x0, y1 - y0))
+        scaled = pygame.transform.scale(area, (max(math.ceil((x1 - x0) * self.size), 1), max(math.ceil((y1 - y0) * self.size), 1)))
+        scaled.set_colorkey(0)
+        surface.blit(scaled, (left + round(x0 * self.size), top + round(y0 * self.size)))
+
+    def _draw_layers(self, surface: pygame.Surface) -> None:
+        """Blit the marks of the chunks in view, making the missing ones.
+
+        The layers of the chunks out of view are dropped, so panning only
+        makes the layers of the chunks coming into view.
+        """
+        self.overview()
+
+        left, top = self._origin()
+        x0, y0, x1, y1 = self._visible()
+        size = int(self.size)
+        layers = {}
+
+        for cy in range(y0 // CHUNK, (y1 - 1) // CHUNK + 1):
+            for cx in range(x0 // CHUNK, (x1 - 1) // CHUNK + 1):
+                key = (cx, cy, size)
+                layer = layers[key] = self._layers[key] if key in self._layers else self._render_marks(cx, cy, size)
+
+                if layer is not None:
+                    surface.blit(layer, (left + cx * CHUNK * size, top + cy * CHUNK * size))
+
+        self._layers = layers
+
+    def _render_marks(self, cx: int, cy: int, size: int) -> pygame.Surface:
+        """Make the surface of the marks of a chunk, stretched like it.
+
+        A pixel of the overview has the mark of the cell it is drawn
+        with, the cell itself, the one to the right of a wall or the one
+        below and to the right of a corner, and none if it is a wall, so
+        the walls of the chunk show through.
+
+        Returns
+        -------
+        pygame.Surface
+            An 8-bit surface with its unmarked pixels transparent, or None
+            if none of the pixels are marked.
+        """
+        pixels = self._pixels
+        marks = self._marks
+        maze_width, maze_height = self.maze.width, self.maze.height
+        pitch = 2 * maze_width + 1
+
+        x0, y0 = cx * CHUNK, cy * CHUNK
+        width = min(CHUNK, maze_width - x0)
+        height = min(CHUNK, maze_height - y0)
+        first = 2 * y0 * pitch + 2 * x0
+        span = 2 * width + 1
+
+        # The marks of the cells of the chunk and of the next ones.
+        end = min(x0 + width + 1, maze_width)
+        lines = [marks[y * maze_width + x0:y * maze_width + end] for y in range(y0, min(y0 + height + 1, maze_height))]
+
+        if not any(line.count(0) < len(line) for line in lines):
+            return None
+
+        rows = []
+
+        for y in range(2 * height + 1):
+            segment = bytearray(span)
+
+            if y // 2 < len(lines):
+                line = lines[y // 2]
+                segment[1::2] = line[:width]
+                segment[0:2 * len(line):2] = line
+
+                start = first + y * pitch
+                segment = keep(segment, pixels[start:start + span].translate(NOT_WALL_MASKS))
+
+            rows.append(stretch(segment, width, size, y % 2))
+
+        layer = pygame.image.frombuffer(b''.join(rows), (width * size + 1, height * size + 1), 'P')
+        layer.set_palette(self.overlay_palette)
+        layer.set_colorkey(0, pygame.RLEACCEL)
+
+        return layer
+
+    def _draw_cells(self, surface: pygame.Surface, overlays: dict) -> None:
+        """Draw the overlays that are a single cell, such as the start."""
+        left, top = self._origin()
+        x0, y0, x1, y1 = self._visible()
+        walls = self.maze.walls
+        width = self.maze.width
+
+        detail = self.size >= DETAIL_SIZE
+        size = max(int(self.size), 1)
+
+        for name, colour in OVERLAYS:
+            cell = overlays.get(name)
+
+            if isinstance(cell, Cell) and x0 <= cell.x < x1 and y0 <= cell.y < y1:
+                x = left + int(cell.x * self.size)
+                y = top + int(cell.y * self.size)
+
+                if detail:
+                    draw_cell(surface, x, y, size, walls[cell.y * width + cell.x], colour)
+                else:
+                    surface.fill(colour, (x, y, size, size))
+
+
+def keep(pixels: bytes, mask: bytes) -> bytes:
+    """Keep the pixels where a mask is 255 and set the others to walls.
+
+    Parameters
+    ----------
+    pixels : bytes
+        The pixels.
+    mask : bytes
+        A byte for every pixel, 255 to keep it or 0 for a wall.
+
+    Returns
+    -------
+    bytes
+        The masked pixels.
+    """
+    return (int.from_bytes(pixels, 'big') & int.from_bytes(mask, 'big')).to_bytes(len(pixels), 'big')
+
+
+def stretch(segment: bytes, width: int, size: int, cells: bool) -> bytes:
+    """Stretch a row of the overview to a size of cell.
+
+    Parameters
+    ----------
+    segment : bytes
+        The ``2 * width + 1`` pixels of the row, walls and cells in turn.
+    width : int
+        The number of cells in the row.
+    size : int
+        The size of a cell in pixels.
+    cells : bool
+        Whether it is a row of cells, repeated ``size - 1`` times, or a
+        row of walls, kept once.
+
+    Returns
+    -------
+    bytes
+        The pixels of the stretched rows.
+    """
+    row = bytearray(width * size + 1)
+    row[0::size] = segment[0::2]
+    middles = segment[1::2]
+    for offset in range(1, size):
+        row[offset::size] = middles
+
+    return row * (size - 1) if cells else row
+
+
+def rgb(colour: int) -> tuple[int, int, int]:
+    """Split a colour into its channels.
+
+    Parameters
+    ----------
+    colour : int
+        The colour, as ``0xRRGGBB``.
+
+    Returns
+    -------
+    tuple[int, int, int]
+        The red, green and blue channels.
+    """
+    return (colour >> 16) & 0xFF, (colour >> 8) & 0xFF, colour & 0xFF
+
+
+def draw_cell(surface: pygame.Surface, x: int, y: int, size: int, mask: int, colour: int = None) -> None:
+    """Draw a cell and its walls.
+
+    Parameters
+    ----------
+    surface : pygame.Surface
+        The surface to draw on.
+    x : int
+        The x coordinate of the top left corner of the cell, in pixels.
+    y : int
+        The y coordinate of the top left corner of the cell, in pixels.
+    size : int
+        The size of the cell in pixels.
+    mask : int
+        The wall mask of the cell.
+    colour : int, optional
+        The colour to fill the cell with, or None to leave it as it is.
+    """
+    if colour is not None:
+        pygame.draw.rect(surface, colour, (x, y, size, size))
+
+    if mask & NORTH:
+        pygame.draw.line(surface, BLACK, (x, y), (x + size, y))
+    if mask & SOUTH:
+        pygame.draw.line(surface, BLACK, (x, y + size), (x + size, y + size))
+    if mask & EAST:
+        pygame.draw.line(surface, BLACK, (x + size, y), (x + size, y + size))
+    if mask & WEST:
+        pygame.draw.line(surface, BLACK, (x, y), (x, y + size))
@@ -0,0 +1,383 @@
+import queue
+import threading
+from time import perf_counter
+from grid import Grid, CellView
+
+
+# The number of updates waiting for the render loop. When the queue is
+# full the worker keeps running and sends the cells that changed since
+# with its next update instead.
+QUEUE_SIZE = 8
+
+# The time in seconds between two updates of a worker running freely.
+INTERVAL = 1 / 120
+
+# The time in seconds a worker may hold the GIL while the render loop
+# waits for it, to set with ``sys.setswitchinterval``. Python's default of
+# 5 ms is lost on every frame.
+SWITCH_INTERVAL = 0.001
+
+
+class AlgorithmWorker(threading.Thread):
+    """Run the steps of an algorithm on a background thread.
+
+    The render loop no longer runs the steps itself, so a slow step or a
+    fast algorithm does not hold up the input handling and the drawing.
+    It calls ``poll`` once per frame instead, which drains the updates of
+    the worker.
+
+    The worker does not share the open, closed or special cells of the
+    algorithm, which it keeps changing. Every update only holds the
+    indices of the cells that changed and, for each of these collections,
+    those of them that are in it, and ``poll`` applies them to copies
+    owned by the render loop. Both are made and applied with set
+    operations, without a loop over the cells. The updates go through a
+    bounded queue. When it is full the worker does not wait for the
+    render loop but keeps running and sends everything that changed in
+    the meantime with its next update, so an update never holds more than
+    every cell of the maze.
+
+    The maze itself is shared, like when the render loop ran the steps.
+    A frame may show a wall carved on one side only, which the next
+    update completes.
+
+    Attributes
+    ----------
+    algorithm : generator
+        The algorithm, which yields tuples of the maze, collections of
+        cells and the cells that changed.
+    steps : int
+        The number of steps of the updates drained by the last call to
+        ``poll``.
+    paused : bool
+        Whether the worker is paused.
+    error : Exception
+        The exception raised by the algorithm, or None.
+
+    Methods
+    -------
+    allow(steps: int, seconds: float = None)
+        Limit the number of steps the worker may run, or the time.
+    pause()
+        Stop running steps until ``resume`` is called.
+    resume()
+        Run steps again.
+    toggle()
+        Pause or resume the worker.
+    cancel()
+        Stop the worker and close the algorithm.
+    profile(profiler: cProfile.Profile)
+        Profile the steps of the worker, or stop.
+    poll()
+        Drain the updates of the worker.
+    """
+
+    def __init__(self, algorithm, capacity: int = QUEUE_SIZE, interval: float = INTERVAL) -> None:
+        """Initialize a worker, which is started with ``start``.
+
+        Parameters
+        ----------
+        algorithm : generator
+            The algorithm to run.
+        capacity : int, optional
+            The number of updates waiting for the render loop.
+        interval : float, optional
+            The time in seconds between two updates.
+        """
+        super().__init__(daemon=True)
+
+        self.algorithm = algorithm
+        self.interval = interval
+        self.steps = 0
+        self.paused = False
+        self.error = None
+
+        self._updates = queue.Queue(capacity)
+        self._condition = threading.Condition()
+        self._allowance = None
+        self._until = None
+        self._cancelled = False
+
+        # The profiler asked for by the render loop and the one enabled on
+        # the worker thread.
+        self._profiler = None
+        self._profiling = None
+
+        # The state of the worker thread: the last state yielded, the
+        # indices of the cells that changed and the number of steps since
+        # the last update sent.
+        self._state = None
+        self._changed = set()
+        self._pending = 0
+
+        # The copies of the collections of cells of the render loop.
+        self._cells = None
+
+    def allow(self, steps: int, seconds: float = None) -> None:
+        """Limit the number of steps the worker may run, or the time.
+
+        Parameters
+        ----------
+        steps : int
+            The number of steps the worker may run from now on, replacing
+            the previous limit, or None to let it run freely.
+        seconds : float, optional
+            The time in seconds the worker may run from now on, replacing
+            the previous limit, or None to let it run freely.
+        """
+        with self._condition:
+            self._allowance = steps
+            self._until = None if seconds is None else perf_counter() + seconds
+            self._condition.notify()
+
+    def pause(self) -> None:
+        """Stop running steps until ``resume`` is called."""
+        with self._condition:
+            self.paused = True
+
+    def resume(self) -> None:
+        """Run steps again."""
+        with self._condition:
+            self.paused = False
+            self._condition.notify()
+
+    def toggle(self) -> None:
+        """Pause or resume the worker."""
+        if self.paused:
+            self.resume()
+        else:
+            self.pause()
+
+    def cancel(self) -> None:
+        """Stop the worker and close the algorithm.
+
+        The worker stops after its current step. The updates it already
+        sent can still be drained.
+        """
+        with self._condition:
+            self._cancelled = True
+            self._condition.notify()
+
+    def profile(self, profiler) -> None:
+        """Profile the steps of the worker, or stop.
+
+        cProfile only profiles the thread that enables it, so the worker
+        enables the profiler itself before its next step. Stopping waits
+        until the worker disabled it, so its statistics can be read.
+
+        Parameters
+        ----------
+        profiler : cProfile.Profile
+            The profiler, not enabled on any other thread, or None to
+            stop profiling.
+        """
+        with self._condition:
+            self._profiler = profiler
+            self._condition.notify_all()
+
+            while profiler is None and self._profiling is not None and self.is_alive():
+                self._condition.wait()
+
+    def run(self) -> None:
+        """Run the algorithm until it finishes or the worker is cancelled."""
+        deadline = perf_counter() + self.interval
+
+        try:
+            try:
+                while self._wait():
+                    self._state = state = next(self.algorithm)
+                    changed = state[-1]
+
+                    if isinstance(changed, CellView):
+                        self._changed.update(changed.indices)
+                    else:
+                        self._changed.update(indices(state[0], changed))
+
+                    self._pending += 1
+
+                    if self._allowance is not None:
+                        self._allowance -= 1
+                        if self._allowance == 0:
+                            self._send()
+                            deadline = perf_counter() + self.interval
+                            continue
+
+                    if perf_counter() >= deadline:
+                        self._send()
+                        deadline = perf_counter() + self.interval
+            finally:
+                # Before the last update, which may wait for the render
+                # loop.
+                self._switch_profiler(None)
+        except StopIteration as e:
+            self._finish(e.value)
+        except Exception as e:
+            # The state may be what failed, so it is not sent.
+            self.error = e
+            self._state = None
+            self._finish(None)
+        finally:
+            self.algorithm.close()
+
+    def _wait(self) -> bool:
+        """Wait until the worker may run a step.
+
+        Returns
+        -------
+        bool
+            False if the worker was cancelled.
+        """
+        # The flags are read without the lock first, which is enough
+        # while the worker runs freely.
+        until = self._until
+        if not (self.paused or self._allowance == 0 or self._cancelled or self._profiler is not self._profiling
+                or (until is not None and perf_counter() >= until)):
+            return True
+
+        with self._condition:
+            while True:
+                if self._profiler is not self._profiling:
+                    self._switch_profiler(self._profiler)
+
+                if not (self.paused or self._allowance == 0 or self._overdue()) or self._cancelled:
+                    return not self._cancelled
+
+                # The render loop notifies the worker when it drains the
+                # queue, so the last steps are sent while it waits.
+                if self._pending:
+                    self._send()
+
+                self._condition.wait()
+
+    def _switch_profiler(self, profiler) -> None:
+        """Disable the profiler enabled on the worker thread and enable another."""
+        with self._condition:
+            if self._profiling is not None:
+                self._profiling.disable()
+
+            self._profiling = profiler
+
+            if profiler is not None:
+                profiler.enable()
+
+            self._condition.notify_all()
+
+    def _overdue(self) -> bool:
+        """Check if the time the worker may run is spent."""
+        return self._until is not None and perf_counter() >= self._until
+
+    def _send(self, finished: bool = False, result=None) -> bool:
+        """Send the cells that changed since the last update.
+
+        Parameters
+        ----------
+        finished : bool, optional
+            Whether the algorithm finished.
+        result : object, optional
+            The value returned by the algorithm.
+
+        Returns
+        -------
+        bool
+            Whether the update was sent, False if the queue is full.
+        """
+        state = self._state
+        maze = None
+        inside = []
+
+        if state is not None:
+            maze = state[0]
+            inside = [self._changed.intersection(indices(maze, cells)) for cells in state[1:-1]]
+
+        try:
+            self._updates.put_nowait((maze, self._changed, inside, self._pending, finished, result))
+        except queue.Full:
+            return False
+
+        self._changed = set()
+        self._pending = 0
+        return True
+
+    def _finish(self, result) -> None:
+        """Send the last update, waiting for room in the queue."""
+        with self._condition:
+            while not self._send(True, result) and not self._cancelled:
+                self._condition.wait()
+
+    def poll(self) -> tuple[tuple, set, bool, object]:
+        """Drain the updates of the worker.
+
+        Returns
+        -------
+        tuple[tuple, set, bool, object]
+            The state of the algorithm with the copies of its collections
+            (None if there was no update), the cells that changed, whether
+            the algorithm finished and the value it returned.
+
+        Raises
+        ------
+        Exception
+            The exception raised by the algorithm, once it finished.
+        """
+        self.steps = 0
+
+        maze = None
+        changed = set()
+        finished = False
+        result = None
+
+        while True:
+            try:
+                update_maze, update_changed, inside, steps, finished, result = self._updates.get_nowait()
+            except queue.Empty:
+                break
+
+            if update_maze is not None:
+                maze = update_maze
+                if self._cells is None:
+                    self._cells = [set() for _ in inside]
+
+            self.steps += steps
+
+            for cells, update_inside in zip(self._cells or (), inside):
+                cells -= update_changed
+                cells |= update_inside
+
+            changed |= update_changed
+
+        # There is room in the queue again.
+        with self._condition:
+            self._condition.notify()
+
+        if finished and self.error is not None:
+            raise self.error
+
+        if maze is None:
+            return None, set(), finished, result
+
+        state = (maze, *(CellView(maze, cells) for cells in self._cells), CellView(maze, changed))
+        return state, set(state[-1]), finished, result
+
+
+def indices(maze: Grid, cells) -> set[int]:
+    """Get the indices of a collection of cells.
+
+    Parameters
+    ----------
+    maze : Grid
+        The maze the cells belong to.
+    cells : Collection[Cell]
+        The cells, usually a ``CellView``, whose indices are used as they
+        are when they are a set.
+
+    Returns
+    -------
+    set[int]
+        The indices of the cells.
+    """
+    if isinstance(cells, CellView) and isinstance(cells.indices, (set, frozenset)):
+        return cells.indices
+    if isinstance(cells, CellView):
+        return set(cells.indices)
+
+    return {cell.y * maze.width + cell.x for cell in cells}